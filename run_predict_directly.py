@@ -1,30 +1,28 @@
-
 import os
 import sys
-import numpy as np
-import pandas as pd
-import joblib
+import timeit
 
 # Add current directory to path so we can import src
 sys.path.append(os.getcwd())
 
 from src.predict import load_model, predict
-from src.features import add_feature
+from src.preprocess import load_preprocessor
+from src.fastpath import CompiledScorer
 
 def main():
     print("--- Running Direct Prediction Test ---")
 
     # 1. Load Artifacts
     model_path = "models/best_model.pkl"
+    preprocessor_path = "models/preprocessor.pkl"
     scaler_path = "models/scaler.pkl"
     
     print(f"Loading model from: {model_path}")
     model = load_model(model_path)
     
-    print(f"Loading scaler from: {scaler_path}")
-    scaler = joblib.load(scaler_path)
-    expected_cols = list(scaler.feature_names_in_)
-    print(f"Expected Features: {len(expected_cols)}")
+    print(f"Loading preprocessor from: {preprocessor_path}")
+    preprocessor = load_preprocessor(preprocessor_path, scaler_path)
+    print(f"Expected Features: {len(preprocessor.feature_names_)}")
 
     # 2. Mock Input Data (similar to app.py default)
     print("Creating mock input data...")
@@ -42,31 +40,27 @@ def main():
         "PAY_AMT4": 5200,  "PAY_AMT5": 4700,  "PAY_AMT6": 5000,
     }
 
-    # 3. Create DataFrame & Feature Engineering
-    df = pd.DataFrame([row])
-    print("Original Columns:", df.shape[1])
-    
-    print("Applying feature engineering (add_feature)...")
-    df = add_feature(df)
-    
-    print("Applying One-Hot Encoding...")
-    df = pd.get_dummies(df, columns=["SEX", "EDUCATION", "MARRIAGE"], drop_first=False)
-    
-    # 4. Align Columns with Scaler
-    print("Aligning columns...")
-    for c in expected_cols:
-        if c not in df.columns:
-            df[c] = 0
-    df = df[expected_cols]
-    
-    # 5. Scale & Predict
-    print("Scaling features...")
-    X = scaler.transform(df)
+    # 3. Feature engineering, encoding & scaling in one step
+    print("Transforming (features + one-hot + scaling)...")
+    X = preprocessor.transform(row)
     
+    # 4. Predict
     print("Running prediction...")
     prob = predict(model, X)
     pct = prob * 100
-    
+
+    # 5. The compiled fast path used by app.py (tests/test_predict.py checks it matches)
+    print("Compiling fast scorer...")
+    fast = CompiledScorer(model, preprocessor)
+    fast_prob = fast.score_row(row)
+    print(f"Preprocessor path probability: {prob:.12f}")
+    print(f"Fast path probability: {fast_prob:.12f}")
+
+    n = 200
+    pre_us = timeit.timeit(lambda: predict(model, preprocessor.transform(row)), number=n) / n * 1e6
+    fast_us = timeit.timeit(lambda: fast.score_row(row), number=n * 50) / (n * 50) * 1e6
+    print(f"Latency: preprocessor {pre_us:.1f} us/row, fast path {fast_us:.1f} us/row ({pre_us / fast_us:.0f}x)")
+
     print("\n" + "="*40)
     print(f"PREDICTION RESULT: {pct:.2f}% Default Probability")
     if pct < 30:
@@ -0,0 +1,282 @@
+"""
+Benchmarks for the scoring hot paths.
+
+    python -m src.bench                                   # 1, 1k, 100k and 10M rows
+    python -m src.bench --sizes 1 1000 100000 --out bench.json
+    python -m src.bench --baseline benchmarks/baseline.json   # exit 1 on regression
+    python -m src.bench --save-baseline benchmarks/baseline.json
+    python -m src.bench --startup --sizes 1       # + dashboard cold start
+
+Synthetic applicant frames are drawn column by column from the real
+dataset (each RAW_COLUMNS column resampled independently, with a fixed
+seed), so dtypes, category codes and value ranges match production input.
+
+Every stage is timed as the median of repeated runs. Its peak traced
+allocation (tracemalloc) is measured in one extra run. Stages:
+
+    add_feature            src.features.add_feature on a DataFrame
+    add_feature[float32]   the same in single precision
+    engineer_block         the NumPy feature kernel on a raw block
+    validate               src.validate schema checks on a DataFrame
+    preprocess             CreditPreprocessor.transform
+    predict_batch          src.predict.predict_batch end to end
+    score_matrix           CompiledScorer.score_matrix on a raw block
+    score_row              CompiledScorer.score_row           (1 row)
+    sensitivity_sweep      60 x 60 what-if grid around one applicant (1 row)
+    load_artifacts         joblib load of model + preprocessor (1 row)
+    do_predict             app.do_predict, result cache and session scorer cleared (1 row)
+    build_result           app.build_result, full HTML report, same reset (1 row)
+
+--startup adds dashboard cold-start stages, each measured in fresh
+interpreters: startup_import (import app.py in Streamlit bare mode) and
+startup_first_response (the first build_result, which loads the model),
+once with the pickles ([full]) and once with CREDIT_RISK_FAST_START=1
+([fast]).
+
+Results are written as JSON. With --baseline, any (stage, rows) entry
+whose throughput dropped by more than --tolerance is reported and the
+exit status is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.getcwd())
+
+from src.data import load_data
+from src.features import RAW_COLUMNS, add_feature, engineer_block
+from src.fastpath import compile_scorer
+from src.predict import load_model, predict_batch
+from src.preprocess import load_preprocessor, raw_block, PREPROCESSOR_PATH, SCALER_PATH
+from src.sensitivity import DEFAULT_RANGES, sweep
+from src.validate import validate
+
+DATA_PATH="data/credit_card_default_dataset.csv"
+MODEL_PATH="models/best_model.pkl"
+SIZES=(1,1_000,100_000,10_000_000)
+DEFAULT_TOLERANCE=0.20
+STARTUP_RUNS=3
+
+_STARTUP_PROBE="""
+import json, logging, time
+t0 = time.perf_counter()
+logging.disable(logging.WARNING)
+import app
+t1 = time.perf_counter()
+app.build_result("Bench Client", 32, "Male", "University", "Single", 80000,
+                 [10000, 9500, 8800, 9200, 8500, 9000], [5000, 4800, 4500, 5200, 4700, 5000], 0)
+t2 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "first_response": t2 - t1}))
+"""
+
+
+def synthetic_frame(n:int,source:pd.DataFrame,seed:int=0) -> pd.DataFrame:
+    """`n` applicants in RAW_COLUMNS layout, each column resampled from `source`."""
+    rng=np.random.default_rng(seed)
+    return pd.DataFrame({c:rng.choice(source[c].to_numpy(),size=n) for c in RAW_COLUMNS})
+
+
+def time_stage(fn,setup=None,min_time=0.2,min_repeats=3,max_repeats=1000) -> float:
+    """Median wall time of fn() in seconds; setup() runs untimed before each call."""
+    times=[]
+    total=0.0
+    while len(times)<min_repeats or (total<min_time and len(times)<max_repeats):
+        arg=setup() if setup is not None else None
+        start=time.perf_counter()
+        fn() if setup is None else fn(arg)
+        elapsed=time.perf_counter()-start
+        times.append(elapsed)
+        total+=elapsed
+    return float(np.median(times))
+
+
+def peak_memory(fn,setup=None) -> float:
+    """Peak traced allocation of one fn() call, in MB."""
+    arg=setup() if setup is not None else None
+    tracemalloc.start()
+    try:
+        fn() if setup is None else fn(arg)
+        _,peak=tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak/2**20
+
+
+def _dashboard():
+    # app.py renders its page on import; outside `streamlit run` that is a no-op (bare mode)
+    import logging
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    import app
+    return app
+
+
+def _dashboard_args(row):
+    return ("Bench Client",int(row["AGE"]),"Male","University","Single",float(row["LIMIT_BAL"]),
+            [float(row[f"BILL_AMT{i}"]) for i in range(1,7)],
+            [float(row[f"PAY_AMT{i}"]) for i in range(1,7)],int(row["PAY_0"]))
+
+
+def stages(model,preprocessor,scorer,model_path,preprocessor_path,scaler_path,dashboard=True):
+    """{name: (sizes or None for all, fn(df, block) -> (fn, setup))}."""
+    out={
+        "add_feature":(None,lambda df,block:(lambda: add_feature(df),None)),
+        "add_feature[float32]":(None,lambda df,block:(lambda: add_feature(df,dtype="float32"),None)),
+        "engineer_block":(None,lambda df,block:(lambda: engineer_block(block),None)),
+        "validate":(None,lambda df,block:(lambda: validate(df),None)),
+        "preprocess":(None,lambda df,block:(lambda: preprocessor.transform(df),None)),
+        "predict_batch":(None,lambda df,block:(lambda: predict_batch(model,preprocessor,df),None)),
+        "load_artifacts":((1,),lambda df,block:(
+            lambda: (load_model(model_path),load_preprocessor(preprocessor_path,scaler_path)),None)),
+    }
+    if scorer is not None:
+        out["score_matrix"]=(None,lambda df,block:(lambda: scorer.score_matrix(block),None))
+        def score_row(df,block):
+            row=df.iloc[0].to_dict()
+            return (lambda: scorer.score_row(row),None)
+        out["score_row"]=((1,),score_row)
+        def sensitivity(df,block):
+            row=df.iloc[0].to_dict()
+            x,y=("LIMIT_BAL",*DEFAULT_RANGES["LIMIT_BAL"]),("AVG_PAY_AMT",*DEFAULT_RANGES["AVG_PAY_AMT"])
+            return (lambda: sweep(scorer.score_matrix,row,x,y,steps=60),None)
+        out["sensitivity_sweep"]=((1,),sensitivity)
+    if dashboard:
+        app=_dashboard()
+        def cold():
+            # Each run scores from scratch: no cached result and no SessionScorer
+            # holding the previous run's row (it would only recompute a delta)
+            app.RESULT_CACHE.clear()
+            app.st.session_state.pop("session_scorer",None)
+        def dashboard_stage(fn):
+            def make(df,block):
+                args=_dashboard_args(df.iloc[0])
+                return (lambda _: fn(*args),cold)
+            return ((1,),make)
+        out["do_predict"]=dashboard_stage(app.do_predict)
+        out["build_result"]=dashboard_stage(app.build_result)
+    return out
+
+
+def startup(runs=STARTUP_RUNS,log=print) -> list:
+    """Cold-start entries for the dashboard in full and fast-start mode, each the median of `runs` fresh processes."""
+    results=[]
+    for mode,env in (("full",{"CREDIT_RISK_FAST_START":"0"}),("fast",{"CREDIT_RISK_FAST_START":"1"})):
+        samples=[]
+        for _ in range(runs):
+            out=subprocess.run([sys.executable,"-c",_STARTUP_PROBE],env={**os.environ,**env},
+                               capture_output=True,text=True,check=True)
+            samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+        for key in ("import","first_response"):
+            seconds=float(np.median([s[key] for s in samples]))
+            name=f"startup_{key}[{mode}]"
+            results.append({"stage":name,"rows":1,"seconds":seconds,"rows_per_s":1/seconds,
+                            "latency_us":seconds*1e6,"peak_mb":None})
+            log(f"{name:<31} {seconds*1e3:11.1f} ms")
+    return results
+
+
+def run(sizes=SIZES,data_path=DATA_PATH,model_path=MODEL_PATH,preprocessor_path=PREPROCESSOR_PATH,
+        scaler_path=SCALER_PATH,only=None,dashboard=True,memory=True,seed=0,log=print) -> dict:
+    model=load_model(model_path)
+    preprocessor=load_preprocessor(preprocessor_path,scaler_path)
+    scorer=compile_scorer(model,preprocessor)
+    source=load_data(data_path)
+
+    results=[]
+    for n in sizes:
+        df=synthetic_frame(n,source,seed)
+        block=raw_block(df)
+        for name,(stage_sizes,make) in stages(model,preprocessor,scorer,model_path,
+                                              preprocessor_path,scaler_path,dashboard).items():
+            if only and name not in only:
+                continue
+            if stage_sizes is not None and n not in stage_sizes:
+                continue
+            fn,setup=make(df,block)
+            seconds=time_stage(fn,setup)
+            entry={
+                "stage":name,
+                "rows":n,
+                "seconds":seconds,
+                "rows_per_s":n/seconds,
+                "latency_us":seconds/n*1e6,
+                "peak_mb":peak_memory(fn,setup) if memory else None,
+            }
+            results.append(entry)
+            mem="" if entry["peak_mb"] is None else f"  peak {entry['peak_mb']:9.1f} MB"
+            log(f"{name:<20} {n:>11,} rows  {seconds*1e3:11.3f} ms  {entry['rows_per_s']:14,.0f} rows/s{mem}")
+        del df,block
+
+    return {"meta":environment(),"results":results}
+
+
+def environment() -> dict:
+    import sklearn
+    return {
+        "created":time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python":platform.python_version(),
+        "platform":platform.platform(),
+        "cpu_count":os.cpu_count(),
+        "numpy":np.__version__,
+        "pandas":pd.__version__,
+        "sklearn":sklearn.__version__,
+    }
+
+
+def compare(current:dict,baseline:dict,tolerance:float=DEFAULT_TOLERANCE) -> list:
+    """Entries whose rows/s fell below (1 - tolerance) x baseline, as (stage, rows, old, new) tuples."""
+    base={(r["stage"],r["rows"]):r for r in baseline["results"]}
+    regressions=[]
+    for r in current["results"]:
+        old=base.get((r["stage"],r["rows"]))
+        if old is not None and r["rows_per_s"]<(1-tolerance)*old["rows_per_s"]:
+            regressions.append((r["stage"],r["rows"],old["rows_per_s"],r["rows_per_s"]))
+    return regressions
+
+
+def main(argv=None):
+    parser=argparse.ArgumentParser(description="Benchmark feature engineering, preprocessing, scoring and rendering.")
+    parser.add_argument("--sizes",type=int,nargs="+",default=list(SIZES))
+    parser.add_argument("--stages",nargs="+",default=None,help="run only these stages")
+    parser.add_argument("--data",default=DATA_PATH,help="source of the column distributions")
+    parser.add_argument("--model",default=MODEL_PATH)
+    parser.add_argument("--preprocessor",default=PREPROCESSOR_PATH)
+    parser.add_argument("--scaler",default=SCALER_PATH)
+    parser.add_argument("--no-dashboard",action="store_true",help="skip the app.py stages (no streamlit import)")
+    parser.add_argument("--no-memory",action="store_true",help="skip the tracemalloc run")
+    parser.add_argument("--startup",action="store_true",help="also measure dashboard cold start")
+    parser.add_argument("--out",default="bench_results.json")
+    parser.add_argument("--baseline",default=None,help="JSON from an earlier run to compare against")
+    parser.add_argument("--save-baseline",default=None,help="also write the results here")
+    parser.add_argument("--tolerance",type=float,default=DEFAULT_TOLERANCE,help="allowed relative throughput drop")
+    args=parser.parse_args(argv)
+
+    report=run(args.sizes,args.data,args.model,args.preprocessor,args.scaler,args.stages,
+               not args.no_dashboard,not args.no_memory)
+    if args.startup:
+        report["results"].extend(startup())
+    for path in filter(None,(args.out,args.save_baseline)):
+        os.makedirs(os.path.dirname(os.path.abspath(path)),exist_ok=True)
+        with open(path,"w") as f:
+            json.dump(report,f,indent=1)
+    print(f"Results saved at: {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions=compare(report,json.load(f),args.tolerance)
+        for stage,rows,old,new in regressions:
+            print(f"REGRESSION {stage} @ {rows:,} rows: {old:,.0f} -> {new:,.0f} rows/s ({new/old-1:+.0%})")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+
+if __name__=="__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Versioned single-file model bundle for the linear default model.
+
+    python -m src.bundle                       # pickles -> models/model.crb
+    model = load_model("models/model.crb")     # src.predict, any worker
+    pre = load_preprocessor("models/model.crb")
+
+One file holds the classifier and its preprocessor. The layout is
+little-endian:
+
+    header   magic "CRBUNDLE", format version, feature count, metadata
+             length, data offset/length, BLAKE2b-256 checksum of the rest
+    metadata UTF-8 JSON: feature order, categorical vocabulary, class
+             labels, RAW/ENGINEERED column lists, source hashes
+    data     float64[3n + 1] at a 64-byte aligned offset:
+             coef[n] | mean[n] | scale[n] | intercept
+
+The data block is opened with np.memmap, so every process that loads the
+bundle maps the same page-cache pages instead of unpickling its own copy.
+The coefficients and scaler statistics are read-only views into that map.
+Loading verifies the checksum and rejects bundles from a newer format
+version or from a different feature-engineering layout. It also rejects
+bundles whose feature order does not match their vocabulary, and stale
+bundles: a source pickle that still sits next to the bundle but no longer
+hashes to the value recorded at build time means the model was retrained
+after the bundle was written. A retrain that produces a non-linear model
+deletes the old bundle instead of leaving it behind.
+"""
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+
+from src.features import RAW_COLUMNS, ENGINEERED_COLUMNS
+
+BUNDLE_PATH="models/model.crb"
+BUNDLE_MAGIC=b"CRBUNDLE"
+BUNDLE_VERSION=1
+# magic, version, flags, n_features, metadata length, data offset, data length, checksum
+_HEADER=struct.Struct("<8sHHIIQQ32s")
+_ALIGN=64
+
+
+def is_bundle(path) -> bool:
+    try:
+        with open(path,"rb") as f:
+            return f.read(len(BUNDLE_MAGIC))==BUNDLE_MAGIC
+    except (OSError,TypeError):
+        return False
+
+
+def _checksum(body:bytes) -> bytes:
+    return hashlib.blake2b(body,digest_size=32).digest()
+
+
+def content_hash(path:str) -> str:
+    with open(path,"rb") as f:
+        return hashlib.blake2b(f.read(),digest_size=16).hexdigest()
+
+
+def write_bundle(model,preprocessor,path=BUNDLE_PATH,sources=()) -> dict:
+    """Write the bundle for a fitted binary linear model + preprocessor pair; returns its metadata."""
+    from src.preprocess import as_preprocessor
+
+    if not hasattr(model,"coef_") or np.ravel(model.intercept_).shape!=(1,):
+        raise TypeError(f"{type(model).__name__} is not a binary linear model")
+    if not hasattr(model,"predict_proba"):
+        raise TypeError(f"{type(model).__name__} has no logistic probabilities")
+    pre=as_preprocessor(preprocessor)
+    names=list(pre.feature_names_)
+    n=len(names)
+    data=np.concatenate([
+        np.ravel(model.coef_),np.asarray(pre.mean_),np.asarray(pre.scale_),np.ravel(model.intercept_),
+    ]).astype("<f8")
+    if data.shape!=(3*n+1,):
+        raise ValueError(f"model has {np.ravel(model.coef_).size} coefficients for {n} features")
+
+    meta={
+        "feature_names":names,
+        "categories":{c:[int(v) for v in vs] for c,vs in pre.categories_.items()},
+        "classes":np.asarray(model.classes_).tolist(),
+        "model_class":type(model).__name__,
+        "raw_columns":RAW_COLUMNS,
+        "engineered_columns":ENGINEERED_COLUMNS,
+        "sources":{os.path.basename(p):content_hash(p) for p in sources},
+    }
+    meta_bytes=json.dumps(meta,separators=(",",":")).encode()
+    offset=-(-(_HEADER.size+len(meta_bytes))//_ALIGN)*_ALIGN
+    body=meta_bytes+b"\0"*(offset-_HEADER.size-len(meta_bytes))+data.tobytes()
+    header=_HEADER.pack(BUNDLE_MAGIC,BUNDLE_VERSION,0,n,len(meta_bytes),offset,data.nbytes,_checksum(body))
+
+    tmp=path+".tmp"
+    with open(tmp,"wb") as f:
+        f.write(header)
+        f.write(body)
+    os.replace(tmp,path)
+    return meta
+
+
+def read_bundle(path=BUNDLE_PATH,verify=True):
+    """
+    (meta, data) for a bundle; data is the read-only memory-mapped float64
+    block. Raises ValueError for a wrong magic, a newer format version, a
+    truncated file, a checksum mismatch or stale source pickles (when
+    verify) or a feature layout this code cannot build.
+    """
+    with open(path,"rb") as f:
+        head=f.read(_HEADER.size)
+        if len(head)<_HEADER.size or head[:len(BUNDLE_MAGIC)]!=BUNDLE_MAGIC:
+            raise ValueError(f"{path} is not a model bundle")
+        _,version,_,n,meta_len,offset,data_len,checksum=_HEADER.unpack(head)
+        if version>BUNDLE_VERSION:
+            raise ValueError(f"{path} is bundle format v{version}; this code reads up to v{BUNDLE_VERSION}")
+        size=os.fstat(f.fileno()).st_size
+        if size!=offset+data_len or data_len!=(3*n+1)*8:
+            raise ValueError(f"{path} is truncated or has an inconsistent layout")
+        if verify:
+            body=f.read()
+            if _checksum(body)!=checksum:
+                raise ValueError(f"{path} failed its checksum; the file is corrupt")
+            meta_bytes=body[:meta_len]
+        else:
+            meta_bytes=f.read(meta_len)
+    meta=json.loads(meta_bytes)
+
+    if meta["raw_columns"]!=RAW_COLUMNS or meta["engineered_columns"]!=ENGINEERED_COLUMNS:
+        raise ValueError(f"{path} was built for a different feature-engineering layout")
+    if len(meta["feature_names"])!=n:
+        raise ValueError(f"{path} lists {len(meta['feature_names'])} features, header says {n}")
+    if verify:
+        _check_sources(path,meta)
+    data=np.memmap(path,dtype="<f8",mode="r",offset=offset,shape=(3*n+1,))
+    return meta,data
+
+
+def _check_sources(path,meta):
+    folder=os.path.dirname(path)
+    for name,digest in meta.get("sources",{}).items():
+        source=os.path.join(folder,name)
+        if os.path.exists(source) and content_hash(source)!=digest:
+            raise ValueError(f"{path} is stale: {name} changed after the bundle was written; "
+                             f"rebuild it with python -m src.bundle")
+
+
+def _preprocessor(meta,data):
+    from sklearn.preprocessing import StandardScaler
+    from src.preprocess import CreditPreprocessor
+
+    names=meta["feature_names"]
+    n=len(names)
+    scaler=StandardScaler()
+    scaler.mean_=data[n:2*n]
+    scaler.scale_=data[2*n:3*n]
+    scaler.var_=np.square(scaler.scale_)
+    scaler.n_features_in_=n
+    scaler.feature_names_in_=np.asarray(names,dtype=object)
+    pre=CreditPreprocessor.from_scaler(scaler)
+    vocabulary={c:[int(v) for v in vs] for c,vs in pre.categories_.items()}
+    if vocabulary!=meta["categories"]:
+        raise ValueError("bundle feature order does not match its categorical vocabulary")
+    return pre
+
+
+def _model(meta,data):
+    from sklearn.linear_model import LogisticRegression
+
+    # Any logistic-link linear model (LogisticRegression, log-loss SGDClassifier)
+    # scores identically from its coefficients, so it loads as a LogisticRegression
+    n=len(meta["feature_names"])
+    model=LogisticRegression()
+    model.classes_=np.asarray(meta["classes"])
+    model.coef_=data[:n].reshape(1,n)
+    model.intercept_=data[3*n:]
+    model.n_features_in_=n
+    return model
+
+
+def load_bundle(path=BUNDLE_PATH,verify=True):
+    """(model, preprocessor) sharing one memory map of the bundle's data block."""
+    meta,data=read_bundle(path,verify)
+    return _model(meta,data),_preprocessor(meta,data)
+
+
+def load_bundle_model(path=BUNDLE_PATH,verify=True):
+    meta,data=read_bundle(path,verify)
+    return _model(meta,data)
+
+
+def load_bundle_preprocessor(path=BUNDLE_PATH,verify=True):
+    meta,data=read_bundle(path,verify)
+    return _preprocessor(meta,data)
+
+
+def write_bundle_if_linear(model,preprocessor,path=BUNDLE_PATH,sources=()) -> bool:
+    """write_bundle, skipped (False) for non-linear models; used after retraining.
+
+    A skipped write removes any bundle already at `path`, which would
+    otherwise still hold the previous linear model.
+    """
+    try:
+        write_bundle(model,preprocessor,path,sources)
+    except TypeError:
+        if is_bundle(path):
+            os.remove(path)
+        return False
+    return True
+
+
+def main(argv=None):
+    parser=argparse.ArgumentParser(description="Convert the model + preprocessor pickles into one model bundle.")
+    parser.add_argument("--model",default="models/best_model.pkl")
+    parser.add_argument("--preprocessor",default="models/preprocessor.pkl")
+    parser.add_argument("--scaler",default="models/scaler.pkl",help="used when --preprocessor does not exist")
+    parser.add_argument("--out",default=BUNDLE_PATH)
+    args=parser.parse_args(argv)
+
+    from src.predict import load_model
+    from src.preprocess import load_preprocessor
+    model=load_model(args.model)
+    preprocessor=load_preprocessor(args.preprocessor,args.scaler)
+    sources=[p for p in (args.model,args.preprocessor,args.scaler) if os.path.exists(p)]
+    meta=write_bundle(model,preprocessor,args.out,sources)
+    print(f"Model bundle v{BUNDLE_VERSION} with {len(meta['feature_names'])} features "
+          f"saved at: {args.out} ({os.path.getsize(args.out):,} bytes)")
+
+
+if __name__=="__main__":
+    main()
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+def artifact_fingerprint(*paths) -> str:
+    """Cheap identity of the artifacts on disk (path, size, mtime); changes when any file is replaced."""
+    h=hashlib.blake2b(digest_size=12)
+    for p in paths:
+        try:
+            st=os.stat(p)
+            h.update(f"{os.path.abspath(p)}|{st.st_size}|{st.st_mtime_ns};".encode())
+        except FileNotFoundError:
+            h.update(f"{os.path.abspath(p)}|missing;".encode())
+    return h.hexdigest()
+
+
+def _canonical(v):
+    if isinstance(v,bool) or v is None or isinstance(v,str):
+        return v
+    if isinstance(v,(list,tuple)):
+        return [_canonical(x) for x in v]
+    if isinstance(v,dict):
+        return {str(k):_canonical(x) for k,x in v.items()}
+    # ints, floats and NumPy scalars hash the same for equal values
+    return float(v)
+
+
+def row_key(row) -> str:
+    """Canonical hash of a raw input row (dict/sequence); 80000 and 80000.0 give the same key."""
+    blob=json.dumps(_canonical(row),sort_keys=True,separators=(",",":"))
+    return hashlib.blake2b(blob.encode(),digest_size=16).hexdigest()
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache with optional TTL, tied to a set of artifact files.
+
+    Keys are combined with artifact_fingerprint(*artifact_paths); when the
+    model or scaler on disk changes every entry is dropped.
+    """
+
+    def __init__(self,maxsize=1024,ttl=None,artifact_paths=(),clock=time.monotonic):
+        if maxsize<1:
+            raise ValueError("maxsize must be a positive integer")
+        self.maxsize=maxsize
+        self.ttl=ttl
+        self.artifact_paths=tuple(artifact_paths)
+        self._clock=clock
+        self._data=OrderedDict()
+        self._lock=threading.Lock()
+        self._fingerprint=artifact_fingerprint(*self.artifact_paths)
+        self.hits=0
+        self.misses=0
+        self.invalidations=0
+
+    def _check_artifacts(self):
+        fp=artifact_fingerprint(*self.artifact_paths)
+        if fp!=self._fingerprint:
+            self._data.clear()
+            self._fingerprint=fp
+            self.invalidations+=1
+
+    def get(self,key,default=None):
+        with self._lock:
+            self._check_artifacts()
+            k=(self._fingerprint,key)
+            item=self._data.get(k)
+            if item is not None:
+                value,expires=item
+                if expires is None or expires>self._clock():
+                    self._data.move_to_end(k)
+                    self.hits+=1
+                    return value
+                del self._data[k]
+            self.misses+=1
+            return default
+
+    def set(self,key,value):
+        with self._lock:
+            self._check_artifacts()
+            expires=None if self.ttl is None else self._clock()+self.ttl
+            k=(self._fingerprint,key)
+            self._data[k]=(value,expires)
+            self._data.move_to_end(k)
+            while len(self._data)>self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_compute(self,key,fn):
+        missing=object()
+        value=self.get(key,missing)
+        if value is missing:
+            value=fn()
+            self.set(key,value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        total=self.hits+self.misses
+        return {
+            "hits":self.hits,
+            "misses":self.misses,
+            "hit_rate":self.hits/total if total else 0.0,
+            "size":len(self._data),
+            "maxsize":self.maxsize,
+            "invalidations":self.invalidations,
+        }
@@ -1,7 +1,144 @@
+"""
+Dataset loading with a typed columnar cache.
+
+The first load_data() call on a CSV parses it once, narrows every column to
+a compact dtype (int8 codes, int32/float32 amounts) and writes one .npy file
+per column under data/cache/<name>-<hash>/. Later calls memory-map those
+files instead of re-parsing, so the returned frame is backed by read-only
+pages shared with the OS cache. The cache key is the BLAKE2 hash of the
+source file, so an edited CSV gets a fresh cache automatically.
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
 import pandas as pd
 
-def load_data(path:str) -> pd.DataFrame:
-    df=df.read_csv(path)
-    df=df.rename(columns={'default payment next month':'Default'})
-    df=df.drop("ID",axis=1)
-    return df
\ No newline at end of file
+TARGET="Default"
+CACHE_DIR=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),"data","cache")
+CACHE_VERSION=1
+
+# Everything not listed (PAY_*, SEX, EDUCATION, MARRIAGE, AGE, Default) is int8
+AMOUNT_COLUMNS=(
+    ["LIMIT_BAL"]
+    +[f"BILL_AMT{i}" for i in range(1,7)]
+    +[f"PAY_AMT{i}" for i in range(1,7)]
+)
+
+
+def _read_raw(path:str,**kwargs) -> pd.DataFrame:
+    df=pd.read_csv(path,header=1,**kwargs)
+    df=df.rename(columns={'default payment next month':TARGET})
+    return df.drop("ID",axis=1)
+
+
+def iter_chunks(path:str,chunk_size:int=100_000,**kwargs):
+    """Raw CSV in DataFrame chunks with the target renamed; `ID` is kept for splitting/joins."""
+    for chunk in pd.read_csv(path,header=1,chunksize=chunk_size,**kwargs):
+        yield chunk.rename(columns={'default payment next month':TARGET})
+
+
+def file_hash(path:str,block_size:int=1<<20) -> str:
+    h=hashlib.blake2b(digest_size=16)
+    with open(path,"rb") as f:
+        for block in iter(lambda: f.read(block_size),b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _compact(col:pd.Series) -> np.ndarray:
+    values=col.to_numpy()
+    if col.name in AMOUNT_COLUMNS:
+        info=np.iinfo(np.int32)
+        if np.issubdtype(values.dtype,np.integer) and values.min()>=info.min and values.max()<=info.max:
+            return values.astype(np.int32)
+        return values.astype(np.float32)
+    info=np.iinfo(np.int8)
+    if np.issubdtype(values.dtype,np.integer) and values.min()>=info.min and values.max()<=info.max:
+        return values.astype(np.int8)
+    # Unexpected codes: keep them exact rather than wrapping around
+    return values
+
+
+class _HashIndex:
+    # Remembers (path, size, mtime) -> content hash so unchanged files are not re-read
+    def __init__(self,cache_dir):
+        self.path=os.path.join(cache_dir,"index.json")
+        try:
+            with open(self.path) as f:
+                self.entries=json.load(f)
+        except (FileNotFoundError,ValueError):
+            self.entries={}
+
+    def lookup(self,src):
+        st=os.stat(src)
+        key=os.path.abspath(src)
+        stamp=[st.st_size,st.st_mtime_ns]
+        entry=self.entries.get(key)
+        if entry and entry["stamp"]==stamp:
+            return entry["hash"]
+        digest=file_hash(src)
+        self.entries[key]={"stamp":stamp,"hash":digest}
+        folder=os.path.dirname(self.path)
+        os.makedirs(folder,exist_ok=True)
+        # A private temp file per writer: concurrent processes never interleave
+        # into one file, and the last os.replace wins with a complete index
+        with tempfile.NamedTemporaryFile("w",dir=folder,prefix="index-",suffix=".tmp",delete=False) as f:
+            json.dump(self.entries,f)
+        os.replace(f.name,self.path)
+        return digest
+
+
+def cache_path(path:str,cache_dir:str=CACHE_DIR) -> str:
+    stem=os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir,f"{stem}-{_HashIndex(cache_dir).lookup(path)}")
+
+
+def build_cache(path:str,cache_dir:str=CACHE_DIR) -> str:
+    """Parse `path` once and write the columnar cache; returns the cache directory."""
+    target=cache_path(path,cache_dir)
+    if os.path.exists(os.path.join(target,"meta.json")):
+        return target
+
+    df=_read_raw(path)
+    tmp=target+f".tmp{os.getpid()}"
+    os.makedirs(tmp,exist_ok=True)
+    columns=[]
+    for name in df.columns:
+        values=_compact(df[name])
+        np.save(os.path.join(tmp,f"{name}.npy"),values)
+        columns.append({"name":name,"dtype":values.dtype.str})
+    with open(os.path.join(tmp,"meta.json"),"w") as f:
+        json.dump({"version":CACHE_VERSION,"source":os.path.abspath(path),"rows":len(df),"columns":columns},f,indent=1)
+    try:
+        os.replace(tmp,target)
+    except OSError:
+        # Another process published the same cache first
+        for name in os.listdir(tmp):
+            os.remove(os.path.join(tmp,name))
+        os.rmdir(tmp)
+    return target
+
+
+def load_cache(cache:str) -> pd.DataFrame:
+    with open(os.path.join(cache,"meta.json")) as f:
+        meta=json.load(f)
+    if meta.get("version")!=CACHE_VERSION:
+        raise ValueError(f"unsupported data cache version in {cache}")
+    data={c["name"]:np.load(os.path.join(cache,f"{c['name']}.npy"),mmap_mode="r") for c in meta["columns"]}
+    # copy=False keeps each column as its own memory-mapped block
+    return pd.DataFrame(data,copy=False)
+
+
+def load_data(path:str,use_cache:bool=True,cache_dir:str=CACHE_DIR) -> pd.DataFrame:
+    """
+    The dataset with the target renamed to `Default` and `ID` dropped.
+
+    With use_cache the columns are compact, memory-mapped and read-only:
+    derive new columns freely but .copy() before editing existing ones.
+    """
+    if not use_cache:
+        return _read_raw(path)
+    return load_cache(build_cache(path,cache_dir))
@@ -0,0 +1,356 @@
+"""
+Streaming population-drift monitor for scored traffic.
+
+    python -m src.drift build                     # training split -> models/drift_reference.npz
+    python -m src.drift report --state logs/drift_state.npz
+
+    monitor = DriftMonitor(DriftReference.load(), state_path="logs/drift_state.npz")
+    monitor.observe(block, probs)                 # (n, 23) raw rows and their probabilities
+    monitor.report()                              # PSI / KS per feature, worst first
+    monitor.save()
+
+The reference snapshot fixes bin edges for every raw column, every
+engineered feature and the output PROBABILITY. The training split is the
+one notebook 02 and src.preprocess hold out, 80% at random_state 42. A
+column with at most MAX_DISCRETE distinct training values gets one bin per
+value (PAY_0, SEX, NUM_LATE_MONTHS, ...). Any other column gets DRIFT_BINS
+quantile bins. The outer bins are open-ended, so out-of-range traffic is
+still counted. Values the training data never had land in the nearest
+bin. DriftReference.build_chunked makes the same snapshot from streamed
+blocks for src.train --out-of-core. Its bin edges come from a leading
+sample of rows, and all rows are counted.
+
+The live side is a fixed array of bin counts, the same size however much
+traffic it sees. observe() only copies rows into a preallocated buffer.
+When `flush_rows` rows have arrived, the full buffer is swapped for a
+fresh one and handed to a background thread. That thread engineers it
+with src.features.engineer_block, bins each column with one searchsorted
+and adds all counts with one bincount. The request that fills the buffer
+pays for a queue put, not the fold, so the per-request cost is a memcpy.
+report() and save() wait for queued buffers first. PSI uses the usual
+0.1 / 0.25 bands. KS is
+the largest gap between the reference and live CDFs at the bin edges. The
+state is the count array plus a row total, saved as a compressed .npz. It
+is only resumed against the reference it was built with.
+"""
+import argparse
+import hashlib
+import os
+import queue
+import sys
+import threading
+import time
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+
+from src.features import RAW_COLUMNS, ENGINEERED_COLUMNS, engineer_block
+
+DRIFT_REFERENCE_PATH="models/drift_reference.npz"
+DRIFT_STATE_PATH="logs/drift_state.npz"
+DATA_PATH="data/credit_card_default_dataset.csv"
+FEATURES=RAW_COLUMNS+ENGINEERED_COLUMNS+["PROBABILITY"]
+DRIFT_BINS=20
+MAX_DISCRETE=16
+FLUSH_ROWS=4096
+# Rows a streamed reference takes its bin edges from
+EDGE_SAMPLE_ROWS=200_000
+# PSI bands: below PSI_WARN is stable, above PSI_ALERT is a major shift
+PSI_WARN=0.1
+PSI_ALERT=0.25
+_EPS=1e-4
+
+
+def _columns(block,probs):
+    # The len(FEATURES) 1-D value columns for raw rows and their probabilities
+    eng=engineer_block(block)
+    return [block[:,j] for j in range(block.shape[1])]+[eng[:,j] for j in range(eng.shape[1])]+[probs]
+
+
+def _count(edges,columns) -> list:
+    return [np.bincount(np.searchsorted(e,c,side="right"),minlength=len(e)+1) for e,c in zip(edges,columns)]
+
+
+def _edges(values,bins=DRIFT_BINS) -> np.ndarray:
+    values=values[np.isfinite(values)]
+    distinct=np.unique(values)
+    if len(distinct)<=MAX_DISCRETE:
+        return (distinct[:-1]+distinct[1:])/2
+    return np.unique(np.quantile(values,np.linspace(0,1,bins+1)[1:-1]))
+
+
+def psi(expected,actual) -> float:
+    """Population stability index between two count (or share) vectors."""
+    p=np.maximum(np.asarray(expected,dtype=np.float64)/max(np.sum(expected),1),_EPS)
+    q=np.maximum(np.asarray(actual,dtype=np.float64)/max(np.sum(actual),1),_EPS)
+    return float(np.sum((q-p)*np.log(q/p)))
+
+
+def ks(expected,actual) -> float:
+    """Kolmogorov-Smirnov distance between two binned distributions."""
+    p=np.cumsum(expected,dtype=np.float64)/max(np.sum(expected),1)
+    q=np.cumsum(actual,dtype=np.float64)/max(np.sum(actual),1)
+    return float(np.max(np.abs(p-q)))
+
+
+def drift_status(value) -> str:
+    return "major" if value>=PSI_ALERT else "moderate" if value>=PSI_WARN else "stable"
+
+
+class DriftReference:
+    """Bin edges and training-set counts for every FEATURES column."""
+
+    def __init__(self,edges,counts,rows,features=FEATURES):
+        self.features=list(features)
+        self.edges=[np.asarray(e,dtype=np.float64) for e in edges]
+        self.counts=[np.asarray(c,dtype=np.int64) for c in counts]
+        self.rows=int(rows)
+        # Flat count layout: feature i owns bins offsets[i]:offsets[i+1]
+        self.offsets=np.cumsum([0]+[len(e)+1 for e in self.edges])
+        h=hashlib.blake2b(digest_size=8)
+        for e in self.edges:
+            h.update(e.tobytes())
+        self.id=h.hexdigest()
+
+    @classmethod
+    def build(cls,block,probs,bins=DRIFT_BINS):
+        """Reference from (n, 23) raw training rows and the model's probabilities for them."""
+        columns=_columns(np.asarray(block,dtype=np.float64),np.asarray(probs,dtype=np.float64))
+        edges=[_edges(c,bins) for c in columns]
+        return cls(edges,_count(edges,columns),len(block))
+
+    @classmethod
+    def build_chunked(cls,blocks,score_fn,bins=DRIFT_BINS,sample_rows=EDGE_SAMPLE_ROWS):
+        """
+        Reference from an iterable of raw training blocks, in one pass and
+        bounded memory: the bin edges come from the first `sample_rows`
+        rows, then every row is counted. score_fn maps a block to the
+        model's probabilities.
+        """
+        sample,edges,counts,rows=[],None,None,0
+        for block in blocks:
+            block=np.asarray(block,dtype=np.float64)
+            if not len(block):
+                continue
+            columns=_columns(block,np.asarray(score_fn(block),dtype=np.float64))
+            rows+=len(block)
+            if edges is None:
+                sample.append(columns)
+                if rows<sample_rows:
+                    continue
+                columns=[np.concatenate(c) for c in zip(*sample)]
+                edges=[_edges(c,bins) for c in columns]
+                counts=[np.zeros(len(e)+1,dtype=np.int64) for e in edges]
+                sample=None
+            for total,part in zip(counts,_count(edges,columns)):
+                total+=part
+        if edges is None:
+            if not rows:
+                raise ValueError("no training rows to build a drift reference from")
+            columns=[np.concatenate(c) for c in zip(*sample)]
+            edges=[_edges(c,bins) for c in columns]
+            counts=_count(edges,columns)
+        return cls(edges,counts,rows)
+
+    def save(self,path=DRIFT_REFERENCE_PATH):
+        os.makedirs(os.path.dirname(path) or ".",exist_ok=True)
+        np.savez_compressed(path,features=np.asarray(self.features),rows=self.rows,
+                            edges=np.concatenate(self.edges),counts=np.concatenate(self.counts),
+                            offsets=self.offsets)
+
+    @classmethod
+    def load(cls,path=DRIFT_REFERENCE_PATH):
+        with np.load(path) as f:
+            offsets=f["offsets"]
+            edges,counts=f["edges"],f["counts"]
+            bins=np.diff(offsets)
+            edge_offsets=np.cumsum(np.concatenate([[0],bins-1]))
+            return cls([edges[a:b] for a,b in zip(edge_offsets[:-1],edge_offsets[1:])],
+                       [counts[a:b] for a,b in zip(offsets[:-1],offsets[1:])],
+                       int(f["rows"]),f["features"].tolist())
+
+
+def training_reference(model,preprocessor,path=DATA_PATH,bins=DRIFT_BINS) -> DriftReference:
+    """DriftReference from the training split of the dataset, scored by `model`."""
+    from sklearn.model_selection import train_test_split
+    from src.data import TARGET, load_data
+    from src.predict import predict_batch
+    from src.preprocess import raw_block
+
+    df=load_data(path)
+    train,_=train_test_split(df,test_size=0.2,random_state=42,stratify=df[TARGET])
+    block=raw_block(train)
+    return DriftReference.build(block,predict_batch(model,preprocessor,block),bins)
+
+
+class DriftMonitor:
+    def __init__(self,reference,state_path=None,flush_rows=FLUSH_ROWS):
+        self.reference=reference
+        self.state_path=state_path
+        self.counts=np.zeros(reference.offsets[-1],dtype=np.int64)
+        self.rows=0
+        self.since=time.time()
+        self._buffer=np.empty((flush_rows,len(RAW_COLUMNS)+1))
+        self._pending=0
+        # _lock guards the buffer, _counts_lock the histogram; folds run between the two
+        self._lock=threading.Lock()
+        self._counts_lock=threading.Lock()
+        self._full=queue.Queue()
+        self._folder=None
+        if state_path and os.path.exists(state_path):
+            self._resume(state_path)
+
+    def _resume(self,path):
+        with np.load(path) as f:
+            if str(f["reference"])!=self.reference.id:
+                # Built against other bin edges; start counting afresh
+                return
+            self.counts=f["counts"].astype(np.int64)
+            self.rows=int(f["rows"])
+            self.since=float(f["since"])
+
+    def observe(self,block,probs):
+        """Record scored rows: a (n, 23) raw block and the n probabilities."""
+        block=np.asarray(block,dtype=np.float64).reshape(-1,len(RAW_COLUMNS))
+        probs=np.asarray(probs,dtype=np.float64).reshape(-1)
+        with self._lock:
+            start=0
+            while start<len(block):
+                take=min(len(block)-start,len(self._buffer)-self._pending)
+                rows=slice(self._pending,self._pending+take)
+                self._buffer[rows,:-1]=block[start:start+take]
+                self._buffer[rows,-1]=probs[start:start+take]
+                self._pending+=take
+                start+=take
+                if self._pending==len(self._buffer):
+                    self._start_folder()
+                    self._full.put(self._swap())
+
+    def _swap(self):
+        # The buffered rows, replaced by an empty buffer; caller holds the lock
+        rows=self._buffer[:self._pending]
+        self._buffer=np.empty_like(self._buffer)
+        self._pending=0
+        return rows
+
+    def _start_folder(self):
+        if self._folder is None:
+            self._folder=threading.Thread(target=self._run,name="drift-fold",daemon=True)
+            self._folder.start()
+
+    def _run(self):
+        while True:
+            rows=self._full.get()
+            try:
+                self._fold(rows)
+            finally:
+                self._full.task_done()
+
+    def _fold(self,rows):
+        # Add a block of buffered rows to the histogram
+        n=len(rows)
+        if not n:
+            return
+        bins=np.empty((len(FEATURES),n),dtype=np.int64)
+        for i,(edges,values) in enumerate(zip(self.reference.edges,_columns(rows[:,:-1],rows[:,-1]))):
+            bins[i]=np.searchsorted(edges,values,side="right")
+        bins+=self.reference.offsets[:-1,None]
+        counts=np.bincount(bins.ravel(),minlength=len(self.counts))
+        with self._counts_lock:
+            self.counts+=counts
+            self.rows+=n
+
+    def flush(self):
+        """Fold every observed row, buffered or queued, into the counts."""
+        self._full.join()
+        with self._lock:
+            rows=self._swap()
+        self._fold(rows)
+
+    def _snapshot(self):
+        # (counts, rows) with every observed row folded in
+        self.flush()
+        with self._counts_lock:
+            return self.counts.copy(),self.rows
+
+    def report(self) -> dict:
+        """Rows seen and PSI / KS / status per feature, largest PSI first."""
+        counts,rows=self._snapshot()
+        ref=self.reference
+        features=[]
+        if rows:
+            for i,name in enumerate(ref.features):
+                live=counts[ref.offsets[i]:ref.offsets[i+1]]
+                value=psi(ref.counts[i],live)
+                features.append({"feature":name,"psi":value,"ks":ks(ref.counts[i],live),"status":drift_status(value)})
+            features.sort(key=lambda f: -f["psi"])
+        return {"rows":rows,"since":self.since,"reference":ref.id,"features":features}
+
+    def summary(self) -> dict:
+        """Compact status for /health: rows seen and the features past the alert band."""
+        report=self.report()
+        return {
+            "rows":report["rows"],
+            "major":[f["feature"] for f in report["features"] if f["status"]=="major"],
+            "moderate":[f["feature"] for f in report["features"] if f["status"]=="moderate"],
+        }
+
+    def reset(self):
+        self._full.join()
+        with self._lock,self._counts_lock:
+            self.counts[:]=0
+            self.rows=0
+            self._pending=0
+            self.since=time.time()
+
+    def save(self,path=None):
+        """Write the counts (pending rows included) to `path` or state_path, atomically."""
+        path=path or self.state_path
+        if not path:
+            raise ValueError("no path to save the drift state to; pass one or set state_path")
+        counts,rows=self._snapshot()
+        os.makedirs(os.path.dirname(path) or ".",exist_ok=True)
+        tmp=path+".tmp.npz"
+        np.savez_compressed(tmp,counts=counts,rows=rows,since=self.since,reference=self.reference.id)
+        os.replace(tmp,path)
+
+
+def format_report(report) -> str:
+    lines=[f"{report['rows']:,} rows since {time.strftime('%Y-%m-%d %H:%M',time.localtime(report['since']))}",
+           f"{'feature':<20} {'PSI':>8} {'KS':>7}  status"]
+    for f in report["features"]:
+        lines.append(f"{f['feature']:<20} {f['psi']:8.4f} {f['ks']:7.4f}  {f['status']}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser=argparse.ArgumentParser(description="Build a drift reference or report on a monitor's saved state.")
+    sub=parser.add_subparsers(dest="command",required=True)
+    build=sub.add_parser("build",help="reference snapshot from the training split")
+    build.add_argument("--data",default=DATA_PATH)
+    build.add_argument("--model",default="models/best_model.pkl")
+    build.add_argument("--preprocessor",default="models/preprocessor.pkl")
+    build.add_argument("--scaler",default="models/scaler.pkl")
+    build.add_argument("--bins",type=int,default=DRIFT_BINS)
+    build.add_argument("--out",default=DRIFT_REFERENCE_PATH)
+    report=sub.add_parser("report",help="PSI / KS of a saved monitor state")
+    report.add_argument("--reference",default=DRIFT_REFERENCE_PATH)
+    report.add_argument("--state",default=DRIFT_STATE_PATH)
+    args=parser.parse_args(argv)
+
+    if args.command=="build":
+        from src.predict import load_model
+        from src.preprocess import load_preprocessor
+        ref=training_reference(load_model(args.model),load_preprocessor(args.preprocessor,args.scaler),
+                               args.data,args.bins)
+        ref.save(args.out)
+        print(f"Drift reference over {ref.rows:,} training rows and {len(ref.features)} features "
+              f"saved at: {args.out} ({os.path.getsize(args.out):,} bytes)")
+    else:
+        monitor=DriftMonitor(DriftReference.load(args.reference),args.state)
+        print(format_report(monitor.report()))
+
+
+if __name__=="__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Exact per-feature explanations for the linear default model.
+
+For a logistic regression on standardized features the logit is
+
+    logit = intercept + sum_j coef_j * (x_j - mean_j) / scale_j
+
+so phi_j = coef_j * (x_j - mean_j) / scale_j is feature j's additive
+contribution. These are the SHAP values that shap.LinearExplainer gives
+with the training mean as background. They sum with expected_value (the
+intercept, i.e. the logit of an average applicant) to the model's logit.
+By default one-hot columns are summed back into their SEX / EDUCATION /
+MARRIAGE source column.
+
+    explainer = LinearExplainer(model, preprocessor)
+    explainer.explain_row(row, k=3)      # [(name, contribution), ...]
+    idx, phi = explainer.top_k(block)    # (n, k) arrays for a raw block
+"""
+import numpy as np
+
+from src.features import CATEGORICAL_COLUMNS, RAW_COLUMNS
+from src.fastpath import CompiledScorer
+from src.preprocess import raw_block
+from src.predict import DEFAULT_CHUNK_SIZE
+
+
+class LinearExplainer:
+    def __init__(self,model,preprocessor,group_categories=True):
+        self.scorer=scorer=CompiledScorer(model,preprocessor)
+        pre=scorer.preprocessor
+        self.expected_value=float(np.ravel(model.intercept_)[0])
+        # phi = x * weights - offsets, with x the unscaled feature vector
+        self.weights=scorer.weights
+        self.offsets=scorer.weights*pre.mean_
+
+        features=scorer.feature_names
+        if group_categories:
+            owner=[]
+            for name in features:
+                col=name.rpartition("_")[0]
+                owner.append(col if col in CATEGORICAL_COLUMNS else name)
+            self.names=list(dict.fromkeys(owner))
+        else:
+            owner=self.names=list(features)
+        pos={n:i for i,n in enumerate(self.names)}
+        self._group=np.array([pos[o] for o in owner],dtype=np.intp)
+        self._grouped=len(self.names)!=len(features)
+        # (features, names) 0/1 matrix: one matmul sums the one-hot columns per row
+        self._group_matrix=np.zeros((len(features),len(self.names)))
+        self._group_matrix[np.arange(len(features)),self._group]=1.0
+        self._names=np.asarray(self.names,dtype=object)
+
+    def _reduce(self,phi):
+        if not self._grouped:
+            return phi
+        if phi.ndim==1:
+            return np.bincount(self._group,weights=phi,minlength=len(self.names))
+        return phi@self._group_matrix
+
+    def contributions(self,rows) -> np.ndarray:
+        """(n, len(names)) contributions in logit units for raw rows (DataFrame or RAW_COLUMNS array)."""
+        X=self.scorer.features_matrix(raw_block(rows))
+        X*=self.weights
+        X-=self.offsets
+        return self._reduce(X)
+
+    def row_contributions(self,values) -> np.ndarray:
+        """Contributions for one raw row in RAW_COLUMNS order, without building a matrix."""
+        phi=self.scorer.features(values)*self.weights
+        phi-=self.offsets
+        return self._reduce(phi)
+
+    def explain_row(self,row,k=3) -> list:
+        """Top-k (name, contribution) pairs by absolute contribution for one row dict or value list."""
+        values=[row[c] for c in RAW_COLUMNS] if isinstance(row,dict) else row
+        phi=self.row_contributions(values)
+        order=np.argsort(-np.abs(phi))[:k]
+        return [(self.names[i],float(phi[i])) for i in order]
+
+    def top_k(self,rows,k=3,chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        (indices, contributions), both (n, k), ordered by absolute
+        contribution per row; names[indices] gives the feature names.
+        Rows are processed chunk_size at a time, so memory stays bounded.
+        """
+        block=raw_block(rows)
+        k=min(k,len(self.names))
+        n=len(block)
+        idx=np.empty((n,k),dtype=np.intp)
+        val=np.empty((n,k))
+        for start in range(0,n,chunk_size):
+            phi=self.contributions(block[start:start+chunk_size])
+            mag=np.abs(phi)
+            part=np.argpartition(-mag,k-1,axis=1)[:,:k] if k<phi.shape[1] else np.tile(np.arange(k),(len(phi),1))
+            order=np.argsort(-np.take_along_axis(mag,part,axis=1),axis=1)
+            top=np.take_along_axis(part,order,axis=1)
+            idx[start:start+len(phi)]=top
+            val[start:start+len(phi)]=np.take_along_axis(phi,top,axis=1)
+        return idx,val
+
+    def top_k_names(self,indices) -> np.ndarray:
+        return self._names[indices]
+
+
+def make_explainer(model,preprocessor,**kwargs):
+    """LinearExplainer for the pair, or None if the model is not linear."""
+    try:
+        return LinearExplainer(model,preprocessor,**kwargs)
+    except TypeError:
+        return None
@@ -1,25 +1,170 @@
-def add_feature(df):
-    bill_cols=[f'BILL_AMT{i}' for i in range(1,7)]
-    df['AVG_BILL_AMT']=df[bill_cols].mean(axis=1)
+import math
 
-    df['CREDIT_UTILITY']=df['AVG_BILL_AMT']/df['LIMIT_BAL']
+import numpy as np
+import pandas as pd
 
-    pay_col=[f'PAY_AMT{i}' for i in range(1,7)]
-    df['AVG_PAY_AMT']=df[pay_col].mean(axis=1)
-    
-    pay_delay_col=["PAY_0", "PAY_2", "PAY_3", "PAY_4", "PAY_5", "PAY_6"]
-    df['AVG_PAY_DELAY']=df[pay_delay_col].clip(lower=0).mean(axis=1)
-    
-    df['PAYMENT_TO_BILL']=(df['AVG_PAY_AMT']/(df['AVG_BILL_AMT']+1)).fillna(0)
+RAW_COLUMNS=[
+    "LIMIT_BAL","SEX","EDUCATION","MARRIAGE","AGE",
+    "PAY_0","PAY_2","PAY_3","PAY_4","PAY_5","PAY_6",
+    "BILL_AMT1","BILL_AMT2","BILL_AMT3","BILL_AMT4","BILL_AMT5","BILL_AMT6",
+    "PAY_AMT1","PAY_AMT2","PAY_AMT3","PAY_AMT4","PAY_AMT5","PAY_AMT6",
+]
+CATEGORICAL_COLUMNS=["SEX","EDUCATION","MARRIAGE"]
+ENGINEERED_COLUMNS=[
+    "AVG_BILL_AMT","CREDIT_UTILITY","AVG_PAY_AMT","AVG_PAY_DELAY","PAYMENT_TO_BILL",
+    "MAX_PAY_DELAY","NUM_LATE_MONTHS","PAYMENT_STD","SEVERE_DELAY_FLAG",
+]
 
-    pay_delay_cols = ["PAY_0", "PAY_2", "PAY_3", "PAY_4", "PAY_5", "PAY_6"]
-    df["MAX_PAY_DELAY"] = df[pay_delay_cols].clip(lower=0).max(axis=1)  
-    
-    df["NUM_LATE_MONTHS"] = (df[pay_delay_cols] > 0).sum(axis=1)
+FEATURE_CHUNK_ROWS=8192
+# Raw column positions of the three six-month groups: PAY_* statuses, BILL_AMT*, PAY_AMT*
+_GROUPS=(range(5,11),range(11,17),range(17,23))
+# Engineered columns that add_feature returns as integers, as the pandas version did
+_INTEGER_COLUMNS=("NUM_LATE_MONTHS","SEVERE_DELAY_FLAG")
 
-    pay_amt_cols = [f"PAY_AMT{i}" for i in range(1, 7)]
-    df["PAYMENT_STD"] = df[pay_amt_cols].std(axis=1)
 
-    df["SEVERE_DELAY_FLAG"] = (df["MAX_PAY_DELAY"] >= 3).astype(int)
+def _engineer_chunk(limit,delays,bills,pays,out):
+    # The nine features for one chunk from (6, k) month-major buffers, written
+    # to the nine rows of `out`. Clips `delays` and centres/squares `pays` in place.
+    avg_bill,utility,avg_pay,avg_delay,pay_to_bill,max_delay,late,pay_std,severe=out
+    np.add.reduce(bills,axis=0,out=avg_bill)
+    avg_bill/=6
+    np.add.reduce(pays,axis=0,out=avg_pay)
+    avg_pay/=6
+    np.maximum(delays,0,out=delays)
+    np.add.reduce(delays,axis=0,out=avg_delay)
+    avg_delay/=6
+    np.maximum.reduce(delays,axis=0,out=max_delay)
+    np.add.reduce(delays>0,axis=0,dtype=late.dtype,out=late)
+    np.greater_equal(max_delay,3,out=severe)
+    with np.errstate(divide="ignore",invalid="ignore"):
+        np.divide(avg_bill,limit,out=utility)
+        np.add(avg_bill,1,out=pay_to_bill)
+        np.divide(avg_pay,pay_to_bill,out=pay_to_bill)
+    np.copyto(pay_to_bill,0,where=np.isnan(pay_to_bill))
+    # Sample standard deviation (ddof=1) as pandas computes it: centre, then sum squares
+    pays-=avg_pay
+    np.square(pays,out=pays)
+    np.add.reduce(pays,axis=0,out=pay_std)
+    pay_std/=5
+    np.sqrt(pay_std,out=pay_std)
 
-    return df
\ No newline at end of file
+
+def _engineer_columns(columns,dtype="float64",chunk_rows=FEATURE_CHUNK_ROWS):
+    """
+    (9, n) engineered block from the 23 raw columns as 1-D arrays in
+    RAW_COLUMNS order (any strides and numeric dtype). Rows are processed
+    in chunks: each chunk's three six-month groups are copied into reused
+    contiguous (6, chunk_rows) buffers and all nine features are reduced
+    from them, so temporaries stay chunk-sized however many rows there are.
+    """
+    dtype=np.dtype(dtype)
+    n=len(columns[0])
+    out=np.empty((len(ENGINEERED_COLUMNS),n),dtype=dtype)
+    m=max(1,min(chunk_rows,n))
+    buffers=[np.empty((6,m),dtype=dtype) for _ in _GROUPS]
+    limit=np.empty(m,dtype=dtype)
+    for s in range(0,n,m):
+        e=min(s+m,n)
+        k=e-s
+        for buf,group in zip(buffers,_GROUPS):
+            for i,j in enumerate(group):
+                buf[i,:k]=columns[j][s:e]
+        limit[:k]=columns[0][s:e]
+        _engineer_chunk(limit[:k],*(buf[:,:k] for buf in buffers),out[:,s:e])
+    return out
+
+
+def add_feature(df,dtype="float64",chunk_rows=FEATURE_CHUNK_ROWS):
+    """
+    `df` plus the nine ENGINEERED_COLUMNS, as a new frame; `df` itself is
+    not modified. dtype="float32" computes in single precision and halves
+    the floating-point output columns (the count and the flag stay integers).
+    """
+    out=_engineer_columns([df[c].to_numpy() for c in RAW_COLUMNS],dtype,chunk_rows)
+    features=pd.DataFrame({
+        name:values.astype(np.int64) if name in _INTEGER_COLUMNS else values
+        for name,values in zip(ENGINEERED_COLUMNS,out)
+    },index=df.index,copy=False)
+    return pd.concat([df,features],axis=1)
+
+
+def _div(a,b):
+    # float64 division semantics (x/0 -> +-inf, 0/0 -> nan) like pandas
+    if b==0:
+        return math.nan if a==0 else math.copysign(math.inf,a)*math.copysign(1.0,b)
+    return a/b
+
+
+# Per-group pieces of engineer_row; src.session recomputes only the groups an edit touches
+
+def bill_features(bills):
+    """AVG_BILL_AMT from the six BILL_AMT values."""
+    return sum(float(v) for v in bills)/6
+
+
+def pay_features(pays):
+    """(AVG_PAY_AMT, PAYMENT_STD) from the six PAY_AMT values."""
+    pays=[float(v) for v in pays]
+    avg_pay=sum(pays)/6
+    return avg_pay,math.sqrt(sum((p-avg_pay)**2 for p in pays)/5)
+
+
+def delay_features(statuses):
+    """(AVG_PAY_DELAY, MAX_PAY_DELAY, NUM_LATE_MONTHS, SEVERE_DELAY_FLAG) from the six PAY_* codes."""
+    delays=[max(float(v),0.0) for v in statuses]
+    max_delay=max(delays)
+    late=sum(1 for v in statuses if v>0)
+    return sum(delays)/6,max_delay,float(late),1.0 if max_delay>=3 else 0.0
+
+
+def ratio_features(limit,avg_bill,avg_pay):
+    """(CREDIT_UTILITY, PAYMENT_TO_BILL)."""
+    pay_to_bill=_div(avg_pay,avg_bill+1)
+    if math.isnan(pay_to_bill):
+        pay_to_bill=0.0
+    return _div(avg_bill,float(limit)),pay_to_bill
+
+
+def engineer_row(values):
+    """The nine add_feature columns for one raw row given in RAW_COLUMNS order."""
+    avg_bill=bill_features(values[11:17])
+    avg_pay,pay_std=pay_features(values[17:23])
+    avg_delay,max_delay,late,severe=delay_features(values[5:11])
+    utility,pay_to_bill=ratio_features(values[0],avg_bill,avg_pay)
+    return (avg_bill,utility,avg_pay,avg_delay,pay_to_bill,max_delay,late,pay_std,severe)
+
+
+def engineer_block(block,dtype="float64",chunk_rows=FEATURE_CHUNK_ROWS):
+    """Vectorized engineer_row: (n, 23) raw block -> (n, 9) engineered block (a column-major view)."""
+    return _engineer_columns(block.T,dtype,chunk_rows).T
+
+
+def feature_slots(feature_names):
+    """
+    Where each model feature comes from, read off its name:
+    (raw_slots, eng_slots, onehot_slots) with [(RAW_COLUMNS index, feature
+    index)], [(ENGINEERED_COLUMNS index, feature index)] and
+    {(RAW_COLUMNS index, category value): feature index} for "<column>_<value>"
+    one-hot names. Raises ValueError for names none of these can build.
+    """
+    raw={c:j for j,c in enumerate(RAW_COLUMNS)}
+    eng={c:j for j,c in enumerate(ENGINEERED_COLUMNS)}
+    raw_slots,eng_slots,onehot_slots,unknown=[],[],{},[]
+    for i,name in enumerate(feature_names):
+        col,_,value=name.rpartition("_")
+        if name in raw:
+            raw_slots.append((raw[name],i))
+        elif name in eng:
+            eng_slots.append((eng[name],i))
+        elif col in CATEGORICAL_COLUMNS and value.lstrip("-").isdigit():
+            onehot_slots[(raw[col],int(value))]=i
+        else:
+            unknown.append(name)
+    if unknown:
+        raise ValueError(f"cannot build features: {sorted(unknown)}")
+    return raw_slots,eng_slots,onehot_slots
+
+
+def onehot_columns(onehot_slots) -> tuple:
+    """RAW_COLUMNS indices that have at least one one-hot slot, in order."""
+    return tuple(sorted({j for j,_ in onehot_slots}))
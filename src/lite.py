@@ -0,0 +1,100 @@
+"""
+Pickle-free scorer for the linear model, used for fast dashboard starts.
+
+    scorer = load_lite_scorer("models/model.crb")    # None if missing or stale
+
+LiteScorer reads the coefficients, intercept, scaler mean/scale and
+feature order from the src.bundle file written by train/search (or by
+python -m src.bundle). It needs neither joblib nor scikit-learn and
+scores a row with the same folded-weights arithmetic as
+src.fastpath.CompiledScorer, in plain Python floats. load_lite_scorer
+returns None when the bundle is missing, corrupt or no longer matches
+its source pickles, so callers can fall back to the pickles.
+"""
+import math
+import os
+import sys
+
+sys.path.append(os.getcwd())
+
+from src.bundle import BUNDLE_PATH, content_hash, read_bundle
+from src.features import RAW_COLUMNS, CATEGORICAL_COLUMNS, engineer_row, feature_slots, onehot_columns
+
+
+class LiteScorer:
+    def __init__(self,meta:dict,data):
+        """Build from read_bundle's (meta, data); data is coef[n]|mean[n]|scale[n]|intercept."""
+        self.feature_names=names=list(meta["feature_names"])
+        n=len(names)
+        values=[float(v) for v in data]
+        coef,mean,scale,intercept=values[:n],values[n:2*n],values[2*n:3*n],values[3*n]
+        # Fold the scaler into the weights, as CompiledScorer does
+        self.weights=[c/s for c,s in zip(coef,scale)]
+        self.offsets=[w*m for w,m in zip(self.weights,mean)]
+        self.bias=intercept-sum(self.offsets)
+        self.expected_value=intercept
+
+        self.raw_slots,self.eng_slots,self.onehot_slots=feature_slots(names)
+        self.onehot_columns=onehot_columns(self.onehot_slots)
+        # One-hot columns are explained under their source column
+        self._group=[]
+        self.names=[]
+        for name in names:
+            col=name.rpartition("_")[0]
+            owner=col if col in CATEGORICAL_COLUMNS else name
+            if owner not in self.names:
+                self.names.append(owner)
+            self._group.append(self.names.index(owner))
+
+    @classmethod
+    def load(cls,path=BUNDLE_PATH):
+        return cls(*read_bundle(path))
+
+    def features(self,values) -> list:
+        x=[0.0]*len(self.feature_names)
+        for j,i in self.raw_slots:
+            x[i]=float(values[j])
+        eng=engineer_row(values)
+        for j,i in self.eng_slots:
+            x[i]=eng[j]
+        for j in self.onehot_columns:
+            i=self.onehot_slots.get((j,int(values[j])))
+            if i is not None:
+                x[i]=1.0
+        return x
+
+    def logit(self,values) -> float:
+        return self.bias+math.fsum(w*v for w,v in zip(self.weights,self.features(values)))
+
+    def score_values(self,values) -> float:
+        z=self.logit(values)
+        if z>=0:
+            return 1.0/(1.0+math.exp(-z))
+        e=math.exp(z)
+        return e/(1.0+e)
+
+    def score_row(self,row:dict) -> float:
+        return self.score_values([row[c] for c in RAW_COLUMNS])
+
+    def explain_row(self,row,k=3) -> list:
+        """Same output as src.explain.LinearExplainer.explain_row."""
+        values=[row[c] for c in RAW_COLUMNS] if isinstance(row,dict) else row
+        phi=[0.0]*len(self.names)
+        for g,w,o,v in zip(self._group,self.weights,self.offsets,self.features(values)):
+            phi[g]+=w*v-o
+        order=sorted(range(len(phi)),key=lambda i:-abs(phi[i]))[:k]
+        return [(self.names[i],phi[i]) for i in order]
+
+
+def load_lite_scorer(path=BUNDLE_PATH,sources=()):
+    """LiteScorer for the bundle at `path`, or None if it is missing, unreadable or built from different `sources`."""
+    try:
+        meta,data=read_bundle(path)
+    except (FileNotFoundError,ValueError):
+        return None
+    for p in sources:
+        if not os.path.exists(p):
+            continue
+        if meta.get("sources",{}).get(os.path.basename(p))!=content_hash(p):
+            return None
+    return LiteScorer(meta,data)
@@ -0,0 +1,161 @@
+"""
+Hot-path latency metrics.
+
+    from src.metrics import METRICS
+
+    with METRICS.span("preprocess.scale"):
+        ...
+    METRICS.incr("rows_scored",len(block))
+
+Spans feed fixed-bucket histograms (log-spaced from 1 us to ~100 s, so
+memory is constant) from which p50/p95/p99 are read. Counters are plain
+integers. render() gives a Prometheus-style text page, served by the HTTP
+service on GET /metrics. log_line() writes the same numbers as one JSON
+log record.
+
+Collection is off unless CREDIT_RISK_METRICS=1 is set or enable() is
+called. While off, span() returns a shared no-op context manager and
+incr() returns immediately, so instrumented code pays one attribute check.
+"""
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+
+logger=logging.getLogger("credit_risk.metrics")
+
+# 8 buckets per decade from 1 us to 100 s; the last bucket is open-ended
+BUCKETS=tuple(10**(e/8)*1e-6 for e in range(8*8+1))
+QUANTILES=(0.5,0.95,0.99)
+
+
+class Histogram:
+    __slots__=("counts","count","total","max")
+
+    def __init__(self):
+        self.counts=[0]*(len(BUCKETS)+1)
+        self.count=0
+        self.total=0.0
+        self.max=0.0
+
+    def observe(self,seconds:float):
+        self.counts[bisect.bisect_left(BUCKETS,seconds)]+=1
+        self.count+=1
+        self.total+=seconds
+        if seconds>self.max:
+            self.max=seconds
+
+    def quantile(self,q:float) -> float:
+        """Upper bound of the bucket holding the q-th observation (within ~33% of the true value)."""
+        if not self.count:
+            return 0.0
+        rank=q*self.count
+        seen=0
+        for i,c in enumerate(self.counts):
+            seen+=c
+            if seen>=rank and c:
+                return min(BUCKETS[i],self.max) if i<len(BUCKETS) else self.max
+        return self.max
+
+
+class _Span:
+    __slots__=("metrics","name","start")
+
+    def __init__(self,metrics,name):
+        self.metrics=metrics
+        self.name=name
+
+    def __enter__(self):
+        self.start=time.perf_counter()
+        return self
+
+    def __exit__(self,*exc):
+        self.metrics.observe(self.name,time.perf_counter()-self.start)
+
+
+class _NoopSpan:
+    __slots__=()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,*exc):
+        pass
+
+
+_NOOP=_NoopSpan()
+
+
+class Metrics:
+    def __init__(self,enabled=False):
+        self.enabled=enabled
+        self.histograms={}
+        self.counters={}
+        self._lock=threading.Lock()
+
+    def enable(self,enabled=True):
+        self.enabled=enabled
+
+    def span(self,name):
+        if not self.enabled:
+            return _NOOP
+        return _Span(self,name)
+
+    def observe(self,name,seconds):
+        with self._lock:
+            h=self.histograms.get(name)
+            if h is None:
+                h=self.histograms[name]=Histogram()
+            h.observe(seconds)
+
+    def incr(self,name,n=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name]=self.counters.get(name,0)+n
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+    def snapshot(self) -> dict:
+        """{"spans": {name: {count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}}, "counters": {...}}."""
+        with self._lock:
+            spans={}
+            for name,h in sorted(self.histograms.items()):
+                s={"count":h.count,"mean_ms":h.total/h.count*1e3 if h.count else 0.0}
+                for q in QUANTILES:
+                    s[f"p{round(q*100)}_ms"]=h.quantile(q)*1e3
+                s["max_ms"]=h.max*1e3
+                spans[name]=s
+            return {"spans":spans,"counters":dict(sorted(self.counters.items()))}
+
+    def render(self) -> str:
+        """Prometheus text exposition of every span histogram and counter."""
+        snap=self.snapshot()
+        lines=[
+            "# HELP credit_risk_stage_seconds Latency of scoring stages.",
+            "# TYPE credit_risk_stage_seconds summary",
+        ]
+        for name,s in snap["spans"].items():
+            for q in QUANTILES:
+                lines.append(f'credit_risk_stage_seconds{{stage="{name}",quantile="{q}"}} {s[f"p{round(q*100)}_ms"]/1e3:.9g}')
+            lines.append(f'credit_risk_stage_seconds_sum{{stage="{name}"}} {s["mean_ms"]*s["count"]/1e3:.9g}')
+            lines.append(f'credit_risk_stage_seconds_count{{stage="{name}"}} {s["count"]}')
+        if snap["counters"]:
+            lines.append("# TYPE credit_risk_events_total counter")
+        for name,v in snap["counters"].items():
+            lines.append(f'credit_risk_events_total{{event="{name}"}} {v}')
+        return "\n".join(lines)+"\n"
+
+    def log_line(self,**extra):
+        """Emit the current snapshot as one JSON record on the credit_risk.metrics logger."""
+        record={"event":"metrics",**extra,**self.snapshot()}
+        logger.info(json.dumps(record,separators=(",",":")))
+        return record
+
+
+METRICS=Metrics(enabled=os.environ.get("CREDIT_RISK_METRICS","")=="1")
@@ -0,0 +1,151 @@
+"""
+Multi-process bulk scoring on top of src.predict.
+
+    with ParallelScorer(n_workers=8) as engine:
+        probs = engine.score(df)
+
+Input is cut into shards that are scored in a process pool. Each worker
+loads the model and preprocessor once in its initializer and pins BLAS to one thread so
+the workers do not oversubscribe the cores. Results come back in input
+order. n_workers=1 scores in the calling process (no pool), which is the
+deterministic fallback. Input is checked with src.validate once, up front;
+rejected rows come back as NaN and never reach a worker.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.getcwd())
+
+from src.predict import load_model, predict_batch, DEFAULT_CHUNK_SIZE
+from src.preprocess import load_preprocessor, raw_block, PREPROCESSOR_PATH, SCALER_PATH
+from src.validate import validate
+
+MODEL_PATH="models/best_model.pkl"
+MAX_SHARD_SIZE=250_000
+MIN_SHARD_SIZE=2_048
+
+# Per-process artifacts, filled by _init_worker
+_MODEL=None
+_PREPROCESSOR=None
+_CHUNK_SIZE=DEFAULT_CHUNK_SIZE
+
+
+def _init_worker(model_path,preprocessor_path,scaler_path,chunk_size):
+    global _MODEL,_PREPROCESSOR,_CHUNK_SIZE
+    from threadpoolctl import threadpool_limits
+    threadpool_limits(1)
+    _MODEL=load_model(model_path)
+    _PREPROCESSOR=load_preprocessor(preprocessor_path,scaler_path)
+    _CHUNK_SIZE=chunk_size
+
+
+def _score_shard(block:np.ndarray) -> np.ndarray:
+    # Shards hold only rows that already passed validation in ParallelScorer.score
+    return predict_batch(_MODEL,_PREPROCESSOR,block,chunk_size=_CHUNK_SIZE,check=False)
+
+
+class ParallelScorer:
+    def __init__(self,n_workers=None,shard_size=None,chunk_size=DEFAULT_CHUNK_SIZE,
+                 model_path=MODEL_PATH,preprocessor_path=PREPROCESSOR_PATH,scaler_path=SCALER_PATH):
+        if shard_size is not None and shard_size<1:
+            raise ValueError("shard_size must be a positive integer")
+        self.n_workers=(os.cpu_count() or 1) if n_workers is None else max(1,int(n_workers))
+        self.shard_size=shard_size
+        self.chunk_size=chunk_size
+        self.model_path=model_path
+        self.preprocessor_path=preprocessor_path
+        self.scaler_path=scaler_path
+        self._pool=None
+        self._local=None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,*exc):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool=None
+
+    def _executor(self):
+        if self._pool is None:
+            self._pool=ProcessPoolExecutor(
+                max_workers=self.n_workers,
+                initializer=_init_worker,
+                initargs=(self.model_path,self.preprocessor_path,self.scaler_path,self.chunk_size),
+            )
+        return self._pool
+
+    def _shard_size(self,n):
+        if self.shard_size is not None:
+            return self.shard_size
+        # ~4 shards per worker keeps the pool busy without tiny tasks
+        per_task=-(-n//(4*self.n_workers))
+        return min(MAX_SHARD_SIZE,max(MIN_SHARD_SIZE,per_task))
+
+    def score(self,rows) -> np.ndarray:
+        """
+        Probabilities for a DataFrame or RAW_COLUMNS-ordered array, in input
+        order; NaN for rows that fail src.validate, which are never shipped.
+        """
+        # Ship only the 23 raw columns of valid rows to workers, as one contiguous array
+        checked=validate(rows)
+        block=checked.block if checked.ok.all() else checked.block[checked.ok]
+        probs=np.full(len(checked.ok),np.nan)
+        probs[checked.ok]=self._score_valid(block)
+        return probs
+
+    def _score_valid(self,block):
+        n=len(block)
+        shard=self._shard_size(n)
+        if self.n_workers==1 or n<=shard:
+            if self._local is None:
+                self._local=(load_model(self.model_path),load_preprocessor(self.preprocessor_path,self.scaler_path))
+            return predict_batch(*self._local,block,chunk_size=self.chunk_size,check=False)
+
+        shards=[block[i:i+shard] for i in range(0,n,shard)]
+        # Executor.map yields in submission order, so concatenation keeps row order
+        return np.concatenate(list(self._executor().map(_score_shard,shards)))
+
+
+def score_parallel(rows,n_workers=None,shard_size=None,**kwargs) -> np.ndarray:
+    with ParallelScorer(n_workers,shard_size,**kwargs) as engine:
+        return engine.score(rows)
+
+
+def main(argv=None):
+    parser=argparse.ArgumentParser(description="Measure parallel scoring throughput.")
+    parser.add_argument("--data",default="data/credit_card_default_dataset.csv")
+    parser.add_argument("--rows",type=int,default=0,help="tile the dataset up to this many rows (0 = as is)")
+    parser.add_argument("--workers",type=int,nargs="+",default=[1,2,4,os.cpu_count() or 1])
+    parser.add_argument("--shard-size",type=int,default=None)
+    args=parser.parse_args(argv)
+
+    block=raw_block(pd.read_csv(args.data,header=1))
+    if args.rows>len(block):
+        block=np.resize(block,(args.rows,block.shape[1]))
+    print(f"Rows: {len(block):,}")
+
+    reference=None
+    for w in args.workers:
+        with ParallelScorer(w,args.shard_size) as engine:
+            engine.score(block)  # warm-up: start workers, load artifacts
+            start=time.perf_counter()
+            probs=engine.score(block)
+            elapsed=time.perf_counter()-start
+        if reference is None:
+            reference=probs
+        diff=np.abs(probs-reference).max()
+        print(f"workers={w:<3} {elapsed:7.2f}s  {len(block)/elapsed:12,.0f} rows/s  max diff vs first run: {diff:.1e}")
+
+
+if __name__=="__main__":
+    main()
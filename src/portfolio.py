@@ -0,0 +1,133 @@
+"""
+Portfolio scoring behind the dashboard's Portfolio tab.
+
+    df = read_portfolio(data)                        # uploaded CSV bytes
+    for chunk in iter_portfolio(path): ...           # the same for a file on disk, in chunks
+    accepted, rejects = split_rejects(df)            # src.validate schema checks
+    scored = score_portfolio(accepted, score_fn, on_progress=cb)
+    summary = summarize(scored)
+    top_accounts(scored, n=20, tiers=["HIGH RISK"])
+
+score_fn is any (n, 23) raw block -> probabilities callable, e.g.
+src.fastpath.make_score_fn(model, preprocessor). Rows are scored
+`chunk_size` at a time and on_progress(done, total) is called after each
+chunk so the UI can draw a progress bar. The scored frame is small (ID,
+probability, tier and a few raw columns), so filter and sort interactions
+only touch it and never rescore. split_rejects sets aside the rows that
+fail src.validate, with their ID and reasons, so they never reach score_fn.
+"""
+import hashlib
+import io
+
+import numpy as np
+import pandas as pd
+
+from src.features import RAW_COLUMNS
+from src.predict import LOW_RISK_MAX, MEDIUM_RISK_MAX, RISK_TIERS
+from src.preprocess import raw_block
+from src.validate import validate
+
+PORTFOLIO_CHUNK_SIZE=10_000
+HISTOGRAM_BINS=20
+# Raw columns carried into the scored frame for the accounts table
+DISPLAY_COLUMNS=["LIMIT_BAL","AGE","PAY_0","BILL_AMT1","PAY_AMT1"]
+
+
+def file_digest(data:bytes) -> str:
+    return hashlib.blake2b(data,digest_size=16).hexdigest()
+
+
+def _header_row(first_line:bytes) -> int:
+    # The dataset layout has an X1..Y line above the real header
+    return 0 if b"LIMIT_BAL" in first_line else 1
+
+
+def _portfolio_frame(df,offset=0) -> pd.DataFrame:
+    missing=[c for c in RAW_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"missing columns: {', '.join(missing)}")
+    if "ID" not in df.columns:
+        df.insert(0,"ID",np.arange(offset+1,offset+len(df)+1))
+    return df
+
+
+def read_portfolio(data:bytes) -> pd.DataFrame:
+    """
+    Parse an uploaded CSV. Accepts the dataset layout (an X1..Y line above
+    the header) or a plain header row; ID is generated when absent.
+    """
+    header=_header_row(data.split(b"\n",1)[0])
+    return _portfolio_frame(pd.read_csv(io.BytesIO(data),header=header))
+
+
+def iter_portfolio(path,chunk_size=PORTFOLIO_CHUNK_SIZE):
+    """read_portfolio for a CSV file on disk, yielded `chunk_size` rows at a time."""
+    with open(path,"rb") as f:
+        header=_header_row(f.readline())
+    offset=0
+    for chunk in pd.read_csv(path,header=header,chunksize=chunk_size):
+        yield _portfolio_frame(chunk,offset)
+        offset+=len(chunk)
+
+
+def split_rejects(df,strict=False):
+    """(rows that pass src.validate, frame of ID and reasons for those that do not)."""
+    checked=validate(df,strict)
+    accepted=df if checked.ok.all() else df[checked.ok]
+    return accepted,checked.rejects(df["ID"].to_numpy())
+
+
+def tier_index(probs:np.ndarray) -> np.ndarray:
+    """0/1/2 for LOW/MEDIUM/HIGH, same thresholds as src.predict.risk_tiers."""
+    return np.searchsorted([LOW_RISK_MAX,MEDIUM_RISK_MAX],probs,side="right")
+
+
+def score_portfolio(df,score_fn,chunk_size=PORTFOLIO_CHUNK_SIZE,on_progress=None) -> pd.DataFrame:
+    block=raw_block(df)
+    n=len(block)
+    probs=np.empty(n)
+    for start in range(0,n,chunk_size):
+        stop=min(start+chunk_size,n)
+        probs[start:stop]=score_fn(block[start:stop])
+        if on_progress is not None:
+            on_progress(stop,n)
+    tiers=tier_index(probs)
+    scored=pd.DataFrame({
+        "ID":df["ID"].to_numpy(),
+        "probability":probs,
+        "risk_tier":pd.Categorical.from_codes(tiers,categories=list(RISK_TIERS)),
+    })
+    for c in DISPLAY_COLUMNS:
+        scored[c]=df[c].to_numpy()
+    return scored
+
+
+def summarize(scored:pd.DataFrame,bins=HISTOGRAM_BINS) -> dict:
+    """Tier counts, expected defaults (sum of probabilities) and a probability histogram."""
+    probs=scored["probability"].to_numpy()
+    tiers=scored["risk_tier"].cat.codes.to_numpy()
+    balance=scored["BILL_AMT1"].to_numpy(dtype=np.float64)
+    counts=np.bincount(tiers,minlength=len(RISK_TIERS))
+    expected=np.bincount(tiers,weights=probs,minlength=len(RISK_TIERS))
+    hist,edges=np.histogram(probs,bins=bins,range=(0.0,1.0))
+    return {
+        "accounts":len(probs),
+        "expected_defaults":float(probs.sum()),
+        "mean_probability":float(probs.mean()) if len(probs) else 0.0,
+        # Latest statement balance weighted by default probability
+        "expected_default_balance":float(probs@np.clip(balance,0,None)),
+        "tiers":{
+            t:{"accounts":int(c),"share":float(c/max(len(probs),1)),"expected_defaults":float(e)}
+            for t,c,e in zip(RISK_TIERS,counts,expected)
+        },
+        "histogram":{"edges":edges.tolist(),"counts":hist.tolist()},
+    }
+
+
+def top_accounts(scored:pd.DataFrame,n=20,tiers=None,min_probability=0.0,sort_by="probability") -> pd.DataFrame:
+    """The `n` riskiest accounts (or top by `sort_by`) after tier / probability filters."""
+    mask=scored["probability"].to_numpy()>=min_probability
+    if tiers is not None:
+        mask&=scored["risk_tier"].isin(list(tiers)).to_numpy()
+    view=scored[mask]
+    return view.nlargest(n,sort_by) if len(view)>n else view.sort_values(sort_by,ascending=False)
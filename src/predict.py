@@ -2,10 +2,85 @@ import joblib
 import pandas as pd
 import numpy as np
 
+from src.metrics import METRICS
+from src.preprocess import as_preprocessor
+from src.tiers import LOW_RISK_MAX, MEDIUM_RISK_MAX, RISK_TIERS, REJECTED_TIER
+from src.validate import validate
+
+DEFAULT_CHUNK_SIZE=100_000
+
 
 def load_model(path="models/best_model.pkl"):
+    """A joblib pickle, or the memory-mapped classifier of a src.bundle file (checksummed)."""
+    from src.bundle import is_bundle, load_bundle_model
+    if is_bundle(path):
+        return load_bundle_model(path)
     return joblib.load(path)
 
 def predict(model,features:np.ndarray):
     prob=model.predict_proba(features)[0][1]
-    return prob
\ No newline at end of file
+    return prob
+
+
+def risk_tier(prob:float) -> str:
+    if prob!=prob:
+        return REJECTED_TIER
+    if prob<LOW_RISK_MAX:
+        return RISK_TIERS[0]
+    if prob<MEDIUM_RISK_MAX:
+        return RISK_TIERS[1]
+    return RISK_TIERS[2]
+
+
+def risk_tiers(probs:np.ndarray) -> np.ndarray:
+    probs=np.asarray(probs)
+    idx=np.searchsorted([LOW_RISK_MAX,MEDIUM_RISK_MAX],probs,side="right")
+    tiers=np.asarray(RISK_TIERS,dtype=object)[idx]
+    tiers[np.isnan(probs)]=REJECTED_TIER
+    return tiers
+
+
+def score_frame(model,preprocessor,df,check=True) -> np.ndarray:
+    """
+    Default probability for every raw applicant row in `df`, in one pass.
+    Rows that fail src.validate get NaN instead of reaching the model;
+    check=False skips the validation for rows already checked.
+    """
+    if check:
+        checked=validate(df)
+        if not checked.ok.all():
+            METRICS.incr("rows_rejected",checked.rejected)
+            probs=np.full(len(checked.ok),np.nan)
+            if checked.ok.any():
+                probs[checked.ok]=score_frame(model,preprocessor,checked.block[checked.ok],check=False)
+            return probs
+        df=checked.block
+    with METRICS.span("score_frame"):
+        X=as_preprocessor(preprocessor).transform(df)
+        with METRICS.span("predict_proba"):
+            probs=model.predict_proba(X)[:,1]
+    METRICS.incr("rows_scored",len(probs))
+    return probs
+
+
+def predict_batch(model,preprocessor,rows,chunk_size:int=DEFAULT_CHUNK_SIZE,check=True) -> np.ndarray:
+    """
+    Score a DataFrame or ndarray of raw applicant rows.
+
+    Arrays must follow RAW_COLUMNS order. Rows are processed `chunk_size`
+    at a time so the engineered/one-hot temporaries stay bounded.
+    `preprocessor` is a CreditPreprocessor or a bare fitted StandardScaler.
+    Rows that fail src.validate come back as NaN (see score_frame).
+    """
+    if chunk_size<1:
+        raise ValueError("chunk_size must be a positive integer")
+    pre=as_preprocessor(preprocessor)
+    if not isinstance(rows,pd.DataFrame):
+        rows=np.asarray(rows)
+    rows_at=rows.iloc if isinstance(rows,pd.DataFrame) else rows
+
+    probs=np.empty(len(rows),dtype=np.float64)
+    for start in range(0,len(rows),chunk_size):
+        chunk=rows_at[start:start+chunk_size]
+        probs[start:start+len(chunk)]=score_frame(model,pre,chunk,check)
+    return probs
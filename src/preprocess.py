@@ -1,19 +1,177 @@
+import argparse
+import os
+import sys
+
+import joblib
 import pandas as pd
 import numpy as np
+from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 
-def preprocess(df,scaler_path="../models/scaler.pkl"):
-    # One-hot encoding
-    df=df.get_dummies(df,columns=["SEX","EDUCATION","MARRIAGE"],drop_first=True)
+sys.path.append(os.getcwd())
+
+from src.features import RAW_COLUMNS, CATEGORICAL_COLUMNS, ENGINEERED_COLUMNS, engineer_block, feature_slots
+from src.metrics import METRICS
+
+PREPROCESSOR_PATH="models/preprocessor.pkl"
+SCALER_PATH="models/scaler.pkl"
+NUMERIC_COLUMNS=[c for c in RAW_COLUMNS if c not in CATEGORICAL_COLUMNS]
+
+
+def raw_block(X) -> np.ndarray:
+    """(n, 23) float64 block in RAW_COLUMNS order from a DataFrame, dict, or array."""
+    if isinstance(X,pd.DataFrame):
+        return X[RAW_COLUMNS].to_numpy(dtype=np.float64)
+    if isinstance(X,dict):
+        return np.array([[X[c] for c in RAW_COLUMNS]],dtype=np.float64)
+    block=np.asarray(X,dtype=np.float64)
+    return block.reshape(1,-1) if block.ndim==1 else block
+
+
+class CreditPreprocessor(BaseEstimator,TransformerMixin):
+    """
+    add_feature + one-hot encoding + StandardScaler as one fitted artifact.
+
+    Categories are a fixed vocabulary learned at fit time (the first one is
+    dropped when drop_first, as in notebook 02); values outside it encode as
+    all zeros. transform accepts a raw DataFrame, a RAW_COLUMNS-ordered array
+    or a single row dict and always returns the model's feature order, so
+    there is no per-call column alignment.
+    """
+
+    def __init__(self,categories=None,drop_first=True):
+        self.categories=categories
+        self.drop_first=drop_first
+
+    def _set_vocabulary(self,block=None):
+        cats={}
+        for c in CATEGORICAL_COLUMNS:
+            if self.categories is not None:
+                values=sorted(int(v) for v in self.categories[c])
+            else:
+                values=np.unique(block[:,RAW_COLUMNS.index(c)]).astype(int).tolist()
+            cats[c]=values[1:] if self.drop_first else values
+        self.categories_=cats
+        self.feature_names_=(
+            NUMERIC_COLUMNS
+            +[f"{c}_{v}" for c in CATEGORICAL_COLUMNS for v in cats[c]]
+            +ENGINEERED_COLUMNS
+        )
+        self._build_slots()
+
+    def fit(self,X,y=None):
+        block=raw_block(X)
+        self._set_vocabulary(block)
+        self.scaler_=StandardScaler().fit(pd.DataFrame(self.encode(block),columns=self.feature_names_))
+        return self
+
+    def partial_fit(self,X,y=None):
+        """Streaming fit over chunks; needs `categories` so the feature layout is known up front."""
+        if not hasattr(self,"scaler_"):
+            if self.categories is None:
+                raise ValueError("partial_fit needs a fixed `categories` vocabulary")
+            self._set_vocabulary()
+            self.scaler_=StandardScaler()
+        self.scaler_.partial_fit(pd.DataFrame(self.encode(X),columns=self.feature_names_))
+        return self
+
+    @classmethod
+    def from_scaler(cls,scaler):
+        """Wrap a StandardScaler fitted on the notebook-02 feature frame (e.g. models/scaler.pkl)."""
+        pre=cls()
+        pre.feature_names_=list(scaler.feature_names_in_)
+        pre._build_slots()
+        pre.categories_={c:[v for j,v in pre.onehot_slots_ if RAW_COLUMNS[j]==c] for c in CATEGORICAL_COLUMNS}
+        pre.scaler_=scaler
+        return pre
+
+    def _build_slots(self):
+        self.raw_slots_,self.eng_slots_,self.onehot_slots_=feature_slots(self.feature_names_)
+
+    @property
+    def mean_(self):
+        m=self.scaler_.mean_
+        return np.zeros(len(self.feature_names_)) if m is None else m
 
+    @property
+    def scale_(self):
+        s=self.scaler_.scale_
+        return np.ones(len(self.feature_names_)) if s is None else s
+
+    def get_feature_names_out(self,input_features=None):
+        return np.asarray(self.feature_names_,dtype=object)
+
+    def encode(self,X) -> np.ndarray:
+        """Unscaled model feature matrix."""
+        block=raw_block(X)
+        with METRICS.span("preprocess.features"):
+            eng=engineer_block(block)
+        with METRICS.span("preprocess.encode"):
+            out=np.zeros((len(block),len(self.feature_names_)))
+            for j,i in self.raw_slots_:
+                out[:,i]=block[:,j]
+            for j,i in self.eng_slots_:
+                out[:,i]=eng[:,j]
+            for (j,value),i in self.onehot_slots_.items():
+                out[:,i]=block[:,j]==value
+        return out
+
+    def scale(self,out) -> np.ndarray:
+        """Standardize an encode() matrix in place and return it."""
+        # Same arithmetic as StandardScaler.transform, without its name checks
+        with METRICS.span("preprocess.scale"):
+            out-=self.mean_
+            out/=self.scale_
+        return out
+
+    def transform(self,X) -> np.ndarray:
+        return self.scale(self.encode(X))
+
+
+def as_preprocessor(obj) -> CreditPreprocessor:
+    return obj if isinstance(obj,CreditPreprocessor) else CreditPreprocessor.from_scaler(obj)
+
+
+def load_preprocessor(path=PREPROCESSOR_PATH,scaler_path=SCALER_PATH) -> CreditPreprocessor:
+    """
+    models/preprocessor.pkl (or a src.bundle file), or a wrapper around
+    scaler.pkl if it has not been exported yet.
+    """
+    from src.bundle import is_bundle, load_bundle_preprocessor
+    if is_bundle(path):
+        return load_bundle_preprocessor(path)
+    if os.path.exists(path):
+        return joblib.load(path)
+    return CreditPreprocessor.from_scaler(joblib.load(scaler_path))
+
+
+def preprocess(df,scaler_path="../models/scaler.pkl",preprocessor_path="../models/preprocessor.pkl"):
     X=df.drop("Default",axis=1)
     Y=df['Default']
 
     X_Train,X_Test,Y_Train,Y_Test=train_test_split(X,Y,test_size=0.2,random_state=42,stratify=Y)
 
-    scaler=StandardScaler()
-    X_Train_Scaler=scaler.fit_transform(X_Train)
-    X_Test_Scaler=scaler.transform(X_Test)
-    joblib.dump(scaler, scaler_path)
-    return X_Train_Scaler,X_Test_Scaler,Y_Train,Y_Test
\ No newline at end of file
+    pre=CreditPreprocessor().fit(X_Train)
+    X_Train_Scaler=pre.transform(X_Train)
+    X_Test_Scaler=pre.transform(X_Test)
+    joblib.dump(pre,preprocessor_path)
+    # scaler.pkl is still read by older tooling
+    joblib.dump(pre.scaler_,scaler_path)
+    return X_Train_Scaler,X_Test_Scaler,Y_Train,Y_Test
+
+
+def main(argv=None):
+    parser=argparse.ArgumentParser(description="Export the fitted preprocessing pipeline.")
+    parser.add_argument("--scaler",default=SCALER_PATH,help="existing StandardScaler to wrap")
+    parser.add_argument("--out",default=PREPROCESSOR_PATH)
+    args=parser.parse_args(argv)
+    pre=CreditPreprocessor.from_scaler(joblib.load(args.scaler))
+    joblib.dump(pre,args.out)
+    print(f"Preprocessor with {len(pre.feature_names_)} features saved at: {args.out}")
+
+
+if __name__=="__main__":
+    # Run via the package module so the pickled class path is src.preprocess, not __main__
+    from src.preprocess import main
+    main()
@@ -0,0 +1,287 @@
+"""
+Model registry with hot reload for the service and the dashboard.
+
+    registry = ModelRegistry(holdout=load_holdout)
+    registry.start(interval=5)          # background polling thread
+    v = registry.current                # hold this ModelVersion for the whole request
+    v.version, v.score_fn(block), v.score_row(row), v.explain_row(row, k=3)
+
+The registry watches the model / preprocessor / scaler files. When their
+fingerprint (path, size, mtime) changes, the poller loads the new pair off
+the request path. It validates the pair and then replaces `current` with
+one reference assignment. A request that already took `current` finishes
+on that version, and later requests see the new one. A pair that fails to
+load or validate is logged and reported by status(). It is not retried
+until the files change again, and the old version keeps serving.
+
+Validation scores a holdout sample. Every probability must be finite and
+in [0, 1]. With labels, the ROC-AUC must also be at least `min_auc` and no
+more than `max_auc_drop` below the serving version's AUC. The holdout is
+loaded on the first reload, not at startup.
+
+With pointer_path (e.g. models/CURRENT.json):
+
+    {"version": "2026-10-17", "model": "v7/best_model.pkl", "preprocessor": "v7/preprocessor.pkl"}
+
+the artifact paths are read from the pointer, relative to its directory,
+and "version" names the release. To publish, write a new directory and
+then replace the pointer atomically. Without a pointer, the version is a
+short content hash of the artifact files.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from src.bundle import content_hash
+from src.cache import artifact_fingerprint
+from src.lite import load_lite_scorer
+
+MODEL_PATH="models/best_model.pkl"
+PREPROCESSOR_PATH="models/preprocessor.pkl"
+SCALER_PATH="models/scaler.pkl"
+DATA_PATH="data/credit_card_default_dataset.csv"
+RELOAD_INTERVAL=5.0
+HOLDOUT_ROWS=2000
+MIN_AUC=0.65
+MAX_AUC_DROP=0.02
+
+logger=logging.getLogger("credit_risk.registry")
+
+
+def version_id(paths) -> str:
+    """Short content hash of the artifact files that exist."""
+    h=hashlib.blake2b(digest_size=6)
+    for p in paths:
+        if os.path.exists(p):
+            h.update(content_hash(p).encode())
+    return h.hexdigest()
+
+
+class ModelVersion:
+    """
+    One loaded model / preprocessor pair and the callables built from it.
+    score_fn scores a (n, 23) raw block; score_row and explain_row take one
+    applicant dict (explain_row and linear are None for non-linear models).
+    """
+
+    def __init__(self,version,paths,score_fn,score_row,explain_row=None,linear=None,model=None,preprocessor=None):
+        self.version=version
+        self.paths=tuple(paths)
+        self.score_fn=score_fn
+        self.score_row=score_row
+        self.explain_row=explain_row
+        self.linear=linear
+        # The fitted pair itself; None for versions served from the bundle
+        self.model=model
+        self.preprocessor=preprocessor
+        self.loaded_at=time.time()
+        self.holdout_auc=None
+
+
+def load_version(model_path=MODEL_PATH,preprocessor_path=PREPROCESSOR_PATH,scaler_path=SCALER_PATH,
+                 version=None,lite_path=None) -> ModelVersion:
+    """
+    Load a pair from disk. With lite_path, an up-to-date src.bundle file is
+    read by src.lite for row scoring so no scikit-learn import is needed.
+    Block scoring then loads the pickles on first use.
+    """
+    paths=(model_path,preprocessor_path,scaler_path)
+    version=version or version_id(paths)
+    if lite_path is not None:
+        lite=load_lite_scorer(lite_path,sources=(model_path,preprocessor_path))
+        if lite is not None:
+            state={}
+
+            def score_fn(block):
+                if "fn" not in state:
+                    state["fn"]=load_version(*paths,version=version).score_fn
+                return state["fn"](block)
+            return ModelVersion(version,paths,score_fn,lite.score_row,lite.explain_row,lite)
+
+    from src.predict import load_model
+    from src.preprocess import load_preprocessor
+    return make_version(load_model(model_path),load_preprocessor(preprocessor_path,scaler_path),version,paths)
+
+
+def make_version(model,preprocessor,version="fixed",paths=()) -> ModelVersion:
+    """ModelVersion for an in-memory pair (also used for tests and embedding)."""
+    from src.predict import predict, predict_batch
+    from src.preprocess import as_preprocessor
+    from src.fastpath import compile_scorer
+    from src.explain import make_explainer
+    preprocessor=as_preprocessor(preprocessor)
+    fast=compile_scorer(model,preprocessor)
+    explainer=make_explainer(model,preprocessor)
+    if fast is not None:
+        score_fn,score_row=fast.score_matrix,fast.score_row
+    else:
+        # Generic path for non-linear models
+        score_fn=lambda block: predict_batch(model,preprocessor,block)
+        score_row=lambda row: predict(model,preprocessor.transform(row))
+    return ModelVersion(version,paths,score_fn,score_row,
+                        explainer.explain_row if explainer is not None else None,fast,model,preprocessor)
+
+
+def load_holdout(path=DATA_PATH,n=HOLDOUT_ROWS,seed=0):
+    """
+    (raw block, labels) for up to `n` rows of the 20% test split that
+    src.preprocess holds out from training; None if the dataset is missing.
+    """
+    if not os.path.exists(path):
+        return None
+    import numpy as np
+    from sklearn.model_selection import train_test_split
+    from src.data import TARGET, load_data
+    from src.preprocess import raw_block
+
+    df=load_data(path)
+    _,test=train_test_split(df,test_size=0.2,random_state=42,stratify=df[TARGET])
+    test=test.sample(n=min(n,len(test)),random_state=seed)
+    return raw_block(test),test[TARGET].to_numpy(dtype=np.int8)
+
+
+class ModelRegistry:
+    def __init__(self,model_path=MODEL_PATH,preprocessor_path=PREPROCESSOR_PATH,scaler_path=SCALER_PATH,
+                 pointer_path=None,lite_path=None,holdout=None,min_auc=MIN_AUC,max_auc_drop=MAX_AUC_DROP,
+                 initial=None):
+        """
+        holdout is a (block, labels) pair, a callable returning one (called
+        on the first reload), or None to only check that probabilities are
+        valid. `initial` serves a version that is already loaded. Otherwise
+        the artifacts on disk are loaded now, unvalidated, as the starting
+        version.
+        """
+        self.paths=(model_path,preprocessor_path,scaler_path)
+        self.pointer_path=pointer_path
+        self.lite_path=lite_path
+        self.holdout=holdout
+        self.min_auc=min_auc
+        self.max_auc_drop=max_auc_drop
+        self.swaps=0
+        self.rejected=0
+        self.last_check=None
+        self.last_error=None
+        self._lock=threading.Lock()
+        self._stop=threading.Event()
+        self._thread=None
+        self._rejected_fingerprint=None
+
+        version,paths=self._resolve()
+        self._fingerprint=self._watch_fingerprint(paths)
+        self.current=initial if initial is not None else load_version(*paths,version=version,lite_path=lite_path)
+
+    def _resolve(self):
+        # (release name or None, artifact paths) from the pointer or the fixed paths
+        if self.pointer_path is None:
+            return None,self.paths
+        with open(self.pointer_path) as f:
+            pointer=json.load(f)
+        base=os.path.dirname(os.path.abspath(self.pointer_path))
+        # Keys left out of the pointer fall back to the fixed paths
+        paths=tuple(os.path.join(base,pointer[k]) if pointer.get(k) else default
+                    for k,default in zip(("model","preprocessor","scaler"),self.paths))
+        return str(pointer["version"]),paths
+
+    def _watch_fingerprint(self,paths):
+        watched=paths+((self.pointer_path,) if self.pointer_path else ())
+        if self.lite_path:
+            watched+=(self.lite_path,)
+        return artifact_fingerprint(*watched)
+
+    def _holdout(self):
+        if callable(self.holdout):
+            self.holdout=self.holdout()
+        return self.holdout
+
+    def validate(self,candidate):
+        """Raise ValueError if `candidate` scores the holdout worse than allowed."""
+        import numpy as np
+        from sklearn.metrics import roc_auc_score
+        from src.preprocess import raw_block
+
+        holdout=self._holdout()
+        if holdout is None:
+            # No labelled data: a sanity probe through the whole scoring path
+            block,y=raw_block([[80000,1,2,1,32]+[0]*6+[10000]*6+[5000]*6]),None
+        else:
+            block,y=holdout
+        probs=np.asarray(candidate.score_fn(block),dtype=np.float64)
+        if probs.shape!=(len(block),) or not np.all(np.isfinite(probs)) or probs.min()<0 or probs.max()>1:
+            raise ValueError("holdout probabilities are not finite values in [0, 1]")
+        if y is None:
+            return
+        candidate.holdout_auc=auc=float(roc_auc_score(y,probs))
+        if auc<self.min_auc:
+            raise ValueError(f"holdout ROC-AUC {auc:.4f} is below the minimum {self.min_auc:.4f}")
+        current=self.current
+        if current.holdout_auc is None:
+            current.holdout_auc=float(roc_auc_score(y,np.asarray(current.score_fn(block),dtype=np.float64)))
+        if auc<current.holdout_auc-self.max_auc_drop:
+            raise ValueError(f"holdout ROC-AUC {auc:.4f} is more than {self.max_auc_drop} "
+                             f"below the serving version's {current.holdout_auc:.4f}")
+
+    def check(self) -> bool:
+        """Load, validate and switch to the artifacts on disk if they changed; True if switched."""
+        with self._lock:
+            self.last_check=time.time()
+            try:
+                version,paths=self._resolve()
+            except (OSError,ValueError,KeyError) as e:
+                self.last_error=f"version pointer: {e}"
+                return False
+            fingerprint=self._watch_fingerprint(paths)
+            if fingerprint in (self._fingerprint,self._rejected_fingerprint):
+                return False
+            try:
+                candidate=load_version(*paths,version=version,lite_path=self.lite_path)
+                self.validate(candidate)
+            except Exception as e:
+                # Also covers half-written files; the next write changes the fingerprint
+                self._rejected_fingerprint=fingerprint
+                self.rejected+=1
+                self.last_error=f"{type(e).__name__}: {e}"
+                logger.warning("model reload rejected, still serving %s: %s",self.current.version,self.last_error)
+                return False
+            previous=self.current
+            self.current=candidate
+            self._fingerprint=fingerprint
+            self.swaps+=1
+            self.last_error=None
+            logger.info("model %s -> %s (holdout AUC %s)",previous.version,candidate.version,candidate.holdout_auc)
+            return True
+
+    def _run(self,interval):
+        while not self._stop.wait(interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("model registry check failed")
+
+    def start(self,interval=RELOAD_INTERVAL):
+        """Poll for new artifacts every `interval` seconds in a daemon thread."""
+        if self._thread is None and interval and interval>0:
+            self._stop.clear()
+            self._thread=threading.Thread(target=self._run,args=(interval,),name="model-registry",daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread=None
+
+    def status(self) -> dict:
+        v=self.current
+        return {
+            "version":v.version,
+            "loaded_at":v.loaded_at,
+            "holdout_auc":v.holdout_auc,
+            "swaps":self.swaps,
+            "rejected":self.rejected,
+            "last_check":self.last_check,
+            "last_error":self.last_error,
+        }
@@ -0,0 +1,702 @@
+"""
+HTML and CSS for the dashboard report.
+
+Everything here is plain string building with no Streamlit, pandas or
+NumPy import. app.py reruns top to bottom on every interaction, so the
+static fragments are module constants built once per process and
+re-emitted from memory. The same builders can be used outside Streamlit,
+e.g. to render reports in batch.
+"""
+import html
+import math
+
+from src.tiers import LOW_RISK_MAX, MEDIUM_RISK_MAX
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Static page fragments
+# ─────────────────────────────────────────────────────────────────────────────
+
+DARK_CSS = """
+<style>
+@import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800;900&display=swap');
+
+/* ─── palette ─── */
+:root {
+  --bg-base   : #0D1117;
+  --bg-surface: #161B22;
+  --bg-card   : #1C2333;
+  --bg-input  : #1C2333;
+  --border    : #30363D;
+  --border-hi : #58A6FF;
+  --text-hi   : #E6EDF3;
+  --text-mid  : #8B949E;
+  --text-low  : #484F58;
+  --accent    : #58A6FF;
+  --accent2   : #BC8CFF;
+  --green     : #3FB950;
+  --orange    : #F78166;
+  --yellow    : #E3B341;
+  --radius-lg : 16px;
+  --radius-md : 12px;
+  --radius-sm : 8px;
+  --shadow    : 0 4px 24px rgba(0,0,0,0.5);
+}
+
+/* ─── base ─── */
+html, body, [class*="css"] {
+  font-family: 'Inter', system-ui, sans-serif !important;
+  background-color: var(--bg-base) !important;
+  color: var(--text-hi) !important;
+}
+.block-container {
+  padding: 20px 28px 32px !important;
+  max-width: 1440px !important;
+  background: var(--bg-base) !important;
+}
+
+/* ─── inputs ─── */
+input, textarea {
+  background: var(--bg-input) !important;
+  border: 1px solid var(--border) !important;
+  border-radius: var(--radius-sm) !important;
+  color: var(--text-hi) !important;
+  font-size: 14px !important;
+}
+input:focus, textarea:focus {
+  border-color: var(--accent) !important;
+  box-shadow: 0 0 0 3px rgba(88,166,255,0.15) !important;
+}
+/* number inputs */
+[data-testid="stNumberInput"] input {
+  background: var(--bg-input) !important;
+  border: 1px solid var(--border) !important;
+  color: var(--text-hi) !important;
+  border-radius: var(--radius-sm) !important;
+}
+/* text input */
+[data-testid="stTextInput"] input {
+  background: var(--bg-input) !important;
+  border: 1px solid var(--border) !important;
+  color: var(--text-hi) !important;
+}
+/* selectbox */
+[data-baseweb="select"] > div {
+  background: var(--bg-input) !important;
+  border: 1px solid var(--border) !important;
+  border-radius: var(--radius-sm) !important;
+  color: var(--text-hi) !important;
+}
+[data-baseweb="popover"] [role="option"] {
+  background: var(--bg-card) !important;
+  color: var(--text-hi) !important;
+}
+[data-baseweb="popover"] [role="option"]:hover,
+[data-baseweb="popover"] [aria-selected="true"] {
+  background: rgba(88,166,255,0.15) !important;
+  color: var(--accent) !important;
+}
+/* slider */
+[data-testid="stSlider"] [role="slider"] { background: var(--accent) !important; }
+.stSlider > div > div { background: var(--border) !important; }
+.stSlider > div > div > div { background: var(--accent) !important; }
+
+/* ─── labels & captions ─── */
+label, .stMarkdown p, .stCaption {
+  color: var(--text-mid) !important;
+  font-size: 13px !important;
+  font-weight: 500 !important;
+}
+
+/* ─── button ─── */
+div.stButton > button {
+  background: linear-gradient(135deg, #58A6FF, #BC8CFF) !important;
+  color: #0D1117 !important;
+  font-weight: 700 !important;
+  border: none !important;
+  border-radius: var(--radius-md) !important;
+  padding: 14px 32px !important;
+  font-size: 14px !important;
+  letter-spacing: 0.6px !important;
+  text-transform: uppercase !important;
+  box-shadow: 0 4px 20px rgba(88,166,255,0.35) !important;
+  width: 100% !important;
+  transition: all 0.25s !important;
+}
+div.stButton > button:hover {
+  background: linear-gradient(135deg, #79BBFF, #D2AAFF) !important;
+  box-shadow: 0 8px 28px rgba(88,166,255,0.5) !important;
+  transform: translateY(-2px) !important;
+}
+
+/* ─── tabs ─── */
+.stTabs [data-baseweb="tab-list"] {
+  background: transparent !important;
+  border-bottom: 1px solid var(--border) !important;
+  gap: 0 !important;
+}
+.stTabs [data-baseweb="tab"] {
+  background: transparent !important;
+  border: none !important;
+  color: var(--text-mid) !important;
+  font-weight: 600 !important;
+  font-size: 13px !important;
+  padding: 10px 20px !important;
+  border-radius: var(--radius-sm) var(--radius-sm) 0 0 !important;
+}
+.stTabs [aria-selected="true"] {
+  background: rgba(88,166,255,0.1) !important;
+  color: var(--accent) !important;
+  border-bottom: 2px solid var(--accent) !important;
+}
+
+/* ─── spinner ─── */
+.stSpinner > div { border-top-color: var(--accent) !important; }
+
+/* ─── scrollbar ─── */
+::-webkit-scrollbar { width: 6px; }
+::-webkit-scrollbar-track { background: var(--bg-base); }
+::-webkit-scrollbar-thumb { background: var(--border); border-radius: 3px; }
+
+/* ─── hide Streamlit chrome ─── */
+#MainMenu, footer, header { display: none !important; }
+</style>
+"""
+
+HEADER_HTML = """
+<div style="background:#161B22;border-radius:14px;padding:16px 24px;margin-bottom:20px;
+            display:flex;align-items:center;justify-content:space-between;
+            border:1px solid #30363D;box-shadow:0 4px 24px rgba(0,0,0,0.5);">
+  <div style="display:flex;align-items:center;gap:14px;">
+    <div style="width:44px;height:44px;border-radius:12px;
+                background:linear-gradient(135deg,#58A6FF,#BC8CFF);
+                display:flex;align-items:center;justify-content:center;
+                font-size:18px;font-weight:800;color:#0D1117;
+                box-shadow:0 4px 16px rgba(88,166,255,0.35);">CR</div>
+    <div>
+      <div style="font-size:20px;font-weight:800;color:#E6EDF3;">
+        Credit<span style="color:#58A6FF;">Risk</span> Dashboard
+      </div>
+      <div style="font-size:11px;color:#8B949E;">AI-Powered Risk Intelligence Platform</div>
+    </div>
+  </div>
+  <div style="display:flex;align-items:center;gap:12px;">
+    <div style="display:flex;align-items:center;gap:7px;padding:7px 14px;
+                background:rgba(63,185,80,0.1);border:1px solid rgba(63,185,80,0.3);
+                border-radius:50px;">
+      <div style="width:7px;height:7px;border-radius:50%;background:#3FB950;"></div>
+      <span style="font-size:11px;font-weight:600;color:#3FB950;">System Online</span>
+    </div>
+    <div style="font-size:10px;font-weight:600;color:#8B949E;padding:5px 12px;
+                background:#0D1117;border:1px solid #30363D;border-radius:6px;">v5.0</div>
+  </div>
+</div>
+"""
+
+ASSESSMENT_TITLE_HTML = """
+<div style="display:flex;align-items:center;gap:12px;margin-bottom:18px;
+            padding-bottom:14px;border-bottom:1px solid #30363D;">
+  <div style="width:38px;height:38px;border-radius:10px;background:#0D1117;
+              border:1px solid #30363D;display:flex;align-items:center;
+              justify-content:center;font-size:16px;">📋</div>
+  <div>
+    <div style="font-size:17px;font-weight:700;color:#E6EDF3;">Client Assessment</div>
+    <div style="font-size:11px;color:#8B949E;">Enter applicant details for risk evaluation</div>
+  </div>
+</div>
+"""
+
+RESULT_TITLE_HTML = """
+<div style="display:flex;align-items:center;gap:12px;margin-bottom:18px;
+            padding-bottom:14px;border-bottom:1px solid #30363D;">
+  <div style="width:38px;height:38px;border-radius:10px;background:#0D1117;
+              border:1px solid #30363D;display:flex;align-items:center;
+              justify-content:center;font-size:16px;">📈</div>
+  <div>
+    <div style="font-size:17px;font-weight:700;color:#E6EDF3;">Risk Assessment</div>
+    <div style="font-size:11px;color:#8B949E;">AI-generated analysis & insights</div>
+  </div>
+</div>
+"""
+
+PORTFOLIO_TITLE_HTML = """
+<div style="display:flex;align-items:center;gap:12px;margin-bottom:18px;
+            padding-bottom:14px;border-bottom:1px solid #30363D;">
+  <div style="width:38px;height:38px;border-radius:10px;background:#0D1117;
+              border:1px solid #30363D;display:flex;align-items:center;
+              justify-content:center;font-size:16px;">📁</div>
+  <div>
+    <div style="font-size:17px;font-weight:700;color:#E6EDF3;">Portfolio Analysis</div>
+    <div style="font-size:11px;color:#8B949E;">Upload a portfolio file to score every account at once</div>
+  </div>
+</div>
+"""
+
+PLACEHOLDER_HTML = """
+<div style="text-align:center;padding:70px 24px;">
+  <div style="width:80px;height:80px;border-radius:20px;background:#161B22;
+              border:1px solid #30363D;display:flex;align-items:center;
+              justify-content:center;margin:0 auto 18px;font-size:32px;">🏦</div>
+  <div style="font-size:18px;font-weight:700;color:#E6EDF3;margin-bottom:8px;">Ready for Analysis</div>
+  <div style="font-size:13px;color:#8B949E;max-width:280px;margin:0 auto;line-height:1.6;">
+    Fill in client details and click
+    <strong style="color:#58A6FF;">Analyze Risk Profile</strong>
+    to generate a comprehensive risk report.
+  </div>
+</div>"""
+
+FOOTER_HTML = """
+<div style="display:flex;align-items:center;justify-content:space-between;
+            padding:14px 22px;margin-top:20px;background:#161B22;border-radius:12px;
+            border:1px solid #30363D;">
+  <div style="display:flex;align-items:center;gap:8px;">
+    <div style="width:24px;height:24px;border-radius:6px;
+                background:linear-gradient(135deg,#58A6FF,#BC8CFF);
+                display:flex;align-items:center;justify-content:center;
+                font-size:10px;font-weight:800;color:#0D1117;">CR</div>
+    <span style="font-size:11px;color:#8B949E;">CreditRisk Enterprise Engine</span>
+  </div>
+  <span style="font-size:10px;color:#484F58;">
+    AI-generated assessments require human review before final decisions
+  </span>
+</div>
+"""
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# HTML helpers — all cards use dark palette
+# ─────────────────────────────────────────────────────────────────────────────
+
+CARD = (
+    'background:#1C2333;border-radius:16px;padding:{pad};'
+    'border:1px solid #30363D;box-shadow:0 4px 24px rgba(0,0,0,0.5);'
+)
+
+def stat_card(icon, label, value, sub, sub_color="#3FB950"):
+    return f"""
+<div style="{CARD.format(pad='18px 20px')}">
+  <div style="display:flex;align-items:center;gap:10px;margin-bottom:8px;">
+    <div style="width:38px;height:38px;border-radius:10px;background:#0D1117;
+                display:flex;align-items:center;justify-content:center;font-size:17px;">{icon}</div>
+    <span style="font-size:10px;font-weight:700;color:#8B949E;text-transform:uppercase;letter-spacing:.8px;">{label}</span>
+  </div>
+  <div style="font-size:22px;font-weight:800;color:#E6EDF3;">{value}</div>
+  <div style="font-size:11px;font-weight:600;color:{sub_color};margin-top:4px;">{sub}</div>
+</div>"""
+
+
+MONTHS = ["Jan","Feb","Mar","Apr","May","Jun"]
+
+
+def bar_heights(values):
+    """(amount label, bar height in px) per month, scaled to the largest value."""
+    mx = max(values) if max(values) > 0 else 1
+    return [(f"{v/1000:.0f}", str(max(6, int((v / mx) * 110)))) for v in values]
+
+
+def _bar(amount, height, color_grad, month):
+    return f"""
+<div style="display:flex;flex-direction:column;align-items:center;gap:3px;flex:1;">
+  <span style="font-size:9px;color:#8B949E;font-weight:600;">${amount}k</span>
+  <div style="width:100%;height:{height}px;background:{color_grad};border-radius:5px 5px 3px 3px;"></div>
+  <span style="font-size:9px;color:#484F58;">{month}</span>
+</div>"""
+
+
+def _bar_chart(bars, title, subtitle, icon):
+    return f"""
+<div style="{CARD.format(pad='20px')}">
+  <div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:16px;">
+    <div>
+      <div style="font-size:14px;font-weight:700;color:#E6EDF3;">{title}</div>
+      <div style="font-size:10px;color:#8B949E;margin-top:2px;">{subtitle}</div>
+    </div>
+    <div style="width:30px;height:30px;border-radius:8px;background:#0D1117;
+                display:flex;align-items:center;justify-content:center;font-size:13px;">{icon}</div>
+  </div>
+  <div style="display:flex;align-items:flex-end;gap:6px;height:130px;padding-top:10px;">{bars}</div>
+</div>"""
+
+
+def bar_chart_html(values, color_grad, title, subtitle, icon):
+    bars = "".join(_bar(a, h, color_grad, m) for (a, h), m in zip(bar_heights(values), MONTHS))
+    return _bar_chart(bars, title, subtitle, icon)
+
+
+def donut_background(pct, risk_color):
+    deg = int(pct * 3.6)
+    return f"conic-gradient({risk_color} 0deg,{risk_color} {deg}deg,#30363D {deg}deg,#30363D 360deg)"
+
+
+def _donut(bg, pct_text, risk_color, risk_label):
+    return f"""
+<div style="{CARD.format(pad='22px')};display:flex;flex-direction:column;align-items:center;justify-content:center;">
+  <div style="font-size:14px;font-weight:700;color:#E6EDF3;margin-bottom:2px;">Risk Score</div>
+  <div style="font-size:10px;color:#8B949E;margin-bottom:18px;">Default Probability</div>
+  <div style="width:140px;height:140px;border-radius:50%;background:{bg};
+              display:flex;align-items:center;justify-content:center;">
+    <div style="width:104px;height:104px;border-radius:50%;background:#1C2333;
+                display:flex;flex-direction:column;align-items:center;justify-content:center;">
+      <div style="font-size:28px;font-weight:900;color:{risk_color};">{pct_text}</div>
+      <div style="font-size:10px;color:#8B949E;font-weight:600;">percent</div>
+    </div>
+  </div>
+  <div style="margin-top:14px;padding:6px 18px;background:rgba(0,0,0,0.3);
+              border:1px solid {risk_color}55;border-radius:50px;
+              font-size:11px;font-weight:700;color:{risk_color};letter-spacing:1px;">{risk_label}</div>
+</div>"""
+
+
+def donut_html(pct, risk_color, risk_label):
+    return _donut(donut_background(pct, risk_color), f"{pct:.1f}", risk_color, risk_label)
+
+
+def _client_profile(name, age, ps, avg_pay_k):
+    return f"""
+<div style="{CARD.format(pad='20px')}">
+  <div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:16px;">
+    <div>
+      <div style="font-size:14px;font-weight:700;color:#E6EDF3;">Client Profile</div>
+      <div style="font-size:10px;color:#8B949E;margin-top:2px;">{name}</div>
+    </div>
+    <div style="width:30px;height:30px;border-radius:8px;background:#0D1117;
+                display:flex;align-items:center;justify-content:center;font-size:13px;">👤</div>
+  </div>
+  <div style="display:grid;grid-template-columns:1fr 1fr;gap:8px;">
+    <div style="background:#0D1117;border-radius:10px;padding:14px;text-align:center;border:1px solid #30363D;">
+      <div style="font-size:20px;font-weight:800;color:#58A6FF;">{age}</div>
+      <div style="font-size:9px;font-weight:700;color:#484F58;text-transform:uppercase;margin-top:3px;">Age</div>
+    </div>
+    <div style="background:#0D1117;border-radius:10px;padding:14px;text-align:center;border:1px solid #30363D;">
+      <div style="font-size:20px;font-weight:800;color:#3FB950;">{ps}</div>
+      <div style="font-size:9px;font-weight:700;color:#484F58;text-transform:uppercase;margin-top:3px;">Delay Mo.</div>
+    </div>
+    <div style="background:#0D1117;border-radius:10px;padding:14px;text-align:center;border:1px solid #30363D;">
+      <div style="font-size:20px;font-weight:800;color:#BC8CFF;">6</div>
+      <div style="font-size:9px;font-weight:700;color:#484F58;text-transform:uppercase;margin-top:3px;">Months</div>
+    </div>
+    <div style="background:#0D1117;border-radius:10px;padding:14px;text-align:center;border:1px solid #30363D;">
+      <div style="font-size:20px;font-weight:800;color:#E3B341;">${avg_pay_k}k</div>
+      <div style="font-size:9px;font-weight:700;color:#484F58;text-transform:uppercase;margin-top:3px;">Avg Pay</div>
+    </div>
+  </div>
+</div>"""
+
+
+def client_profile_html(name, age, ps, avg_pay):
+    return _client_profile(name, age, ps, f"{avg_pay/1000:.1f}")
+
+
+def insight_row(level, label, value, desc):
+    color_map = {"critical":"#F78166","warning":"#E3B341","good":"#3FB950"}
+    icon_map  = {"critical":"❌","warning":"⚠️","good":"✅"}
+    c = color_map[level]; ic = icon_map[level]
+    return f"""
+<div style="display:flex;align-items:center;gap:12px;padding:12px 16px;
+            background:#0D1117;border-radius:10px;border:1px solid {c}22;">
+  <div style="font-size:16px;">{ic}</div>
+  <div style="flex:1;">
+    <div style="font-size:12px;font-weight:700;color:#E6EDF3;">{label}</div>
+    <div style="font-size:10px;color:#8B949E;margin-top:1px;">{desc}</div>
+  </div>
+  <div style="font-size:14px;font-weight:800;color:{c};">{value}</div>
+</div>"""
+
+
+def _progress_bar(pct_text, bar_width_text, risk_color, bar_color):
+    return f"""
+<div style="{CARD.format(pad='20px')};margin-bottom:16px;">
+  <div style="display:flex;align-items:center;justify-content:space-between;margin-bottom:12px;">
+    <div style="font-size:14px;font-weight:700;color:#E6EDF3;">Default Probability Scale</div>
+    <div style="padding:5px 14px;background:rgba(0,0,0,0.4);border:1px solid {risk_color}55;
+                border-radius:50px;font-size:11px;font-weight:700;color:{risk_color};">{pct_text}%</div>
+  </div>
+  <div style="height:10px;background:#30363D;border-radius:8px;overflow:hidden;">
+    <div style="height:100%;width:{bar_width_text}%;background:{bar_color};border-radius:8px;"></div>
+  </div>
+  <div style="display:flex;justify-content:space-between;margin-top:6px;font-size:9px;color:#484F58;font-weight:600;">
+    <span>0% Safe</span><span>30%</span><span>60%</span><span>100% Critical</span>
+  </div>
+</div>"""
+
+
+def progress_bar_html(pct, risk_color, risk_label, bar_color):
+    return _progress_bar(f"{pct:.1f}", f"{min(pct, 100):.0f}", risk_color, bar_color)
+
+
+def recommendation_html(risk_color, risk_label, risk_emoji, rec_text):
+    return f"""
+<div style="background:rgba(0,0,0,0.3);border:1px solid {risk_color}44;
+            border-radius:16px;padding:20px;margin-bottom:12px;">
+  <div style="display:flex;align-items:center;gap:12px;margin-bottom:10px;">
+    <div style="width:40px;height:40px;border-radius:10px;background:#1C2333;
+                display:flex;align-items:center;justify-content:center;font-size:18px;
+                border:1px solid {risk_color}44;">{risk_emoji}</div>
+    <div>
+      <div style="font-size:14px;font-weight:700;color:#E6EDF3;">Recommendation</div>
+      <div style="font-size:10px;color:#8B949E;">AI Engine Assessment</div>
+    </div>
+  </div>
+  <div style="font-size:13px;color:#C9D1D9;line-height:1.8;">{rec_text}</div>
+</div>"""
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Result report
+# ─────────────────────────────────────────────────────────────────────────────
+
+class Template:
+    """
+    Text pre-split into static fragments around named slots. render()
+    only interleaves the fragments with the slot values, so nothing static
+    is formatted again per report.
+    """
+
+    def __init__(self, text):
+        parts = text.split(_SLOT)
+        self.parts = parts
+        self.positions = list(range(1, len(parts), 2))
+        self.slots = parts[1::2]
+
+    def render(self, values):
+        parts = self.parts[:]
+        for i, slot in zip(self.positions, self.slots):
+            parts[i] = values[slot]
+        return "".join(parts)
+
+
+_SLOT = "\x00"
+
+
+def _slot(name):
+    return f"{_SLOT}{name}{_SLOT}"
+
+
+# Per-tier strings: (risk_color, risk_label, risk_emoji, rec_text, bar_color)
+RESULT_TIERS = (
+    ("#3FB950", "LOW RISK", "✅",
+     "Strong repayment profile. Client shows consistent financial discipline. <strong>Approval recommended</strong> with standard terms.",
+     "linear-gradient(90deg,#3FB950,#2EA043)"),
+    ("#E3B341", "MEDIUM RISK", "⚠️",
+     "Moderate risk indicators present. Irregular payment patterns. <strong>Additional review recommended</strong>.",
+     "linear-gradient(90deg,#E3B341,#BB8A00)"),
+    ("#F78166", "HIGH RISK", "❌",
+     "High probability of default. Significant repayment risk. <strong>Decline recommended</strong>.",
+     "linear-gradient(90deg,#F78166,#DA3633)"),
+)
+BILL_GRADIENT = "linear-gradient(180deg,#58A6FF,#1F6FEB)"
+PAY_GRADIENT = "linear-gradient(180deg,#3FB950,#2EA043)"
+
+
+def _result_html():
+    # The whole report with a slot for every per-applicant value; split once into RESULT_TEMPLATE
+    s = _slot
+    stats = f"""
+<div style="display:grid;grid-template-columns:repeat(4,1fr);gap:12px;margin-bottom:16px;">
+  {stat_card("💳","Credit Limit",s("credit_limit"),"Active")}
+  {stat_card("📈","Utilization",s("utilization"),s("util_label"),s("util_color"))}
+  {stat_card("💰","Avg Bill",s("avg_bill"),"6-month avg","#8B949E")}
+  {stat_card("💸","Pay Ratio",s("pay_ratio"),s("pr_label"),s("pr_color"))}
+</div>"""
+
+    bill_bars = "".join(_bar(s(f"bill_amount{i}"), s(f"bill_height{i}"), BILL_GRADIENT, m) for i, m in enumerate(MONTHS))
+    pay_bars = "".join(_bar(s(f"pay_amount{i}"), s(f"pay_height{i}"), PAY_GRADIENT, m) for i, m in enumerate(MONTHS))
+    row3 = f"""
+<div style="display:grid;grid-template-columns:1fr 1fr 1fr;gap:12px;margin-bottom:16px;">
+  {_bar_chart(bill_bars,"Billing History","6-month trend","📊")}
+  {_donut(s("donut_bg"), s("pct"), s("risk_color"), s("risk_label"))}
+  {_client_profile(s("client_name"), s("age"), s("ps"), s("avg_pay_k"))}
+</div>"""
+
+    row2 = f"""
+<div style="display:grid;grid-template-columns:1fr 1fr;gap:12px;margin-bottom:16px;">
+  {_bar_chart(pay_bars,"Payment History","6-month payments","💵")}
+  <div style="{CARD.format(pad='20px')}">
+    <div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:14px;">
+      <div>
+        <div style="font-size:14px;font-weight:700;color:#E6EDF3;">Risk Analysis</div>
+        <div style="font-size:10px;color:#8B949E;margin-top:2px;">Key indicators</div>
+      </div>
+      <div style="width:30px;height:30px;border-radius:8px;background:#0D1117;
+                  display:flex;align-items:center;justify-content:center;font-size:13px;">🔍</div>
+    </div>
+    <div style="display:flex;flex-direction:column;gap:8px;">{s("insights")}</div>
+  </div>
+</div>"""
+
+    prog = _progress_bar(s("pct"), s("bar_width"), s("risk_color"), s("bar_color"))
+    rec  = recommendation_html(s("risk_color"), s("risk_label"), s("risk_emoji"), s("rec_text"))
+    foot = '<div style="text-align:center;padding:6px 0 2px;"><span style="font-size:10px;color:#484F58;">Analysis by CreditRisk AI v5.0 | Requires human review</span></div>'
+
+    return stats + row3 + row2 + prog + rec + foot
+
+
+RESULT_TEMPLATE = Template(_result_html())
+
+
+def result_values(name, age, credit_limit, bills, pays, pct, ps, drivers=()):
+    """The RESULT_TEMPLATE slot values for one applicant."""
+    prob = pct / 100
+    tier = 0 if prob < LOW_RISK_MAX else 1 if prob < MEDIUM_RISK_MAX else 2
+    risk_color, risk_label, risk_emoji, rec_text, bar_color = RESULT_TIERS[tier]
+
+    avg_bill    = sum(bills) / len(bills)
+    avg_pay     = sum(pays) / len(pays)
+    utilization = min(100, int(round(avg_bill / credit_limit * 100))) if credit_limit > 0 else 0
+    # An average bill of exactly -1 (credit balances) divides by zero; cap it as the model's PAYMENT_TO_BILL does
+    pay_ratio   = (min(100, int(round(avg_pay / (avg_bill + 1) * 100))) if avg_bill != -1
+                   else 100 if avg_pay > 0 else 0)
+    client_name = html.escape(name.strip()) if name and name.strip() else "Anonymous Client"
+
+    # ── insights ───────────────────────────────────────────────────────────────
+    ins = []
+    ins.append(("critical" if utilization>80 else "warning" if utilization>50 else "good",
+                "Credit Utilization", f"{utilization}%",
+                "High utilization" if utilization>80 else "Above 30%" if utilization>50 else "Within healthy limits"))
+    ins.append(("critical" if pay_ratio<20 else "warning" if pay_ratio<50 else "good",
+                "Payment Ratio", f"{pay_ratio}%",
+                "Very low" if pay_ratio<20 else "Partial repayments" if pay_ratio<50 else "Strong repayment"))
+    ins.append(("critical" if ps>=3 else "warning" if ps>=1 else "good",
+                "Payment Delays", f"{ps} mo" if ps>0 else "On Time",
+                "Severe signal" if ps>=3 else "Minor delays" if ps>=1 else "No delays"))
+    # Model drivers: exact logit contributions, shown as odds multipliers
+    for feature, phi in drivers:
+        ins.append(("critical" if phi>0.25 else "warning" if phi>0 else "good",
+                    f"Driver: {feature}", f"×{math.exp(phi):.2f} odds",
+                    "Raises default risk" if phi>0 else "Lowers default risk"))
+
+    values = {
+        "credit_limit": f"${credit_limit:,.0f}",
+        "utilization": f"{utilization}%",
+        "util_label": "High" if utilization > 50 else "Normal",
+        "util_color": "#F78166" if utilization > 50 else "#3FB950",
+        "avg_bill": f"${avg_bill:,.0f}",
+        "pay_ratio": f"{pay_ratio}%",
+        "pr_label": "Low" if pay_ratio < 30 else "Healthy",
+        "pr_color": "#F78166" if pay_ratio < 30 else "#3FB950",
+        "donut_bg": donut_background(pct, risk_color),
+        "pct": f"{pct:.1f}",
+        "bar_width": f"{min(pct, 100):.0f}",
+        "risk_color": risk_color, "risk_label": risk_label, "risk_emoji": risk_emoji,
+        "rec_text": rec_text, "bar_color": bar_color,
+        "client_name": client_name,
+        "age": str(int(age)),
+        "ps": str(ps),
+        "avg_pay_k": f"{avg_pay/1000:.1f}",
+        "insights": "\n".join(insight_row(*i) for i in ins),
+    }
+    for prefix, amounts in (("bill", bills), ("pay", pays)):
+        for i, (amount, height) in enumerate(bar_heights(amounts)):
+            values[f"{prefix}_amount{i}"] = amount
+            values[f"{prefix}_height{i}"] = height
+    return values
+
+
+def assemble_result(name, age, credit_limit, bills, pays, pct, ps, drivers=()):
+    return RESULT_TEMPLATE.render(result_values(name, age, credit_limit, bills, pays, pct, ps, drivers))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Portfolio summary
+# ─────────────────────────────────────────────────────────────────────────────
+
+TIER_COLORS = {"LOW RISK":"#3FB950", "MEDIUM RISK":"#E3B341", "HIGH RISK":"#F78166"}
+
+
+def tier_distribution_html(tiers):
+    segments = "".join(
+        f'<div style="width:{t["share"]*100:.2f}%;background:{TIER_COLORS[name]};"></div>'
+        for name, t in tiers.items()
+    )
+    legend = "".join(f"""
+  <div style="flex:1;background:#0D1117;border-radius:10px;padding:12px;border:1px solid #30363D;">
+    <div style="font-size:10px;font-weight:700;color:{TIER_COLORS[name]};letter-spacing:.8px;">{name}</div>
+    <div style="font-size:18px;font-weight:800;color:#E6EDF3;margin-top:4px;">{t["accounts"]:,}</div>
+    <div style="font-size:10px;color:#8B949E;">{t["share"]*100:.1f}% · {t["expected_defaults"]:,.0f} expected defaults</div>
+  </div>""" for name, t in tiers.items())
+    return f"""
+<div style="{CARD.format(pad='20px')};margin-bottom:16px;">
+  <div style="font-size:14px;font-weight:700;color:#E6EDF3;margin-bottom:12px;">Tier Distribution</div>
+  <div style="display:flex;height:12px;border-radius:8px;overflow:hidden;background:#30363D;">{segments}</div>
+  <div style="display:flex;gap:10px;margin-top:14px;">{legend}</div>
+</div>"""
+
+
+def portfolio_summary_html(summary):
+    high = summary["tiers"]["HIGH RISK"]
+    stats = f"""
+<div style="display:grid;grid-template-columns:repeat(4,1fr);gap:12px;margin-bottom:16px;">
+  {stat_card("📁","Accounts",f"{summary['accounts']:,}","Scored")}
+  {stat_card("📉","Expected Defaults",f"{summary['expected_defaults']:,.0f}","Sum of probabilities","#E3B341")}
+  {stat_card("🎯","Mean Probability",f"{summary['mean_probability']*100:.1f}%","Portfolio average","#8B949E")}
+  {stat_card("💵","Balance at Risk",f"${summary['expected_default_balance']:,.0f}",f"{high['share']*100:.1f}% high risk","#F78166")}
+</div>"""
+    return stats + tier_distribution_html(summary["tiers"])
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# What-if sensitivity
+# ─────────────────────────────────────────────────────────────────────────────
+
+SENSITIVITY_TITLE_HTML = """
+<div style="display:flex;align-items:center;gap:12px;margin:22px 0 18px;
+            padding-bottom:14px;border-bottom:1px solid #30363D;">
+  <div style="width:38px;height:38px;border-radius:10px;background:#0D1117;
+              border:1px solid #30363D;display:flex;align-items:center;
+              justify-content:center;font-size:16px;">🎯</div>
+  <div>
+    <div style="font-size:17px;font-weight:700;color:#E6EDF3;">What-If Sensitivity</div>
+    <div style="font-size:11px;color:#8B949E;">How far inputs must move to change this applicant's risk tier</div>
+  </div>
+</div>
+"""
+
+
+def sensitivity_chart_spec(x_label, y_label=None):
+    """Vega-Lite spec: probability heat map for 2-D sweeps, curve with tier thresholds for 1-D."""
+    color = {"field":"probability", "type":"quantitative", "title":"P(default)",
+             "scale":{"domain":[0, 0.3, 0.6, 1], "range":["#3FB950", "#E3B341", "#F78166", "#8B1E1E"]}}
+    axis = {"format":",.0f", "labelOverlap":True, "labelColor":"#8B949E", "titleColor":"#E6EDF3"}
+    if y_label is not None:
+        return {
+            "mark":{"type":"rect"},
+            "encoding":{
+                "x":{"field":"x", "type":"ordinal", "title":x_label, "axis":axis},
+                "y":{"field":"y", "type":"ordinal", "title":y_label, "sort":"descending", "axis":axis},
+                "color":color,
+                "tooltip":[{"field":"x", "format":",.0f", "title":x_label},
+                           {"field":"y", "format":",.0f", "title":y_label},
+                           {"field":"probability", "format":".1%"}],
+            },
+        }
+    return {
+        "layer":[
+            {"mark":{"type":"line", "color":"#58A6FF"},
+             "encoding":{"x":{"field":"x", "type":"quantitative", "title":x_label, "axis":axis},
+                         "y":{"field":"probability", "type":"quantitative", "title":"P(default)",
+                              "scale":{"domain":[0, 1]}, "axis":{**axis, "format":".0%"}}}},
+            {"data":{"values":[{"t":0.3, "c":"#E3B341"}, {"t":0.6, "c":"#F78166"}]},
+             "mark":{"type":"rule", "strokeDash":[4, 4]},
+             "encoding":{"y":{"field":"t", "type":"quantitative"},
+                         "color":{"field":"c", "type":"nominal", "scale":None}}},
+        ],
+    }
+
+
+def sensitivity_boundaries_html(x_label, boundaries, base_pct, context=""):
+    """One insight row per tier threshold: the x value where the applicant changes tier."""
+    rows = ""
+    for b in boundaries:
+        low, high = (t.split()[0].title() for t in b["between"])
+        at = b["x"]
+        if math.isnan(at):  # threshold not crossed inside the swept range
+            rows += insight_row("good", f"{low} ↔ {high}", "—", f"Not crossed in this {x_label} range{context}")
+        else:
+            level = "critical" if b["threshold"] >= 0.6 else "warning"
+            rows += insight_row(level, f"{low} ↔ {high}", f"{at:,.0f}" if abs(at) >= 100 else f"{at:.1f}",
+                                f"{b['threshold']*100:.0f}% threshold crossed at this {x_label}{context}")
+    return f"""
+<div style="{CARD.format(pad='20px')};">
+  <div style="font-size:14px;font-weight:700;color:#E6EDF3;margin-bottom:4px;">Tier Boundaries</div>
+  <div style="font-size:11px;color:#8B949E;margin-bottom:12px;">Current applicant: {base_pct:.1f}% default probability</div>
+  <div style="display:flex;flex-direction:column;gap:8px;">{rows}</div>
+</div>"""
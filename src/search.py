@@ -0,0 +1,281 @@
+"""
+Cross-validated model selection, the scripted version of notebook 03.
+
+    python -m src.search --folds 5 --jobs -1
+    python -m src.search --families logreg xgboost --grid my_grid.json
+
+Every candidate (model family x hyperparameter set from the grid) is scored
+with stratified k-fold cross-validation. The (candidate, fold) fits run in
+a process pool. Each fold's preprocessed train/validation matrices are
+computed once, saved as .npy files under data/cache/folds-<hash>/ and
+memory-mapped by the workers, so no candidate refits the preprocessor.
+Boosted models hold out part of the fold's training rows for early
+stopping. The final refit uses the mean best round count from the folds.
+
+The winner is refit on the whole dataset and written to
+models/best_model.pkl together with the matching preprocessor.pkl and
+scaler.pkl, and models/drift_reference.npz is rebuilt from its scores so
+src.drift compares live traffic with the model actually served. A
+leaderboard with mean/std ROC-AUC, fit time per fold and single-row
+inference latency goes to models/leaderboard.csv.
+
+A grid file is JSON of the form {"family": {"param": [values, ...]}}.
+Families missing from the file keep their DEFAULT_GRID entry.
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import ParameterGrid, StratifiedKFold, train_test_split
+
+sys.path.append(os.getcwd())
+
+from src.data import CACHE_DIR, TARGET, load_data
+from src.bundle import BUNDLE_PATH, write_bundle_if_linear
+from src.drift import DRIFT_REFERENCE_PATH, training_reference
+from src.preprocess import CreditPreprocessor, raw_block
+from src.train import DATA_PATH, MODEL_PATH, SCALER_PATH, PREPROCESSOR_PATH
+
+LEADERBOARD_PATH="models/leaderboard.csv"
+FOLD_CACHE_VERSION=1
+
+# Notebook 03 settings, plus a few neighbours to search over
+DEFAULT_GRID={
+    "logreg":{
+        "C":[0.01,0.1,1.0],
+        "max_iter":[1000],
+    },
+    "random_forest":{
+        "n_estimators":[500],
+        "max_depth":[10,15],
+        "min_samples_split":[5],
+        "min_samples_leaf":[2],
+        "max_features":["sqrt"],
+        "class_weight":["balanced"],
+    },
+    "xgboost":{
+        "n_estimators":[500],
+        "learning_rate":[0.05,0.1],
+        "max_depth":[3,4],
+        "subsample":[0.8],
+        "colsample_bytree":[0.8],
+        "scale_pos_weight":["balanced"],
+    },
+}
+BOOSTED_FAMILIES=("xgboost",)
+
+
+def make_estimator(family,params,y=None,random_state=42):
+    """Unfitted single-threaded estimator; scale_pos_weight="balanced" is resolved from `y`."""
+    params=dict(params)
+    if family=="logreg":
+        from sklearn.linear_model import LogisticRegression
+        return LogisticRegression(**params)
+    if family=="random_forest":
+        from sklearn.ensemble import RandomForestClassifier
+        return RandomForestClassifier(random_state=random_state,n_jobs=1,**params)
+    if family=="xgboost":
+        from xgboost import XGBClassifier
+        if params.get("scale_pos_weight")=="balanced":
+            params["scale_pos_weight"]=float((y==0).sum()/max((y==1).sum(),1))
+        params.setdefault("eval_metric","logloss")
+        return XGBClassifier(random_state=random_state,n_jobs=1,**params)
+    raise ValueError(f"unknown model family: {family!r}")
+
+
+def candidates(grid:dict,families=None) -> list:
+    """[(family, params), ...] for every point of every family's grid."""
+    out=[]
+    for family,space in grid.items():
+        if families is not None and family not in families:
+            continue
+        out.extend((family,dict(p)) for p in ParameterGrid(space))
+    return out
+
+
+def load_grid(path=None) -> dict:
+    grid={f:dict(space) for f,space in DEFAULT_GRID.items()}
+    if path:
+        with open(path) as f:
+            grid.update(json.load(f))
+    return grid
+
+
+def _fold_key(block,y,n_splits,random_state) -> str:
+    h=hashlib.blake2b(digest_size=12)
+    h.update(np.ascontiguousarray(block).tobytes())
+    h.update(np.ascontiguousarray(y).tobytes())
+    h.update(f"{n_splits}|{random_state}|{FOLD_CACHE_VERSION}".encode())
+    return h.hexdigest()
+
+
+def build_fold_cache(block,y,n_splits=5,random_state=42,cache_dir=CACHE_DIR) -> str:
+    """
+    Fit a CreditPreprocessor per stratified fold and store the transformed
+    matrices as fold<k>/{X_train,y_train,X_val,y_val}.npy; returns the directory.
+    """
+    target=os.path.join(cache_dir,f"folds-{_fold_key(block,y,n_splits,random_state)}")
+    if os.path.exists(os.path.join(target,"meta.json")):
+        return target
+
+    tmp=target+f".tmp{os.getpid()}"
+    os.makedirs(tmp,exist_ok=True)
+    skf=StratifiedKFold(n_splits=n_splits,shuffle=True,random_state=random_state)
+    for k,(train_idx,val_idx) in enumerate(skf.split(block,y)):
+        pre=CreditPreprocessor().fit(block[train_idx])
+        fold=os.path.join(tmp,f"fold{k}")
+        os.makedirs(fold)
+        np.save(os.path.join(fold,"X_train.npy"),pre.transform(block[train_idx]))
+        np.save(os.path.join(fold,"y_train.npy"),y[train_idx])
+        np.save(os.path.join(fold,"X_val.npy"),pre.transform(block[val_idx]))
+        np.save(os.path.join(fold,"y_val.npy"),y[val_idx])
+    with open(os.path.join(tmp,"meta.json"),"w") as f:
+        json.dump({"version":FOLD_CACHE_VERSION,"n_splits":n_splits,"random_state":random_state,"rows":len(y)},f)
+    try:
+        os.replace(tmp,target)
+    except OSError:
+        # Another run published the same folds first
+        shutil.rmtree(tmp)
+    return target
+
+
+def _load_fold(fold_dir,k):
+    path=os.path.join(fold_dir,f"fold{k}")
+    return tuple(np.load(os.path.join(path,f"{name}.npy"),mmap_mode="r") for name in ("X_train","y_train","X_val","y_val"))
+
+
+def single_row_latency(model,X,repeats=50) -> float:
+    """Median predict_proba time for one row, in microseconds."""
+    row=np.ascontiguousarray(X[:1])
+    model.predict_proba(row)
+    times=np.empty(repeats)
+    for i in range(repeats):
+        start=time.perf_counter()
+        model.predict_proba(row)
+        times[i]=time.perf_counter()-start
+    return float(np.median(times)*1e6)
+
+
+def fit_fold(family,params,fold_dir,k,early_stopping_rounds=50,random_state=42) -> dict:
+    X_train,y_train,X_val,y_val=_load_fold(fold_dir,k)
+    model=make_estimator(family,params,y_train,random_state)
+
+    start=time.perf_counter()
+    if family in BOOSTED_FAMILIES and early_stopping_rounds:
+        # Early-stop on a slice of the training rows, never on the scoring fold
+        X_fit,X_stop,y_fit,y_stop=train_test_split(
+            X_train,y_train,test_size=0.1,stratify=y_train,random_state=random_state)
+        model.set_params(early_stopping_rounds=early_stopping_rounds)
+        model.fit(X_fit,y_fit,eval_set=[(X_stop,y_stop)],verbose=False)
+        rounds=int(model.best_iteration)+1
+    else:
+        model.fit(X_train,y_train)
+        rounds=None
+    fit_time=time.perf_counter()-start
+
+    auc=roc_auc_score(y_val,model.predict_proba(X_val)[:,1])
+    return {"fold":k,"roc_auc":auc,"fit_time":fit_time,
+            "latency_us":single_row_latency(model,X_val),"rounds":rounds}
+
+
+def cross_validate(block,y,grid,families=None,n_splits=5,n_jobs=-1,
+                   early_stopping_rounds=50,random_state=42,cache_dir=CACHE_DIR) -> pd.DataFrame:
+    """Leaderboard of every candidate, best mean ROC-AUC first."""
+    cands=candidates(grid,families)
+    if not cands:
+        raise ValueError("no candidates to evaluate")
+    fold_dir=build_fold_cache(block,y,n_splits,random_state,cache_dir)
+
+    tasks=[(i,k) for i in range(len(cands)) for k in range(n_splits)]
+    results=Parallel(n_jobs=n_jobs)(
+        delayed(fit_fold)(cands[i][0],cands[i][1],fold_dir,k,early_stopping_rounds,random_state)
+        for i,k in tasks
+    )
+
+    rows=[]
+    for i,(family,params) in enumerate(cands):
+        folds=[r for (j,_),r in zip(tasks,results) if j==i]
+        aucs=np.array([r["roc_auc"] for r in folds])
+        rounds=[r["rounds"] for r in folds if r["rounds"] is not None]
+        rows.append({
+            "family":family,
+            "params":json.dumps(params,sort_keys=True),
+            "roc_auc_mean":aucs.mean(),
+            "roc_auc_std":aucs.std(),
+            "fit_time_s":float(np.mean([r["fit_time"] for r in folds])),
+            "latency_us":float(np.median([r["latency_us"] for r in folds])),
+            "best_rounds":int(round(np.mean(rounds))) if rounds else None,
+        })
+    board=pd.DataFrame(rows).sort_values("roc_auc_mean",ascending=False,ignore_index=True)
+    board.index+=1
+    board.index.name="rank"
+    return board
+
+
+def refit_best(block,y,board,random_state=42):
+    """Refit the leaderboard winner and a fresh preprocessor on all rows."""
+    best=board.iloc[0]
+    params=json.loads(best["params"])
+    if best["family"] in BOOSTED_FAMILIES and pd.notna(best["best_rounds"]):
+        params["n_estimators"]=int(best["best_rounds"])
+    pre=CreditPreprocessor().fit(block)
+    model=make_estimator(best["family"],params,y,random_state)
+    if hasattr(model,"n_jobs"):
+        model.set_params(n_jobs=-1)
+    model.fit(pre.transform(block),y)
+    return model,pre
+
+
+def main(argv=None):
+    parser=argparse.ArgumentParser(description="Cross-validated model and hyperparameter search.")
+    parser.add_argument("--data",default=DATA_PATH)
+    parser.add_argument("--grid",default=None,help="JSON {family: {param: [values]}} overriding DEFAULT_GRID")
+    parser.add_argument("--families",nargs="+",default=None,choices=sorted(DEFAULT_GRID))
+    parser.add_argument("--folds",type=int,default=5)
+    parser.add_argument("--jobs",type=int,default=-1)
+    parser.add_argument("--early-stopping-rounds",type=int,default=50)
+    parser.add_argument("--seed",type=int,default=42)
+    parser.add_argument("--model",default=MODEL_PATH)
+    parser.add_argument("--scaler",default=SCALER_PATH)
+    parser.add_argument("--preprocessor",default=PREPROCESSOR_PATH)
+    parser.add_argument("--leaderboard",default=LEADERBOARD_PATH)
+    parser.add_argument("--bundle",default=BUNDLE_PATH)
+    parser.add_argument("--drift-reference",default=DRIFT_REFERENCE_PATH,help="training-set histograms for src.drift")
+    args=parser.parse_args(argv)
+
+    df=load_data(args.data)
+    block=raw_block(df)
+    y=df[TARGET].to_numpy(dtype=np.int8)
+
+    start=time.perf_counter()
+    board=cross_validate(block,y,load_grid(args.grid),args.families,args.folds,args.jobs,
+                         args.early_stopping_rounds,args.seed)
+    print(f"{len(board)} candidates x {args.folds} folds in {time.perf_counter()-start:.1f}s")
+    with pd.option_context("display.max_colwidth",80,"display.width",200):
+        print(board.to_string())
+    board.to_csv(args.leaderboard)
+
+    model,pre=refit_best(block,y,board,args.seed)
+    joblib.dump(model,args.model)
+    joblib.dump(pre,args.preprocessor)
+    joblib.dump(pre.scaler_,args.scaler)
+    training_reference(model,pre,args.data).save(args.drift_reference)
+    write_bundle_if_linear(model,pre,args.bundle,sources=(args.model,args.preprocessor,args.scaler))
+    best=board.iloc[0]
+    print(f"Best: {best['family']} {best['params']} ROC-AUC {best['roc_auc_mean']:.4f}")
+    print(f"Model Saved at: {args.model}, leaderboard at: {args.leaderboard}")
+
+
+if __name__=="__main__":
+    # Run via the package module so pickled classes resolve to src.*, not __main__
+    from src.search import main
+    main()
@@ -0,0 +1,157 @@
+"""
+What-if sensitivity sweeps for one applicant.
+
+    score_fn = make_score_fn(model, preprocessor)       # src.fastpath
+    s = sweep(score_fn, row, ("LIMIT_BAL", 10_000, 500_000),
+              y=("AVG_PAY_AMT", 0, 50_000), steps=60)
+    s["probability"]       # (60, 60) surface, rows follow y, columns follow x
+    s["boundaries"]        # where each row crosses the 30% / 60% tier thresholds
+
+A dimension is any raw column or one of the grouped DIMENSIONS. PAY_DELAY
+sets all six PAY_k statuses. AVG_BILL_AMT and AVG_PAY_AMT scale the six
+monthly amounts so their average hits the grid value, which keeps the
+month-to-month shape; an all-zero history is set flat instead. Dimensions
+over whole-number columns (AGE, PAY_k, PAY_DELAY, the category codes) are
+swept over integers only: the grid is rounded and repeated points dropped,
+so it can hold fewer than `steps` points and every row passes validation
+when a non-linear model is scored through predict_batch. The whole
+grid is built as one (points, 23) raw block from the applicant's row and
+scored with one score_fn call, so a few thousand points take milliseconds.
+"""
+import numpy as np
+
+from src.features import RAW_COLUMNS
+from src.predict import LOW_RISK_MAX, MEDIUM_RISK_MAX, RISK_TIERS
+from src.preprocess import raw_block
+from src.validate import INTEGER_COLUMNS
+
+DEFAULT_STEPS=60
+THRESHOLDS=(LOW_RISK_MAX,MEDIUM_RISK_MAX)
+
+_INDEX={c:j for j,c in enumerate(RAW_COLUMNS)}
+_INTEGER={_INDEX[c] for c in INTEGER_COLUMNS}
+# name -> (raw column indices, scaled); scaled groups keep their monthly shape
+DIMENSIONS={
+    "PAY_DELAY":([_INDEX[f"PAY_{k}"] for k in (0,2,3,4,5,6)],False),
+    "AVG_BILL_AMT":([_INDEX[f"BILL_AMT{k}"] for k in range(1,7)],True),
+    "AVG_PAY_AMT":([_INDEX[f"PAY_AMT{k}"] for k in range(1,7)],True),
+}
+# Slider ranges the dashboard offers per dimension
+DEFAULT_RANGES={
+    "LIMIT_BAL":(5_000,1_000_000),
+    "AVG_PAY_AMT":(0,100_000),
+    "AVG_BILL_AMT":(0,300_000),
+    "PAY_DELAY":(-1,9),
+    "AGE":(18,80),
+}
+
+
+def _dimension(name):
+    if name in DIMENSIONS:
+        return DIMENSIONS[name]
+    if name in _INDEX:
+        return [_INDEX[name]],False
+    raise ValueError(f"unknown sweep dimension {name!r}; use a raw column or one of {', '.join(DIMENSIONS)}")
+
+
+def current_value(row,name) -> float:
+    """The applicant's value along a dimension (the group mean for grouped ones)."""
+    cols,_=_dimension(name)
+    return float(raw_block(row)[0,cols].mean())
+
+
+def _axis(name,start,stop,n):
+    # n grid values from start to stop; whole-number dimensions snap to integers
+    values=np.linspace(start,stop,n)
+    cols,_=_dimension(name)
+    if _INTEGER.issuperset(cols):
+        values=np.round(values)
+        values=values[np.r_[True,values[1:]!=values[:-1]]]
+        if len(values)<2:
+            raise ValueError(f"{name} range {start}-{stop} holds fewer than 2 whole numbers")
+    return values
+
+
+def _set(block,base,name,values):
+    # Write `values` (one per block row) into the dimension's columns, in place
+    cols,scaled=_dimension(name)
+    current=base[cols]
+    mean=current.mean()
+    if scaled and mean!=0:
+        block[:,cols]=current*(values/mean)[:,None]
+    else:
+        block[:,cols]=values[:,None]
+
+
+def grid_block(row,x,y=None,steps=DEFAULT_STEPS):
+    """
+    (block, x_values, y_values) for a sweep: the (ny * nx, 23) raw block
+    in row-major (y, x) order. x / y are (dimension, start, stop); steps is
+    an int or an (nx, ny) pair, an upper bound for whole-number dimensions.
+    """
+    nx,ny=(steps,steps) if np.isscalar(steps) else steps
+    if min(nx,ny)<2:
+        raise ValueError("a sweep needs at least 2 steps per dimension")
+    base=raw_block(row)[0]
+    xs=_axis(*x,nx)
+    ys=_axis(*y,ny) if y is not None else None
+    block=np.tile(base,(len(xs)*(len(ys) if ys is not None else 1),1))
+    if ys is None:
+        _set(block,base,x[0],xs)
+    else:
+        _set(block,base,x[0],np.tile(xs,len(ys)))
+        _set(block,base,y[0],np.repeat(ys,len(xs)))
+    return block,xs,ys
+
+
+def crossings(probs,xs,threshold) -> np.ndarray:
+    """
+    For each row of a (ny, nx) surface, the x at which the probability
+    first crosses `threshold`, linearly interpolated between grid points;
+    NaN for rows that stay on one side.
+    """
+    probs=np.atleast_2d(probs)
+    above=probs>=threshold
+    change=above[:,1:]!=above[:,:-1]
+    hit=change.any(axis=1)
+    i=np.argmax(change,axis=1)
+    rows=np.arange(len(probs))
+    p0,p1=probs[rows,i],probs[rows,i+1]
+    with np.errstate(divide="ignore",invalid="ignore"):
+        frac=np.where(p1!=p0,(threshold-p0)/(p1-p0),0.0)
+    out=xs[i]+frac*(xs[i+1]-xs[i])
+    out[~hit]=np.nan
+    return out
+
+
+def sweep(score_fn,row,x,y=None,steps=DEFAULT_STEPS) -> dict:
+    """
+    Score a 1-D or 2-D what-if grid around `row` in one score_fn call.
+
+    score_fn is any (n, 23) raw block -> probabilities callable. Returns
+    the grid axes, the probability surface ((ny, nx), or (nx,) without y),
+    the matching tier index (0/1/2 as RISK_TIERS), the applicant's own
+    probability, and one boundary entry per tier threshold holding the
+    crossing x for each y row.
+    """
+    block,xs,ys=grid_block(row,x,y,steps)
+    probs=np.asarray(score_fn(np.vstack([raw_block(row),block])),dtype=np.float64)
+    base_probability,probs=float(probs[0]),probs[1:]
+    surface=probs.reshape(len(ys),len(xs)) if ys is not None else probs
+    tiers=np.searchsorted(THRESHOLDS,surface,side="right")
+    boundaries=[]
+    for k,t in enumerate(THRESHOLDS):
+        at=crossings(surface,xs,t)
+        boundaries.append({
+            "threshold":t,
+            "between":(RISK_TIERS[k],RISK_TIERS[k+1]),
+            "x":at if ys is not None else float(at[0]),
+        })
+    return {
+        "x":x[0],"x_values":xs,
+        "y":y[0] if y is not None else None,"y_values":ys,
+        "probability":surface,
+        "tier":tiers,
+        "base_probability":base_probability,
+        "boundaries":boundaries,
+    }
@@ -0,0 +1,348 @@
+"""
+Async HTTP scoring service.
+
+    python -m src.service --port 8000
+
+    POST /score   {"LIMIT_BAL": 80000, "SEX": 1, ..., "PAY_AMT6": 5000}
+              ->  {"probability": 0.1056, "percent": 10.56, "risk_tier": "LOW RISK",
+                   "model_version": "3f9c0a1b2d4e"}
+              ->  400 {"error": "...", "reasons": ["LIMIT_NONPOSITIVE", ...]} on rows src.validate rejects
+    POST /score?explain=3
+              ->  {..., "drivers": [["NUM_LATE_MONTHS", -0.31], ...]}  (linear models)
+    GET  /health   batching, cache, model registry, shadow and drift status
+    GET  /drift    PSI / KS per feature against the training reference
+    GET  /metrics  per-stage latency quantiles and counters (with --metrics)
+
+The model comes from a src.registry.ModelRegistry. Every --reload-interval
+seconds it checks the model files (or --version-pointer). A changed pair is
+loaded in the background and validated on a holdout sample, then it
+replaces the serving version without a restart. Concurrent requests are
+queued and scored together: the batcher waits up to `max_delay` seconds
+after the first request, then scores everything queued (up to `max_batch`
+rows) in a single vectorized call. A batch is scored by the version that
+was current when it started, and that version is reported in each response.
+
+Repeated rows are answered from a ResultCache (see src.cache) keyed on the
+row and the model version, so warm entries survive a reload and entries
+from the previous version are never returned.
+
+With --challenger-model, every batch is also shadow scored by a challenger
+(see src.shadow). The raw rows are encoded once and the champion is scored
+from that matrix; only the champion's probabilities are returned. The
+challenger's probabilities and the deltas are appended to --shadow-log by a
+background writer, so no request waits on the challenger or on disk.
+
+With a drift reference (models/drift_reference.npz, see src.drift), every
+scored batch also feeds a DriftMonitor, and so does every request answered
+from the cache. Its constant-size histogram state
+is saved to --drift-state every --drift-save-interval seconds and resumed
+on restart.
+
+With --metrics, scoring stages are timed through src.metrics, /metrics
+serves them as Prometheus text and a JSON summary is logged every
+--metrics-log-interval seconds.
+
+make_app() builds the tornado Application without binding a port, so it can
+be exercised in-process with tornado.testing.AsyncHTTPTestCase.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import sys
+
+import numpy as np
+import tornado.ioloop
+import tornado.web
+
+sys.path.append(os.getcwd())
+
+from src.cache import ResultCache, row_key
+from src.features import RAW_COLUMNS
+from src.metrics import METRICS
+from src.predict import risk_tier
+from src.preprocess import PREPROCESSOR_PATH, SCALER_PATH
+from src.registry import ModelRegistry, load_holdout, make_version, version_id, RELOAD_INTERVAL
+from src.drift import DriftMonitor, DriftReference, DRIFT_REFERENCE_PATH, DRIFT_STATE_PATH
+from src.shadow import ShadowScorer, SHADOW_LOG_PATH
+from src.validate import reason_message, reason_names, rejected_by, row_reasons, validate, REJECT
+
+MODEL_PATH="models/best_model.pkl"
+
+
+class MicroBatcher:
+    """Batches submitted rows; each resolves to (probability, ModelVersion that scored it)."""
+
+    def __init__(self,registry,max_batch=256,max_delay=0.002,shadow=None,drift=None):
+        self.registry=registry
+        self.shadow=shadow
+        self.drift=drift
+        self.max_batch=max_batch
+        self.max_delay=max_delay
+        self.batches=0
+        self.rows=0
+        self._queue=None
+        self._worker=None
+
+    def start(self):
+        if self._worker is None:
+            self._queue=asyncio.Queue()
+            self._worker=asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker=None
+
+    async def submit(self,values) -> tuple:
+        self.start()
+        fut=asyncio.get_running_loop().create_future()
+        await self._queue.put((values,fut))
+        return await fut
+
+    async def _run(self):
+        while True:
+            batch=[await self._queue.get()]
+            if self._queue.empty() and self.max_delay>0:
+                await asyncio.sleep(self.max_delay)
+            while len(batch)<self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            futures=[f for _,f in batch]
+            METRICS.incr("batches")
+            version=self.registry.current
+            try:
+                # Rows normally arrive checked by ScoreHandler; submit() callers may skip it
+                checked=validate(np.array([v for v,_ in batch],dtype=np.float64))
+                block=checked.block[checked.ok]
+                probs=np.full(len(batch),np.nan)
+                if len(block):
+                    with METRICS.span("service.batch"):
+                        if self.shadow is not None and version.model is not None:
+                            probs[checked.ok]=self.shadow.score(version,block)
+                        else:
+                            probs[checked.ok]=version.score_fn(block)
+                    if self.drift is not None:
+                        self.drift.observe(block,probs[checked.ok])
+            except Exception as e:
+                for f in futures:
+                    if not f.done():
+                        f.set_exception(e)
+                continue
+            self.batches+=1
+            self.rows+=len(block)
+            for i,(f,p) in enumerate(zip(futures,probs)):
+                if f.done():
+                    continue
+                if checked.ok[i]:
+                    f.set_result((float(p),version))
+                else:
+                    f.set_exception(ValueError(checked.message(i)))
+
+
+def parse_row(payload) -> list:
+    """RAW_COLUMNS-ordered numeric values from a JSON object; ValueError on bad input."""
+    if not isinstance(payload,dict):
+        raise ValueError("expected a JSON object")
+    missing=[c for c in RAW_COLUMNS if c not in payload]
+    if missing:
+        raise ValueError(f"missing fields: {', '.join(missing)}")
+    values=[]
+    for c in RAW_COLUMNS:
+        v=payload[c]
+        if isinstance(v,bool) or not isinstance(v,(int,float)) or not math.isfinite(v):
+            raise ValueError(f"{c} must be a finite number")
+        values.append(float(v))
+    return values
+
+
+class ScoreHandler(tornado.web.RequestHandler):
+    def initialize(self,batcher,cache,registry):
+        self.batcher=batcher
+        self.cache=cache
+        self.registry=registry
+
+    async def post(self):
+        try:
+            values=parse_row(json.loads(self.request.body or b"null"))
+            explain=self.get_query_argument("explain","0")
+            if not explain.isdigit():
+                raise ValueError("explain must be a non-negative integer")
+            explain=int(explain)
+        except ValueError as e:
+            self.set_status(400)
+            self.finish({"error":str(e)})
+            return
+        code=row_reasons(values)
+        if rejected_by(code):
+            self.set_status(400)
+            self.finish({"error":reason_message(code),"reasons":reason_names(code&REJECT)})
+            return
+        key=row_key(values)
+        version=self.registry.current
+        prob=self.cache.get((version.version,key))
+        if prob is None:
+            METRICS.incr("cache_misses")
+            try:
+                with METRICS.span("service.queue_and_score"):
+                    prob,version=await self.batcher.submit(values)
+            except ValueError as e:
+                self.set_status(400)
+                self.finish({"error":str(e)})
+                return
+            self.cache.set((version.version,key),prob)
+        else:
+            METRICS.incr("cache_hits")
+            # Cached answers are still live traffic; without them repeated rows would be under-counted
+            if self.batcher.drift is not None:
+                self.batcher.drift.observe(values,prob)
+        body={"probability":prob,"percent":prob*100,"risk_tier":risk_tier(prob),"model_version":version.version}
+        if explain>0 and version.explain_row is not None:
+            with METRICS.span("service.explain"):
+                body["drivers"]=version.explain_row(values,k=explain)
+        self.finish(body)
+
+
+class HealthHandler(tornado.web.RequestHandler):
+    def initialize(self,batcher,cache,registry):
+        self.batcher=batcher
+        self.cache=cache
+        self.registry=registry
+
+    def get(self):
+        b=self.batcher
+        self.finish({
+            "status":"ok",
+            "batches":b.batches,
+            "rows":b.rows,
+            "avg_batch_size":b.rows/b.batches if b.batches else 0.0,
+            "cache":self.cache.stats(),
+            "model":self.registry.status(),
+            "shadow":b.shadow.stats() if b.shadow is not None else None,
+            "drift":b.drift.summary() if b.drift is not None else None,
+        })
+
+
+class DriftHandler(tornado.web.RequestHandler):
+    def initialize(self,batcher,cache,registry):
+        self.drift=batcher.drift
+
+    def get(self):
+        if self.drift is None:
+            self.set_status(404)
+            self.finish({"error":"drift monitoring is not configured"})
+            return
+        self.finish(self.drift.report())
+
+
+class MetricsHandler(tornado.web.RequestHandler):
+    def get(self):
+        self.set_header("Content-Type","text/plain; version=0.0.4")
+        self.finish(METRICS.render())
+
+
+def make_app(model=None,preprocessor=None,max_batch=256,max_delay=0.002,cache_size=4096,cache_ttl=None,
+             registry=None,shadow=None,drift=None):
+    """
+    With `model` and `preprocessor` the app serves that pair and never
+    reloads. Otherwise it serves `registry`, or a new ModelRegistry over the
+    default model files; the caller starts its polling. `shadow` is an
+    optional src.shadow.ShadowScorer for the challenger and `drift` an
+    optional src.drift.DriftMonitor fed with every scored batch.
+    """
+    if registry is None:
+        initial=make_version(model,preprocessor) if model is not None and preprocessor is not None else None
+        registry=ModelRegistry(MODEL_PATH,PREPROCESSOR_PATH,SCALER_PATH,holdout=load_holdout,initial=initial)
+    batcher=MicroBatcher(registry,max_batch,max_delay,shadow,drift)
+    cache=ResultCache(cache_size,cache_ttl)
+    handler_args={"batcher":batcher,"cache":cache,"registry":registry}
+    app=tornado.web.Application([
+        (r"/score",ScoreHandler,handler_args),
+        (r"/health",HealthHandler,handler_args),
+        (r"/drift",DriftHandler,handler_args),
+        (r"/metrics",MetricsHandler),
+    ])
+    app.batcher=batcher
+    app.cache=cache
+    app.registry=registry
+    return app
+
+
+def load_shadow(model_path,preprocessor_path,scaler_path=SCALER_PATH,log_path=SHADOW_LOG_PATH):
+    """ShadowScorer for a challenger pair on disk, named by its content hash."""
+    from src.predict import load_model
+    from src.preprocess import load_preprocessor
+    paths=(model_path,preprocessor_path,scaler_path)
+    return ShadowScorer(load_model(model_path),load_preprocessor(preprocessor_path,scaler_path),
+                        log_path,version=version_id(paths))
+
+
+async def serve(port,metrics_log_interval=None,reload_interval=RELOAD_INTERVAL,version_pointer=None,
+                challenger=None,drift_reference=DRIFT_REFERENCE_PATH,drift_state=DRIFT_STATE_PATH,
+                drift_save_interval=60.0,**kwargs):
+    registry=ModelRegistry(MODEL_PATH,PREPROCESSOR_PATH,SCALER_PATH,pointer_path=version_pointer,holdout=load_holdout)
+    registry.start(reload_interval)
+    shadow=load_shadow(*challenger) if challenger else None
+    drift=None
+    if drift_reference and os.path.exists(drift_reference):
+        drift=DriftMonitor(DriftReference.load(drift_reference),drift_state)
+        if drift_state and drift_save_interval:
+            tornado.ioloop.PeriodicCallback(drift.save,drift_save_interval*1000).start()
+    app=make_app(registry=registry,shadow=shadow,drift=drift,**kwargs)
+    app.listen(port)
+    if METRICS.enabled and metrics_log_interval:
+        tornado.ioloop.PeriodicCallback(lambda: METRICS.log_line(source="service"),metrics_log_interval*1000).start()
+    print(f"Scoring service listening on :{port} (model {registry.current.version})")
+    if shadow is not None:
+        print(f"Shadow scoring challenger {shadow.version} -> {shadow.log.path}")
+    if drift is not None:
+        resumed=f"{drift.rows:,} rows resumed from {drift_state}" if drift_state else "state not saved"
+        print(f"Drift monitoring against {drift_reference} ({resumed})")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        if shadow is not None:
+            # Drain the writer so challenger lines still queued are not lost with the daemon thread
+            shadow.close()
+        if drift is not None and drift_state:
+            drift.save()
+
+
+def main(argv=None):
+    parser=argparse.ArgumentParser(description="Credit risk HTTP scoring service.")
+    parser.add_argument("--port",type=int,default=8000)
+    parser.add_argument("--max-batch",type=int,default=256)
+    parser.add_argument("--max-delay-ms",type=float,default=2.0)
+    parser.add_argument("--cache-size",type=int,default=4096)
+    parser.add_argument("--cache-ttl",type=float,default=None,help="seconds; default keeps entries until evicted")
+    parser.add_argument("--metrics",action="store_true",help="time scoring stages (also CREDIT_RISK_METRICS=1)")
+    parser.add_argument("--metrics-log-interval",type=float,default=60.0,help="seconds between JSON metrics log lines")
+    parser.add_argument("--reload-interval",type=float,default=RELOAD_INTERVAL,help="seconds between model file checks; 0 disables")
+    parser.add_argument("--version-pointer",default=None,help="JSON file naming the model version and its artifact paths")
+    parser.add_argument("--challenger-model",default=None,help="shadow score every batch with this model too")
+    parser.add_argument("--challenger-preprocessor",default=PREPROCESSOR_PATH)
+    parser.add_argument("--shadow-log",default=SHADOW_LOG_PATH,help="append-only JSONL of challenger scores and deltas")
+    parser.add_argument("--drift-reference",default=DRIFT_REFERENCE_PATH,help="src.drift reference; monitoring is off if missing")
+    parser.add_argument("--drift-state",default=DRIFT_STATE_PATH,help="where the drift histograms are saved and resumed; empty keeps them in memory only")
+    parser.add_argument("--drift-save-interval",type=float,default=60.0,help="seconds between drift state saves")
+    args=parser.parse_args(argv)
+    if args.metrics:
+        METRICS.enable()
+    logging.basicConfig(level=logging.INFO,format="%(message)s")
+    challenger=None
+    if args.challenger_model:
+        challenger=(args.challenger_model,args.challenger_preprocessor,SCALER_PATH,args.shadow_log)
+    asyncio.run(serve(args.port,args.metrics_log_interval,args.reload_interval,args.version_pointer,challenger,
+                      args.drift_reference,args.drift_state,args.drift_save_interval,
+                      max_batch=args.max_batch,max_delay=args.max_delay_ms/1000,
+                      cache_size=args.cache_size,cache_ttl=args.cache_ttl))
+
+
+if __name__=="__main__":
+    main()
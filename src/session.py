@@ -0,0 +1,170 @@
+"""
+Incremental rescoring for interactive what-if edits.
+
+    session = SessionScorer(compile_scorer(model, preprocessor))
+    session.score_row(row)                  # full computation, remembered
+    session.update({"BILL_AMT3": 12000})    # only BILL_AMT3's features change
+    session.score_row(edited_row)           # diffs against the last row
+
+The model is linear, so the logit is bias + sum_i w_i * x_i over the
+unscaled feature vector x. An edit to one raw field changes only its own
+slot and the engineered features derived from its group:
+
+    LIMIT_BAL           CREDIT_UTILITY
+    PAY_0..PAY_6        AVG_PAY_DELAY, MAX_PAY_DELAY, NUM_LATE_MONTHS, SEVERE_DELAY_FLAG
+    BILL_AMT1..6        AVG_BILL_AMT, CREDIT_UTILITY, PAYMENT_TO_BILL
+    PAY_AMT1..6         AVG_PAY_AMT, PAYMENT_STD, PAYMENT_TO_BILL
+    SEX/EDUCATION/...   their one-hot slots
+
+Those groups are recomputed with the same src.features helpers that
+engineer_row uses, and the logit moves by w_i * (new - old) for each
+changed slot. Every `resync_every` updates the logit is re-summed from
+scratch so floating-point drift cannot build up. Works with CompiledScorer
+and src.lite.LiteScorer; only the standard library is needed.
+"""
+import math
+
+from src.features import (
+    RAW_COLUMNS, ENGINEERED_COLUMNS,
+    bill_features, pay_features, delay_features, ratio_features,
+)
+
+LIMIT,DELAYS,BILLS,PAYS=0,slice(5,11),slice(11,17),slice(17,23)
+_INDEX={c:j for j,c in enumerate(RAW_COLUMNS)}
+
+
+def _sigmoid(z):
+    if z>=0:
+        return 1.0/(1.0+math.exp(-z))
+    e=math.exp(z)
+    return e/(1.0+e)
+
+
+class SessionScorer:
+    def __init__(self,scorer,resync_every=256):
+        self.source=scorer
+        self.weights=[float(w) for w in scorer.weights]
+        self.bias=float(scorer.bias)
+        self.resync_every=resync_every
+        self._raw_slot=dict(scorer.raw_slots)
+        self._onehot=dict(scorer.onehot_slots)
+        self._onehot_columns=scorer.onehot_columns
+        # Model slot per engineered feature, None when the model does not use it
+        eng={ENGINEERED_COLUMNS[j]:i for j,i in scorer.eng_slots}
+        self._avg_bill,self._utility=eng.get("AVG_BILL_AMT"),eng.get("CREDIT_UTILITY")
+        self._avg_pay,self._pay_std=eng.get("AVG_PAY_AMT"),eng.get("PAYMENT_STD")
+        self._pay_to_bill=eng.get("PAYMENT_TO_BILL")
+        self._avg_delay,self._max_delay=eng.get("AVG_PAY_DELAY"),eng.get("MAX_PAY_DELAY")
+        self._late,self._severe=eng.get("NUM_LATE_MONTHS"),eng.get("SEVERE_DELAY_FLAG")
+        self.values=None
+        self.x=None
+        self.logit=None
+        self.updates=0
+        self.full_computations=0
+
+    @property
+    def probability(self) -> float:
+        return _sigmoid(self.logit)
+
+    def _set(self,i,value):
+        if i is None:
+            return
+        old=self.x[i]
+        if value!=old:
+            self.x[i]=value
+            self.logit+=self.weights[i]*(value-old)
+
+    def _resum(self):
+        self.logit=self.bias+math.fsum(w*v for w,v in zip(self.weights,self.x))
+        self.updates=0
+
+    def reset(self,values) -> float:
+        """Full computation for a RAW_COLUMNS-ordered row (or dict); returns the probability."""
+        values=[values[c] for c in RAW_COLUMNS] if isinstance(values,dict) else list(values)
+        self.values=values
+        self.x=[0.0]*len(self.weights)
+        self.logit=0.0
+        for j,i in self._raw_slot.items():
+            self.x[i]=float(values[j])
+        for j in self._onehot_columns:
+            i=self._onehot.get((j,int(values[j])))
+            if i is not None:
+                self.x[i]=1.0
+        self._bill_group=bill_features(values[BILLS])
+        self._pay_group=pay_features(values[PAYS])
+        self._write_delays()
+        self._write_bill_pay()
+        self._resum()
+        self.full_computations+=1
+        return self.probability
+
+    def _write_delays(self):
+        avg_delay,max_delay,late,severe=delay_features(self.values[DELAYS])
+        self._set(self._avg_delay,avg_delay)
+        self._set(self._max_delay,max_delay)
+        self._set(self._late,late)
+        self._set(self._severe,severe)
+
+    def _write_bill_pay(self):
+        avg_bill=self._bill_group
+        avg_pay,pay_std=self._pay_group
+        utility,pay_to_bill=ratio_features(self.values[LIMIT],avg_bill,avg_pay)
+        self._set(self._avg_bill,avg_bill)
+        self._set(self._avg_pay,avg_pay)
+        self._set(self._pay_std,pay_std)
+        self._set(self._utility,utility)
+        self._set(self._pay_to_bill,pay_to_bill)
+
+    def _apply(self,changes) -> float:
+        # changes: [(RAW_COLUMNS index, new value)] for fields that differ from self.values
+        delays=bills=pays=ratios=False
+        for j,new in changes:
+            old=self.values[j]
+            self.values[j]=new
+            i=self._raw_slot.get(j)
+            if i is not None:
+                self._set(i,float(new))
+            if j==LIMIT:
+                ratios=True
+            elif j in self._onehot_columns:
+                self._set(self._onehot.get((j,int(old))),0.0)
+                self._set(self._onehot.get((j,int(new))),1.0)
+            elif j<5:
+                pass
+            elif j<11:
+                delays=True
+            elif j<17:
+                bills=True
+            else:
+                pays=True
+
+        if delays:
+            self._write_delays()
+        if bills:
+            self._bill_group=bill_features(self.values[BILLS])
+        if pays:
+            self._pay_group=pay_features(self.values[PAYS])
+        if bills or pays or ratios:
+            self._write_bill_pay()
+
+        self.updates+=1
+        if self.updates>=self.resync_every:
+            self._resum()
+        return self.probability
+
+    def update(self,changes:dict) -> float:
+        """Apply {column: new value} edits to the remembered row; returns the new probability."""
+        if self.values is None:
+            raise ValueError("call reset() or score_row() before update()")
+        return self._apply([(_INDEX[c],v) for c,v in changes.items() if v!=self.values[_INDEX[c]]])
+
+    def score_row(self,row) -> float:
+        """Probability for `row`, updated incrementally from the previous row when that is cheaper."""
+        values=[row[c] for c in RAW_COLUMNS] if isinstance(row,dict) else list(row)
+        if self.values is None:
+            return self.reset(values)
+        changes=[(j,v) for j,(v,old) in enumerate(zip(values,self.values)) if v!=old]
+        # Past half the fields an incremental update does no less work than a reset
+        if len(changes)>len(RAW_COLUMNS)//2:
+            return self.reset(values)
+        return self._apply(changes)
@@ -0,0 +1,198 @@
+"""
+Champion / challenger shadow scoring.
+
+    shadow = ShadowScorer(challenger_model, challenger_preprocessor, "logs/shadow.jsonl")
+    probs = shadow.score(champion, block)     # champion: a src.registry.ModelVersion
+    shadow.stats()
+    shadow.close()
+
+score() encodes the raw block once with the champion's preprocessor,
+scores the champion from that matrix and returns only the champion's
+probabilities, exactly what champion.score_fn(block) would give. The same
+unscaled matrix, the champion's probabilities and a timestamp are then
+handed to a ShadowLog queue. Its background thread scores the challenger, using
+its own scaler or folded weights. When the challenger's feature layout
+differs it encodes the raw block itself. The thread then appends one JSON
+line per row:
+
+    {"ts": 1760700000.1, "champion": "2edc6164d741", "challenger": "7149112cf76a",
+     "p_champion": 0.1056, "p_challenger": 0.1035, "delta": -0.0021}
+
+On the request path that costs one queue put. When the writer falls behind
+and the queue is full, the batch is dropped and counted rather than making
+the request wait. stats() keeps running agreement numbers: mean and mean
+absolute delta, and how many rows the two models put in different risk
+tiers.
+"""
+import json
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+from src.fastpath import compile_scorer
+from src.metrics import METRICS
+from src.predict import LOW_RISK_MAX, MEDIUM_RISK_MAX
+from src.preprocess import as_preprocessor, raw_block
+
+SHADOW_LOG_PATH="logs/shadow.jsonl"
+SHADOW_QUEUE_SIZE=1024
+# Seconds close() waits for the writer before giving up on queued batches
+SHADOW_CLOSE_TIMEOUT=10.0
+THRESHOLDS=(LOW_RISK_MAX,MEDIUM_RISK_MAX)
+
+
+class _Scorer:
+    # Probabilities for one model from an unscaled feature matrix
+    def __init__(self,model,preprocessor):
+        self.model=model
+        self.preprocessor=as_preprocessor(preprocessor)
+        self.feature_names=list(self.preprocessor.feature_names_)
+        self.compiled=compile_scorer(model,self.preprocessor)
+
+    def score_features(self,X) -> np.ndarray:
+        if self.compiled is not None:
+            return self.compiled.score_features(X)
+        return self.model.predict_proba(self.preprocessor.scale(X.copy()))[:,1]
+
+
+class ShadowLog:
+    """Append-only JSON-lines log fed through a bounded queue and one writer thread."""
+
+    def __init__(self,handler,path=SHADOW_LOG_PATH,max_queue=SHADOW_QUEUE_SIZE):
+        """
+        handler turns one queued item into (text to append, rows it holds);
+        it runs on the writer thread.
+        """
+        os.makedirs(os.path.dirname(path) or ".",exist_ok=True)
+        self.path=path
+        self.written=0
+        self.dropped=0
+        # Counters are updated from request threads and the writer
+        self._lock=threading.Lock()
+        self._queue=queue.Queue(maxsize=max_queue)
+        self._handler=handler
+        self._thread=threading.Thread(target=self._run,name="shadow-log",daemon=True)
+        self._thread.start()
+
+    def submit(self,item) -> bool:
+        """Queue one batch without blocking; False (and counted) when the writer is behind."""
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            self._drop()
+            return False
+
+    def _drop(self,batches=1):
+        with self._lock:
+            self.dropped+=batches
+
+    def _run(self):
+        with open(self.path,"a",encoding="utf-8") as f:
+            while True:
+                item=self._queue.get()
+                if item is None:
+                    break
+                try:
+                    lines,rows=self._handler(item)
+                    f.write(lines)
+                    f.flush()
+                except Exception:
+                    self._drop()
+                    continue
+                with self._lock:
+                    self.written+=rows
+
+    def close(self,timeout=SHADOW_CLOSE_TIMEOUT):
+        """
+        Let the writer finish what is queued, then stop it. When the queue
+        is still full after `timeout` seconds, the queued batches are
+        discarded (and counted as dropped) so shutdown never hangs.
+        """
+        try:
+            self._queue.put(None,timeout=timeout)
+        except queue.Full:
+            discarded=0
+            while True:
+                try:
+                    self._queue.get_nowait()
+                    discarded+=1
+                except queue.Empty:
+                    break
+            self._drop(discarded)
+            self._queue.put_nowait(None)
+        self._thread.join(timeout)
+
+
+class ShadowScorer:
+    def __init__(self,model,preprocessor,log_path=SHADOW_LOG_PATH,version="challenger",max_queue=SHADOW_QUEUE_SIZE):
+        self.challenger=_Scorer(model,preprocessor)
+        self.version=version
+        self._champions={}
+        self._lock=threading.Lock()
+        self.rows=0
+        self.tier_disagreements=0
+        self.delta_sum=0.0
+        self.abs_delta_sum=0.0
+        self.log=ShadowLog(self._write,log_path,max_queue)
+
+    def _champion(self,champion):
+        # _Scorer for the champion pair, rebuilt when the registry swaps versions
+        scorer=self._champions.get(champion.version)
+        if scorer is None:
+            scorer=_Scorer(champion.model,champion.preprocessor)
+            self._champions={champion.version:scorer}
+        return scorer
+
+    def score(self,champion,block) -> np.ndarray:
+        """The champion's probabilities for a (n, 23) raw block; the challenger is scored off the request path."""
+        if champion.model is None:
+            raise ValueError("shadow scoring needs a champion loaded from its pickles or bundle")
+        block=raw_block(block)
+        scorer=self._champion(champion)
+        with METRICS.span("shadow.champion"):
+            X=scorer.preprocessor.encode(block)
+            probs=scorer.score_features(X)
+        same_layout=scorer.feature_names==self.challenger.feature_names
+        self.log.submit((time.time(),champion.version,X if same_layout else None,
+                         None if same_layout else block,probs))
+        return probs
+
+    def _write(self,item) -> str:
+        ts,champion,X,block,probs=item
+        if X is None:
+            X=self.challenger.preprocessor.encode(block)
+        challenger=self.challenger.score_features(X)
+        delta=challenger-probs
+        disagree=int(np.count_nonzero(np.searchsorted(THRESHOLDS,probs,side="right")
+                                      !=np.searchsorted(THRESHOLDS,challenger,side="right")))
+        with self._lock:
+            self.rows+=len(probs)
+            self.tier_disagreements+=disagree
+            self.delta_sum+=float(delta.sum())
+            self.abs_delta_sum+=float(np.abs(delta).sum())
+        head=f'{{"ts":{ts:.3f},"champion":{json.dumps(champion)},"challenger":{json.dumps(self.version)}'
+        return "".join(
+            f'{head},"p_champion":{p:.6f},"p_challenger":{c:.6f},"delta":{d:.6f}}}\n'
+            for p,c,d in zip(probs.tolist(),challenger.tolist(),delta.tolist())
+        ),len(probs)
+
+    def stats(self) -> dict:
+        with self._lock:
+            n=self.rows
+            return {
+                "challenger":self.version,
+                "rows":n,
+                "mean_delta":self.delta_sum/n if n else 0.0,
+                "mean_abs_delta":self.abs_delta_sum/n if n else 0.0,
+                "tier_disagreements":self.tier_disagreements,
+                "logged":self.log.written,
+                "dropped":self.log.dropped,
+                "log":self.log.path,
+            }
+
+    def close(self):
+        self.log.close()
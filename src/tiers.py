@@ -0,0 +1,13 @@
+"""
+Risk tier thresholds shared by scoring, reports and monitoring.
+
+Kept free of third-party imports so the dashboard's report builder can
+use them without loading the model stack; src.predict re-exports them.
+"""
+
+# Dashboard risk tiers: < 30% low, < 60% medium, otherwise high
+LOW_RISK_MAX=0.30
+MEDIUM_RISK_MAX=0.60
+RISK_TIERS=("LOW RISK","MEDIUM RISK","HIGH RISK")
+# Tier of rows that fail src.validate and so have no probability
+REJECTED_TIER="REJECTED"
@@ -1,10 +1,30 @@
+import argparse
+import os
+import sys
+
 import pandas as pd
 import numpy as np
 import joblib
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.metrics import roc_auc_score
 
-def train(X_Train,X_Test,Y_Train,Y_Test,save_path:"../models/best_model.pkl"):
+sys.path.append(os.getcwd())
+
+from src.data import TARGET, iter_chunks, load_data
+from src.features import CATEGORICAL_COLUMNS
+from src.bundle import BUNDLE_PATH, write_bundle_if_linear
+from src.drift import DRIFT_REFERENCE_PATH, DriftReference, training_reference
+from src.evaluate import ChunkedEvaluator
+from src.predict import predict_batch
+from src.preprocess import CreditPreprocessor, preprocess, load_preprocessor, raw_block
+
+DATA_PATH="data/credit_card_default_dataset.csv"
+MODEL_PATH="models/best_model.pkl"
+SCALER_PATH="models/scaler.pkl"
+PREPROCESSOR_PATH="models/preprocessor.pkl"
+
+
+def train(X_Train,X_Test,Y_Train,Y_Test,save_path="../models/best_model.pkl"):
     model=LogisticRegression()
     model.fit(X_Train,Y_Train)
 
@@ -17,4 +37,110 @@ def train(X_Train,X_Test,Y_Train,Y_Test,save_path:"../models/best_model.pkl"):
     joblib.dump(model,save_path)
     print(f"Model Saved at: {save_path}")
 
-    return model 
\ No newline at end of file
+    return model
+
+
+def holdout_mask(ids:np.ndarray,test_size:float=0.2) -> np.ndarray:
+    # Deterministic per-ID split, so every pass over the file agrees on it
+    h=(np.asarray(ids,dtype=np.uint64)*np.uint64(0x9E3779B97F4A7C15))>>np.uint64(40)
+    return h<np.uint64(int(test_size*(1<<24)))
+
+
+def train_out_of_core(data_path=DATA_PATH,chunk_size=100_000,epochs=5,test_size=0.2,
+                      save_path=MODEL_PATH,scaler_path=SCALER_PATH,preprocessor_path=PREPROCESSOR_PATH,
+                      max_eval_rows=None,alpha=1e-3,random_state=42):
+    """
+    Train on a CSV that does not fit in memory.
+
+    Pass 1 collects the category vocabulary, pass 2 accumulates the scaler
+    statistics with CreditPreprocessor.partial_fit, then `epochs` passes fit
+    a logistic-loss SGDClassifier with partial_fit. Rows are split into
+    train/holdout by a hash of their ID. Writes the same model, scaler and
+    preprocessor files that src.predict.load_model and app.py load.
+    """
+    rng=np.random.default_rng(random_state)
+
+    vocab={c:set() for c in CATEGORICAL_COLUMNS}
+    for chunk in iter_chunks(data_path,chunk_size):
+        for c in CATEGORICAL_COLUMNS:
+            vocab[c].update(np.unique(chunk[c]).tolist())
+
+    pre=CreditPreprocessor(categories={c:sorted(v) for c,v in vocab.items()})
+    for chunk in iter_chunks(data_path,chunk_size):
+        train_rows=~holdout_mask(chunk["ID"].to_numpy(),test_size)
+        if train_rows.any():
+            pre.partial_fit(chunk[train_rows])
+
+    model=SGDClassifier(loss="log_loss",alpha=alpha,random_state=random_state)
+    classes=np.array([0,1])
+    for epoch in range(epochs):
+        for chunk in iter_chunks(data_path,chunk_size):
+            train_rows=~holdout_mask(chunk["ID"].to_numpy(),test_size)
+            if not train_rows.any():
+                continue
+            X=pre.transform(chunk[train_rows])
+            y=chunk.loc[train_rows,TARGET].to_numpy()
+            order=rng.permutation(len(y))
+            model.partial_fit(X[order],y[order],classes=classes)
+        print(f"Epoch {epoch+1}/{epochs} done")
+
+    # Holdout metrics in one bounded-memory pass (on at most max_eval_rows rows if set)
+    evaluator=ChunkedEvaluator(segments=())
+    for chunk in iter_chunks(data_path,chunk_size):
+        part=chunk[holdout_mask(chunk["ID"].to_numpy(),test_size)]
+        if max_eval_rows is not None:
+            part=part.iloc[:max_eval_rows-evaluator.overall.n]
+        if len(part):
+            evaluator.update(model.predict_proba(pre.transform(part))[:,1],part[TARGET].to_numpy())
+        if max_eval_rows is not None and evaluator.overall.n>=max_eval_rows:
+            break
+    roc,bound=evaluator.overall.auc()
+    if roc is not None:
+        print(f"Out-of-core SGD ROC-AUC (holdout, {evaluator.overall.n:,} rows): {roc:.4f} (+/- {bound:.1e})")
+
+    joblib.dump(model,save_path)
+    joblib.dump(pre,preprocessor_path)
+    joblib.dump(pre.scaler_,scaler_path)
+    print(f"Model Saved at: {save_path}")
+    return model,pre
+
+
+def out_of_core_reference(model,pre,data_path=DATA_PATH,chunk_size=100_000,test_size=0.2) -> DriftReference:
+    """src.drift reference over the out-of-core training rows, streamed like the fit."""
+    def blocks():
+        for chunk in iter_chunks(data_path,chunk_size):
+            yield raw_block(chunk[~holdout_mask(chunk["ID"].to_numpy(),test_size)])
+    return DriftReference.build_chunked(blocks(),lambda block: predict_batch(model,pre,block))
+
+
+def main(argv=None):
+    parser=argparse.ArgumentParser(description="Retrain the default-risk model.")
+    parser.add_argument("--data",default=DATA_PATH)
+    parser.add_argument("--out-of-core",action="store_true",help="stream the CSV in chunks instead of loading it")
+    parser.add_argument("--chunk-size",type=int,default=100_000)
+    parser.add_argument("--epochs",type=int,default=5)
+    parser.add_argument("--model",default=MODEL_PATH)
+    parser.add_argument("--scaler",default=SCALER_PATH)
+    parser.add_argument("--preprocessor",default=PREPROCESSOR_PATH)
+    parser.add_argument("--bundle",default=BUNDLE_PATH,help="memory-mappable single-file copy of a linear model")
+    parser.add_argument("--drift-reference",default=DRIFT_REFERENCE_PATH,
+                        help="training-set histograms for src.drift")
+    args=parser.parse_args(argv)
+
+    if args.out_of_core:
+        model,pre=train_out_of_core(args.data,args.chunk_size,args.epochs,save_path=args.model,
+                                    scaler_path=args.scaler,preprocessor_path=args.preprocessor)
+        reference=out_of_core_reference(model,pre,args.data,args.chunk_size)
+    else:
+        X_Train,X_Test,Y_Train,Y_Test=preprocess(load_data(args.data),args.scaler,args.preprocessor)
+        model=train(X_Train,X_Test,Y_Train,Y_Test,args.model)
+        pre=load_preprocessor(args.preprocessor,args.scaler)
+        reference=training_reference(model,pre,args.data)
+    reference.save(args.drift_reference)
+    write_bundle_if_linear(model,pre,args.bundle,sources=(args.model,args.preprocessor,args.scaler))
+
+
+if __name__=="__main__":
+    # Run via the package module so pickled classes resolve to src.*, not __main__
+    from src.train import main
+    main()
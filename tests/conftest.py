@@ -0,0 +1,48 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# The demo applicant from run_predict_directly.py (about 10.56% with the shipped model)
+APPLICANT = {
+    "LIMIT_BAL": 80000, "SEX": 1, "EDUCATION": 2, "MARRIAGE": 1, "AGE": 32,
+    "PAY_0": 0, "PAY_2": 0, "PAY_3": 0, "PAY_4": 0, "PAY_5": 0, "PAY_6": 0,
+    "BILL_AMT1": 10000, "BILL_AMT2": 9500, "BILL_AMT3": 8800,
+    "BILL_AMT4": 9200, "BILL_AMT5": 8500, "BILL_AMT6": 9000,
+    "PAY_AMT1": 5000, "PAY_AMT2": 4800, "PAY_AMT3": 4500,
+    "PAY_AMT4": 5200, "PAY_AMT5": 4700, "PAY_AMT6": 5000,
+}
+MODEL_PATHS = {name: os.path.join(ROOT, "models", f"{name}.pkl") for name in ("best_model", "preprocessor", "scaler")}
+DATA_PATH = os.path.join(ROOT, "data", "credit_card_default_dataset.csv")
+
+
+@pytest.fixture
+def row():
+    """A fresh copy of the demo applicant, RAW_COLUMNS order."""
+    return dict(APPLICANT)
+
+
+@pytest.fixture(scope="session")
+def model_paths():
+    return dict(MODEL_PATHS)
+
+
+@pytest.fixture(scope="session")
+def model():
+    from src.predict import load_model
+    return load_model(MODEL_PATHS["best_model"])
+
+
+@pytest.fixture(scope="session")
+def preprocessor():
+    from src.preprocess import load_preprocessor
+    return load_preprocessor(MODEL_PATHS["preprocessor"], MODEL_PATHS["scaler"])
+
+
+@pytest.fixture(scope="session")
+def dataset():
+    from src.data import load_data
+    return load_data(DATA_PATH)
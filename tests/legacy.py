@@ -0,0 +1,30 @@
+"""The pre-pipeline pandas serving path, kept as the reference the fast code is checked against."""
+import pandas as pd
+
+
+def legacy_add_feature(df):
+    # The original pandas add_feature (mutates df)
+    bill_cols = [f"BILL_AMT{i}" for i in range(1, 7)]
+    pay_cols = [f"PAY_AMT{i}" for i in range(1, 7)]
+    delay_cols = ["PAY_0", "PAY_2", "PAY_3", "PAY_4", "PAY_5", "PAY_6"]
+    df["AVG_BILL_AMT"] = df[bill_cols].mean(axis=1)
+    df["CREDIT_UTILITY"] = df["AVG_BILL_AMT"] / df["LIMIT_BAL"]
+    df["AVG_PAY_AMT"] = df[pay_cols].mean(axis=1)
+    df["AVG_PAY_DELAY"] = df[delay_cols].clip(lower=0).mean(axis=1)
+    df["PAYMENT_TO_BILL"] = (df["AVG_PAY_AMT"] / (df["AVG_BILL_AMT"] + 1)).fillna(0)
+    df["MAX_PAY_DELAY"] = df[delay_cols].clip(lower=0).max(axis=1)
+    df["NUM_LATE_MONTHS"] = (df[delay_cols] > 0).sum(axis=1)
+    df["PAYMENT_STD"] = df[pay_cols].std(axis=1)
+    df["SEVERE_DELAY_FLAG"] = (df["MAX_PAY_DELAY"] >= 3).astype(int)
+    return df
+
+
+def legacy_transform(df, scaler):
+    # add_feature + get_dummies + patching in the one-hot columns a frame happens to lack
+    expected_cols = list(scaler.feature_names_in_)
+    df = legacy_add_feature(df.copy())
+    df = pd.get_dummies(df, columns=["SEX", "EDUCATION", "MARRIAGE"], drop_first=False)
+    for c in expected_cols:
+        if c not in df.columns:
+            df[c] = 0
+    return scaler.transform(df[expected_cols])
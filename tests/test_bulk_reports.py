@@ -0,0 +1,68 @@
+import os
+import tarfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.bulk_reports import generate_reports
+from src.features import RAW_COLUMNS
+from src.portfolio import iter_portfolio
+
+
+@pytest.fixture(scope="module")
+def accounts(dataset):
+    df = dataset[RAW_COLUMNS].iloc[:120].reset_index(drop=True)
+    df.insert(0, "ID", np.arange(1001, 1121))
+    return df
+
+
+def members(out_dir):
+    found = {}
+    for name in sorted(os.listdir(out_dir)):
+        if name.endswith(".tar.gz"):
+            with tarfile.open(os.path.join(out_dir, name)) as archive:
+                found[name] = archive.getnames()
+    return found
+
+
+def test_shards_hold_one_report_per_valid_row(tmp_path, accounts, model, preprocessor):
+    bad = accounts.copy()
+    bad.loc[5, "LIMIT_BAL"] = 0
+    counts = generate_reports(bad, str(tmp_path), model, preprocessor, n_workers=1, shard_size=50)
+    assert counts == {"rows": 120, "reports": 119, "rejected": 1, "archives": 3}
+    shards = members(tmp_path)
+    assert [len(m) for m in shards.values()] == [50, 50, 19]
+    manifest = pd.read_csv(tmp_path / "manifest.csv", keep_default_na=False)
+    assert len(manifest) == 120
+    assert manifest.loc[5, "risk_tier"] == "REJECTED" and manifest.loc[5, "member"] == ""
+    kept = manifest.drop(index=5)
+    assert sorted(kept["member"]) == sorted(m for names in shards.values() for m in names)
+    with tarfile.open(tmp_path / kept.iloc[0]["archive"]) as archive:
+        html = archive.extractfile(kept.iloc[0]["member"]).read().decode()
+    assert "Account 1001" in html
+
+
+def test_duplicate_ids_get_distinct_members(tmp_path, accounts, model, preprocessor):
+    dup = accounts.copy()
+    dup.loc[[10, 70], "ID"] = 1001
+    generate_reports(dup, str(tmp_path), model, preprocessor, n_workers=1, shard_size=50)
+    names = [m for shard in members(tmp_path).values() for m in shard]
+    assert len(names) == len(set(names)) == 120
+    manifest = pd.read_csv(tmp_path / "manifest.csv")
+    assert list(manifest.loc[manifest["ID"] == 1001, "member"]) == ["1001.html", "1001_row10.html", "1001_row70.html"]
+
+
+def test_chunked_input_matches_one_frame(tmp_path, accounts, model, preprocessor):
+    dup = accounts.copy()
+    dup.loc[70, "ID"] = 1001
+    path = tmp_path / "accounts.csv"
+    dup.to_csv(path, index=False)
+    whole, chunked = tmp_path / "whole", tmp_path / "chunked"
+    generate_reports(dup, str(whole), model, preprocessor, n_workers=1, shard_size=25)
+    counts = generate_reports(iter_portfolio(str(path), 40), str(chunked), model, preprocessor,
+                              n_workers=1, shard_size=25)
+    assert counts["reports"] == 120
+    one, many = pd.read_csv(whole / "manifest.csv"), pd.read_csv(chunked / "manifest.csv")
+    assert list(one["member"]) == list(many["member"])
+    assert np.allclose(one["probability"], many["probability"], rtol=0, atol=1e-12)
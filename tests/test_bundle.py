@@ -0,0 +1,47 @@
+import os
+import shutil
+
+import pytest
+
+from src.bundle import is_bundle, load_bundle, write_bundle, write_bundle_if_linear
+from src.predict import load_model
+from src.preprocess import load_preprocessor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NAMES = ("best_model.pkl", "preprocessor.pkl", "scaler.pkl")
+
+
+@pytest.fixture
+def models(tmp_path):
+    for name in NAMES:
+        shutil.copy(os.path.join(ROOT, "models", name), tmp_path / name)
+    model = load_model(str(tmp_path / "best_model.pkl"))
+    preprocessor = load_preprocessor(str(tmp_path / "preprocessor.pkl"), str(tmp_path / "scaler.pkl"))
+    path = str(tmp_path / "model.crb")
+    write_bundle(model, preprocessor, path, sources=[str(tmp_path / name) for name in NAMES])
+    return tmp_path, model, preprocessor, path
+
+
+def test_bundle_rejects_changed_source_pickles(models):
+    folder, _, _, path = models
+    load_bundle(path)
+    with open(folder / "best_model.pkl", "ab") as f:
+        f.write(b"retrained")
+    with pytest.raises(ValueError, match="stale"):
+        load_bundle(path)
+    load_bundle(path, verify=False)
+
+
+def test_bundle_without_its_sources_still_loads(models):
+    folder, _, _, path = models
+    os.remove(folder / "best_model.pkl")
+    load_bundle(path)
+
+
+def test_non_linear_retrain_removes_the_old_bundle(models):
+    from sklearn.tree import DecisionTreeClassifier
+
+    _, _, preprocessor, path = models
+    assert is_bundle(path)
+    assert not write_bundle_if_linear(DecisionTreeClassifier(), preprocessor, path)
+    assert not os.path.exists(path)
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from src.cache import ResultCache, artifact_fingerprint, row_key
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_row_key_is_canonical(row):
+    same = dict(reversed(list(row.items())))
+    same["LIMIT_BAL"] = float(same["LIMIT_BAL"])
+    same["AGE"] = np.int64(same["AGE"])
+    assert row_key(same) == row_key(row)
+    assert row_key(dict(row, AGE=row["AGE"] + 1)) != row_key(row)
+    assert row_key([1, 2.0]) == row_key((1.0, 2))
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResultCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["size"] == 2
+    with pytest.raises(ValueError):
+        ResultCache(maxsize=0)
+
+
+def test_entries_expire_after_ttl():
+    clock = Clock()
+    cache = ResultCache(ttl=10, clock=clock)
+    cache.set("a", 1)
+    clock.now = 9.9
+    assert cache.get("a") == 1
+    clock.now = 10.0
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_get_or_compute_caches_falsy_values():
+    cache = ResultCache()
+    calls = []
+    compute = lambda: calls.append(1) or 0.0
+    assert cache.get_or_compute("k", compute) == 0.0
+    assert cache.get_or_compute("k", compute) == 0.0
+    assert len(calls) == 1
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+
+def test_replacing_an_artifact_drops_every_entry(tmp_path):
+    model = tmp_path / "model.pkl"
+    model.write_bytes(b"v1")
+    cache = ResultCache(artifact_paths=[model])
+    cache.set("a", 1)
+    before = artifact_fingerprint(model)
+    model.write_bytes(b"v2 is longer")
+    assert artifact_fingerprint(model) != before
+    assert cache.get("a") is None
+    assert cache.stats()["invalidations"] == 1
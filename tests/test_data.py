@@ -0,0 +1,14 @@
+import os
+
+from src.data import _HashIndex
+
+
+def test_hash_index_is_written_atomically_and_reused(tmp_path):
+    source = tmp_path / "accounts.csv"
+    source.write_text("ID,LIMIT_BAL\n1,20000\n")
+    cache = str(tmp_path / "cache")
+    digest = _HashIndex(cache).lookup(str(source))
+    assert os.listdir(cache) == ["index.json"]
+    assert _HashIndex(cache).entries[os.path.abspath(source)]["hash"] == digest
+    source.write_text("ID,LIMIT_BAL\n1,30000\n")
+    assert _HashIndex(cache).lookup(str(source)) != digest
@@ -0,0 +1,72 @@
+import os
+
+import numpy as np
+import pytest
+
+from src.drift import DriftMonitor, DriftReference
+from src.features import RAW_COLUMNS
+from src.predict import predict_batch
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def reference():
+    return DriftReference.load(os.path.join(ROOT, "models", "drift_reference.npz"))
+
+
+@pytest.fixture(scope="module")
+def traffic(dataset, model, preprocessor):
+    block = dataset[RAW_COLUMNS].to_numpy(dtype=np.float64)[:10_000]
+    return block, predict_batch(model, preprocessor, block)
+
+
+def test_save_needs_a_path(reference):
+    with pytest.raises(ValueError, match="state_path"):
+        DriftMonitor(reference).save()
+
+
+def test_state_resumes_from_disk(tmp_path, reference, traffic):
+    block, probs = traffic
+    state = str(tmp_path / "drift_state.npz")
+    monitor = DriftMonitor(reference, state, flush_rows=512)
+    monitor.observe(block[:1500], probs[:1500])
+    monitor.save()
+    resumed = DriftMonitor(reference, state)
+    assert resumed.rows == 1500
+    assert np.array_equal(resumed.counts, monitor.counts)
+
+
+def test_background_folds_match_one_synchronous_fold(reference, traffic):
+    block, probs = traffic
+    streamed = DriftMonitor(reference, flush_rows=256)
+    for start in range(0, len(block), 100):
+        streamed.observe(block[start:start + 100], probs[start:start + 100])
+    whole = DriftMonitor(reference, flush_rows=len(block))
+    whole.observe(block, probs)
+    assert streamed.report() == dict(whole.report(), since=streamed.since)
+    assert np.array_equal(streamed.counts, whole.counts)
+
+
+def test_a_full_buffer_is_folded_off_the_observing_thread(reference, traffic):
+    block, probs = traffic
+    monitor = DriftMonitor(reference, flush_rows=512)
+    monitor.observe(block[:512], probs[:512])
+    assert monitor._pending == 0
+    monitor._full.join()
+    assert monitor.rows == 512
+    assert monitor._folder.name == "drift-fold"
+
+
+def test_chunked_reference_matches_build(traffic, model, preprocessor):
+    block, probs = traffic
+    score = lambda part: predict_batch(model, preprocessor, part)
+    chunks = [block[i:i + 1000] for i in range(0, len(block), 1000)]
+    whole = DriftReference.build(block, probs)
+    streamed = DriftReference.build_chunked(iter(chunks), score, sample_rows=len(block) + 1)
+    assert streamed.id == whole.id and streamed.rows == whole.rows
+    assert all(np.array_equal(a, b) for a, b in zip(streamed.counts, whole.counts))
+    # Edges from the first 3,000 rows, counts over all 10,000
+    sampled = DriftReference.build_chunked(iter(chunks), score, sample_rows=3000)
+    assert sampled.id == DriftReference.build(block[:3000], probs[:3000]).id
+    assert all(c.sum() == len(block) for c in sampled.counts)
@@ -0,0 +1,81 @@
+import itertools
+
+import numpy as np
+import pytest
+from sklearn.metrics import brier_score_loss, confusion_matrix, log_loss, roc_auc_score
+
+from conftest import DATA_PATH
+from src.data import TARGET, iter_chunks
+from src.evaluate import BinaryAccumulator, ChunkedEvaluator, evaluate_csv, merge
+from src.predict import predict_batch
+
+
+def test_auc_matches_sklearn_within_bound():
+    rng = np.random.default_rng(0)
+    labels = rng.integers(0, 2, 50_000)
+    probs = np.clip(rng.normal(0.3 + 0.2 * labels, 0.15), 0, 1)
+    auc, bound = BinaryAccumulator().update(probs, labels).auc()
+    assert abs(auc - roc_auc_score(labels, probs)) <= bound + 1e-12
+
+
+def test_non_finite_probabilities_are_skipped():
+    acc = BinaryAccumulator().update([0.1, np.nan, 0.9, np.inf, -np.inf], [0, 1, 1, 0, 1])
+    assert acc.n == 2 and acc.skipped == 3
+    m = acc.metrics()
+    assert m["rows"] == 2 and m["skipped"] == 3 and m["roc_auc"] == 1.0
+
+
+def test_partials_merge_exactly():
+    rng = np.random.default_rng(1)
+    labels = rng.integers(0, 2, 10_000)
+    probs = rng.random(10_000)
+    rows = np.zeros((10_000, 23))
+    rows[:, 1] = rng.integers(1, 3, 10_000)
+    rows[:, 2] = rng.integers(1, 5, 10_000)
+    rows[:, 3] = rng.integers(1, 4, 10_000)
+    whole = ChunkedEvaluator().update(probs, labels, rows)
+    parts = [ChunkedEvaluator().update(probs[s:s + 3000], labels[s:s + 3000], rows[s:s + 3000])
+             for s in range(0, 10_000, 3000)]
+    merged = merge(parts)
+    assert merged.by_segment.keys() == whole.by_segment.keys()
+    for a, b in [(merged.overall, whole.overall)] + [(merged.by_segment[k], whole.by_segment[k]) for k in whole.by_segment]:
+        # Counts add exactly; float sums only up to summation order
+        assert np.array_equal(a.counts, b.counts) and np.array_equal(a.confusion, b.confusion)
+        assert np.allclose(a.prob_sum, b.prob_sum, rtol=1e-12, atol=1e-12)
+        assert np.isclose(a.brier_sum, b.brier_sum, rtol=1e-12) and np.isclose(a.log_loss_sum, b.log_loss_sum, rtol=1e-12)
+
+
+@pytest.fixture(scope="module")
+def labelled_csv(tmp_path_factory):
+    # Dataset layout, 3000 accounts, the first one with an invalid LIMIT_BAL
+    with open(DATA_PATH) as f:
+        lines = list(itertools.islice(f, 3002))
+    fields = lines[2].split(",")
+    fields[1] = "0"
+    lines[2] = ",".join(fields)
+    path = tmp_path_factory.mktemp("eval") / "accounts.csv"
+    path.write_text("".join(lines))
+    return str(path)
+
+
+def test_csv_evaluation_matches_in_memory_metrics(labelled_csv, model, preprocessor, model_paths):
+    paths = dict(model_path=model_paths["best_model"], preprocessor_path=model_paths["preprocessor"],
+                 scaler_path=model_paths["scaler"])
+    report = evaluate_csv(labelled_csv, chunk_size=700, **paths).report()
+    parallel = evaluate_csv(labelled_csv, n_workers=2, chunk_size=700, **paths).report()
+    assert parallel["overall"]["thresholds"] == report["overall"]["thresholds"]
+    assert parallel["overall"]["roc_auc"] == pytest.approx(report["overall"]["roc_auc"], abs=1e-12)
+
+    chunk = next(iter_chunks(labelled_csv, 5000)).iloc[1:]
+    probs = predict_batch(model, preprocessor, chunk)
+    labels = chunk[TARGET].to_numpy()
+    o = report["overall"]
+    assert report["rejected"] == 1 and o["rows"] == 2999
+    assert abs(o["roc_auc"] - roc_auc_score(labels, probs)) <= o["auc_error_bound"] + 1e-12
+    assert o["brier"] == pytest.approx(brier_score_loss(labels, probs), rel=1e-9)
+    assert o["log_loss"] == pytest.approx(log_loss(labels, probs), rel=1e-9)
+    for t, m in o["thresholds"].items():
+        (tn, fp), (fn, tp) = confusion_matrix(labels, probs >= float(t), labels=[0, 1])
+        assert (m["tn"], m["fp"], m["fn"], m["tp"]) == (tn, fp, fn, tp)
+    sex = chunk["SEX"].to_numpy()
+    assert {v: s["rows"] for v, s in report["segments"]["SEX"].items()} == {v: int((sex == v).sum()) for v in (1, 2)}
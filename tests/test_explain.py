@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from scipy.special import logit
+from sklearn.tree import DecisionTreeClassifier
+
+from src.explain import LinearExplainer, make_explainer
+from src.features import RAW_COLUMNS
+
+
+@pytest.fixture(scope="module")
+def block(dataset):
+    return dataset[RAW_COLUMNS].iloc[:2000].to_numpy(dtype=np.float64)
+
+
+@pytest.fixture(scope="module")
+def explainer(model, preprocessor):
+    return LinearExplainer(model, preprocessor)
+
+
+def test_contributions_are_the_scaled_terms_of_the_logit(block, explainer, model, preprocessor):
+    flat = LinearExplainer(model, preprocessor, group_categories=False)
+    phi = flat.contributions(block)
+    assert np.allclose(phi, preprocessor.transform(block) * np.ravel(model.coef_), rtol=0, atol=1e-9)
+    # Local accuracy: contributions plus the expected value give the model's logit
+    grouped = explainer.contributions(block)
+    expected = logit(model.predict_proba(preprocessor.transform(block))[:, 1])
+    assert np.allclose(grouped.sum(axis=1) + explainer.expected_value, expected, rtol=0, atol=1e-9)
+    assert np.allclose(grouped.sum(axis=1), phi.sum(axis=1), rtol=0, atol=1e-9)
+    assert {"SEX", "EDUCATION", "MARRIAGE"} <= set(explainer.names)
+    assert not any(name.startswith("SEX_") for name in explainer.names)
+
+
+def test_top_k_matches_row_explanations_at_any_chunk_size(block, explainer):
+    idx, val = explainer.top_k(block, k=3, chunk_size=300)
+    whole_idx, whole_val = explainer.top_k(block, k=3)
+    assert np.array_equal(idx, whole_idx) and np.array_equal(val, whole_val)
+    for i in range(0, len(block), 97):
+        expected = explainer.explain_row(list(block[i]), k=3)
+        assert list(explainer.top_k_names(idx[i])) == [name for name, _ in expected]
+        assert np.allclose(val[i], [v for _, v in expected], rtol=0, atol=1e-9)
+    # k larger than the number of features returns them all
+    all_idx, _ = explainer.top_k(block[:5], k=100)
+    assert all_idx.shape == (5, len(explainer.names))
+
+
+def test_non_linear_model_has_no_explainer(preprocessor):
+    assert make_explainer(DecisionTreeClassifier(), preprocessor) is None
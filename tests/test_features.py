@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from legacy import legacy_add_feature
+from src.features import (
+    RAW_COLUMNS, ENGINEERED_COLUMNS, add_feature, engineer_block, engineer_row, feature_slots, onehot_columns,
+)
+
+
+@pytest.fixture(scope="module")
+def frame():
+    # Dataset-like value ranges, plus the division edge cases: zero limits and
+    # an average bill of exactly -1 with and without payments
+    rng = np.random.default_rng(0)
+    n = 20_000
+    cols = {
+        "LIMIT_BAL": rng.integers(1, 100, n) * 10_000,
+        "SEX": rng.integers(1, 3, n),
+        "EDUCATION": rng.integers(0, 7, n),
+        "MARRIAGE": rng.integers(0, 4, n),
+        "AGE": rng.integers(21, 80, n),
+    }
+    for c in ("PAY_0", "PAY_2", "PAY_3", "PAY_4", "PAY_5", "PAY_6"):
+        cols[c] = rng.integers(-2, 9, n)
+    for i in range(1, 7):
+        cols[f"BILL_AMT{i}"] = rng.integers(-20_000, 500_000, n)
+        cols[f"PAY_AMT{i}"] = rng.integers(0, 200_000, n)
+    df = pd.DataFrame(cols)[RAW_COLUMNS]
+    df.loc[:9, "LIMIT_BAL"] = 0
+    bills = [f"BILL_AMT{i}" for i in range(1, 7)]
+    df.loc[10:19, bills] = -1
+    df.loc[10:14, [f"PAY_AMT{i}" for i in range(1, 7)]] = 0
+    return df
+
+
+@pytest.mark.parametrize("dtype,tol", [("float64", 1e-12), ("float32", 1e-5)])
+def test_add_feature_matches_pandas(frame, dtype, tol):
+    reference = legacy_add_feature(frame.copy())[ENGINEERED_COLUMNS].to_numpy(dtype=np.float64)
+    got = add_feature(frame, dtype=dtype)[ENGINEERED_COLUMNS].to_numpy(dtype=np.float64)
+    assert np.allclose(got, reference, rtol=tol, atol=tol, equal_nan=True)
+
+
+def test_add_feature_leaves_input_alone(frame):
+    before = frame.copy()
+    out = add_feature(frame)
+    assert frame.equals(before)
+    assert list(out.columns) == list(frame.columns) + ENGINEERED_COLUMNS
+    assert out["NUM_LATE_MONTHS"].dtype == np.int64 and out["SEVERE_DELAY_FLAG"].dtype == np.int64
+
+
+def test_chunking_does_not_change_results(frame):
+    block = frame.to_numpy(dtype=np.float64)
+    whole = engineer_block(block, chunk_rows=len(block))
+    assert np.array_equal(engineer_block(block, chunk_rows=777), whole, equal_nan=True)
+
+
+def test_engineer_row_matches_block(frame):
+    block = frame.to_numpy(dtype=np.float64)[:200]
+    rows = np.array([engineer_row(list(r)) for r in block])
+    assert np.allclose(rows, engineer_block(block), rtol=1e-12, atol=1e-12, equal_nan=True)
+
+
+def test_feature_slots_follow_the_feature_names():
+    names = ["LIMIT_BAL", "SEX", "EDUCATION_2", "EDUCATION_-1", "AGE", "AVG_BILL_AMT", "MARRIAGE_3"]
+    raw_slots, eng_slots, onehot_slots = feature_slots(names)
+    assert raw_slots == [(0, 0), (1, 1), (4, 4)]
+    assert eng_slots == [(0, 5)]
+    assert onehot_slots == {(2, 2): 2, (2, -1): 3, (3, 3): 6}
+    # SEX is a plain numeric feature here, so only EDUCATION and MARRIAGE are one-hot encoded
+    assert onehot_columns(onehot_slots) == (2, 3)
+    with pytest.raises(ValueError, match="SEX_x"):
+        feature_slots(names + ["SEX_x"])
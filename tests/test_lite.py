@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from src.bundle import write_bundle
+from src.explain import LinearExplainer
+from src.fastpath import compile_scorer
+from src.lite import load_lite_scorer
+from src.registry import load_version
+
+
+@pytest.fixture
+def bundle(tmp_path, model, preprocessor):
+    path = str(tmp_path / "model.crb")
+    write_bundle(model, preprocessor, path)
+    return path
+
+
+def test_lite_scorer_matches_compiled_scorer(bundle, dataset, model, preprocessor):
+    lite = load_lite_scorer(bundle)
+    compiled = compile_scorer(model, preprocessor)
+    rows = dataset.sample(200, random_state=0).to_dict("records")
+    lite_probs = [lite.score_row(r) for r in rows]
+    fast_probs = [compiled.score_row(r) for r in rows]
+    np.testing.assert_allclose(lite_probs, fast_probs, rtol=0, atol=1e-12)
+
+
+def test_lite_explanation_matches_linear_explainer(bundle, row, model, preprocessor):
+    got = load_lite_scorer(bundle).explain_row(row)
+    expected = LinearExplainer(model, preprocessor).explain_row(row)
+    assert [name for name, _ in got] == [name for name, _ in expected]
+    np.testing.assert_allclose([v for _, v in got], [v for _, v in expected], atol=1e-9)
+
+
+def test_missing_corrupt_or_stale_bundle_gives_none(tmp_path, bundle, model, preprocessor):
+    assert load_lite_scorer(str(tmp_path / "absent.crb")) is None
+
+    source = tmp_path / "best_model.pkl"
+    source.write_bytes(b"v1")
+    write_bundle(model, preprocessor, bundle, sources=[str(source)])
+    assert load_lite_scorer(bundle, sources=[str(source)]) is not None
+    source.write_bytes(b"v2")
+    assert load_lite_scorer(bundle, sources=[str(source)]) is None
+
+    with open(bundle, "r+b") as f:
+        f.seek(-1, 2)
+        f.write(b"\xff")
+    assert load_lite_scorer(bundle) is None
+
+
+def test_fast_start_version_scores_rows_from_the_bundle(bundle, row, model, preprocessor, model_paths):
+    write_bundle(model, preprocessor, bundle, sources=list(model_paths.values()))
+    version = load_version(model_paths["best_model"], model_paths["preprocessor"], model_paths["scaler"],
+                           lite_path=bundle)
+    assert version.model is None
+    assert version.score_row(row) == pytest.approx(load_lite_scorer(bundle).score_row(row))
@@ -0,0 +1,53 @@
+import json
+import logging
+
+import pandas as pd
+import pytest
+
+from src.metrics import METRICS, Histogram, Metrics
+from src.predict import predict_batch
+
+
+@pytest.fixture
+def metrics():
+    # The process-wide registry the scoring code reports to, restored afterwards
+    enabled = METRICS.enabled
+    METRICS.reset()
+    METRICS.enable()
+    yield METRICS
+    METRICS.enable(enabled)
+    METRICS.reset()
+
+
+def test_disabled_metrics_record_nothing():
+    m = Metrics()
+    with m.span("stage"):
+        pass
+    m.incr("rows", 5)
+    assert m.snapshot() == {"spans": {}, "counters": {}}
+
+
+def test_quantiles_are_bucket_upper_bounds():
+    h = Histogram()
+    for ms in range(1, 101):
+        h.observe(ms / 1e3)
+    # Within the ~33% bucket width of the true value and never above the max
+    for q, true in ((0.5, 0.050), (0.95, 0.095), (0.99, 0.099)):
+        assert true <= h.quantile(q) <= min(true * 1.34, h.max)
+    assert Histogram().quantile(0.5) == 0.0
+
+
+def test_scoring_path_reports_stages_and_counters(metrics, row, model, preprocessor, caplog):
+    predict_batch(model, preprocessor, pd.DataFrame([row] * 10))
+    snap = metrics.snapshot()
+    assert {"score_frame", "predict_proba", "preprocess.encode", "preprocess.scale"} <= set(snap["spans"])
+    assert snap["counters"]["rows_scored"] == 10
+
+    text = metrics.render()
+    assert 'credit_risk_stage_seconds_count{stage="score_frame"} 1' in text
+    assert 'credit_risk_events_total{event="rows_scored"} 10' in text
+
+    with caplog.at_level(logging.INFO, logger="credit_risk.metrics"):
+        metrics.log_line(source="test")
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record["source"] == "test" and record["counters"]["rows_scored"] == 10
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from src.features import RAW_COLUMNS
+from src.parallel import MAX_SHARD_SIZE, MIN_SHARD_SIZE, ParallelScorer
+from src.predict import predict_batch
+
+
+@pytest.fixture(scope="module")
+def block(dataset):
+    return dataset[RAW_COLUMNS].iloc[:5000].to_numpy(dtype=np.float64)
+
+
+@pytest.fixture
+def paths(model_paths):
+    return dict(model_path=model_paths["best_model"], preprocessor_path=model_paths["preprocessor"],
+                scaler_path=model_paths["scaler"])
+
+
+def test_worker_shards_come_back_in_input_order(block, model, preprocessor, paths):
+    expected = predict_batch(model, preprocessor, block)
+    with ParallelScorer(2, shard_size=700, **paths) as engine:
+        probs = engine.score(block)
+        # The pool is reused, and a reversed input gives reversed output
+        assert np.array_equal(engine.score(block[::-1]), probs[::-1])
+    assert np.allclose(probs, expected, rtol=0, atol=1e-12)
+
+
+def test_rejected_rows_never_reach_a_worker(block, paths):
+    bad = block.copy()
+    bad[[10, 2500, 4999], RAW_COLUMNS.index("AGE")] = 5
+    with ParallelScorer(2, shard_size=1000, **paths) as engine:
+        probs = engine.score(bad)
+        clean = engine.score(block)
+    assert np.flatnonzero(np.isnan(probs)).tolist() == [10, 2500, 4999]
+    keep = ~np.isnan(probs)
+    assert np.allclose(probs[keep], clean[keep], rtol=0, atol=1e-12)
+
+
+def test_shard_size():
+    with pytest.raises(ValueError):
+        ParallelScorer(2, shard_size=0)
+    engine = ParallelScorer(4)
+    assert engine._shard_size(1_000) == MIN_SHARD_SIZE
+    assert engine._shard_size(1_600_000) == 100_000
+    assert engine._shard_size(100_000_000) == MAX_SHARD_SIZE
+    assert ParallelScorer(4, shard_size=123)._shard_size(10**6) == 123
@@ -0,0 +1,68 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import DATA_PATH
+from src.fastpath import make_score_fn
+from src.features import RAW_COLUMNS
+from src.portfolio import (
+    iter_portfolio, read_portfolio, score_portfolio, split_rejects, summarize, tier_index, top_accounts,
+)
+from src.predict import predict_batch, risk_tiers
+
+
+@pytest.fixture(scope="module")
+def upload():
+    # The dataset layout: an X1..Y line, the header, then 500 accounts
+    with open(DATA_PATH, "rb") as f:
+        return b"".join(itertools.islice(f, 502))
+
+
+def test_both_csv_layouts_parse_to_the_same_frame(upload):
+    df = read_portfolio(upload)
+    assert len(df) == 500 and df["ID"].tolist() == list(range(1, 501))
+    plain = df.drop(columns=["ID"]).to_csv(index=False).encode()
+    generated = read_portfolio(plain)
+    assert generated["ID"].tolist() == list(range(1, 501))
+    pd.testing.assert_frame_equal(generated[RAW_COLUMNS], df[RAW_COLUMNS])
+    with pytest.raises(ValueError, match="missing columns: AGE"):
+        read_portfolio(df.drop(columns=["AGE"]).to_csv(index=False).encode())
+
+
+def test_chunked_file_reading_matches_one_read(tmp_path, upload):
+    path = tmp_path / "accounts.csv"
+    path.write_bytes(read_portfolio(upload).drop(columns=["ID"]).to_csv(index=False).encode())
+    chunks = list(iter_portfolio(str(path), chunk_size=120))
+    assert [len(c) for c in chunks] == [120, 120, 120, 120, 20]
+    # Generated IDs keep counting across chunks
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), read_portfolio(path.read_bytes()))
+
+
+def test_scored_portfolio_summary_and_filters(upload, model, preprocessor):
+    df = read_portfolio(upload)
+    df.loc[[4, 9], "LIMIT_BAL"] = 0
+    accepted, rejects = split_rejects(df)
+    assert rejects["ID"].tolist() == [5, 10] and len(accepted) == 498
+
+    progress = []
+    scored = score_portfolio(accepted, make_score_fn(model, preprocessor), chunk_size=200,
+                             on_progress=lambda done, total: progress.append((done, total)))
+    assert progress == [(200, 498), (400, 498), (498, 498)]
+    probs = predict_batch(model, preprocessor, accepted)
+    assert np.allclose(scored["probability"], probs, rtol=0, atol=1e-12)
+    assert list(scored["risk_tier"]) == list(risk_tiers(probs))
+    assert np.array_equal(tier_index(probs), scored["risk_tier"].cat.codes)
+
+    summary = summarize(scored)
+    assert summary["accounts"] == 498
+    assert summary["expected_defaults"] == pytest.approx(probs.sum())
+    assert sum(t["accounts"] for t in summary["tiers"].values()) == 498
+    assert sum(summary["histogram"]["counts"]) == 498
+
+    top = top_accounts(scored, n=5, tiers=["MEDIUM RISK", "HIGH RISK"], min_probability=0.4)
+    assert len(top) <= 5 and top["probability"].is_monotonic_decreasing
+    assert (top["probability"] >= 0.4).all() and "LOW RISK" not in set(top["risk_tier"])
+    expected = np.sort(scored["probability"][scored["probability"] >= 0.4])[::-1][:5]
+    assert np.array_equal(top["probability"], expected)
@@ -0,0 +1,93 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from legacy import legacy_transform
+from src.fastpath import CompiledScorer
+from src.features import RAW_COLUMNS
+from src.parallel import ParallelScorer
+from src.predict import REJECTED_TIER, predict, predict_batch, risk_tier, risk_tiers
+
+
+@pytest.fixture(scope="module")
+def frame():
+    rng = np.random.default_rng(0)
+    block = np.column_stack([
+        rng.integers(1, 50, 500) * 10_000, rng.integers(1, 3, 500), rng.integers(1, 5, 500),
+        rng.integers(1, 4, 500), rng.integers(21, 70, 500), *rng.integers(-2, 9, (6, 500)),
+        *rng.integers(0, 100_000, (12, 500)),
+    ])
+    return pd.DataFrame(block, columns=RAW_COLUMNS)
+
+
+def test_rejected_rows_are_nan_and_do_not_break_the_batch(frame, model, preprocessor, model_paths):
+    clean = predict_batch(model, preprocessor, frame)
+    bad = frame.copy()
+    bad.loc[3, "LIMIT_BAL"] = 0
+    bad.loc[7, "PAY_0"] = 42
+    probs = predict_batch(model, preprocessor, bad, chunk_size=100)
+    assert np.isnan(probs[[3, 7]]).all()
+    keep = np.ones(len(frame), dtype=bool)
+    keep[[3, 7]] = False
+    assert np.allclose(probs[keep], clean[keep], rtol=0, atol=1e-12)
+    assert list(risk_tiers(probs[[3, 7]])) == [REJECTED_TIER] * 2
+    assert risk_tier(float("nan")) == REJECTED_TIER
+
+    with ParallelScorer(1, model_path=model_paths["best_model"], preprocessor_path=model_paths["preprocessor"],
+                        scaler_path=model_paths["scaler"]) as engine:
+        parallel = engine.score(bad)
+    assert np.array_equal(np.isnan(parallel), np.isnan(probs))
+    assert np.allclose(parallel[keep], probs[keep], rtol=0, atol=1e-12)
+
+
+@pytest.fixture(scope="module")
+def accounts(dataset):
+    # Real rows plus the synthetic frame, so every category code shows up
+    return dataset[RAW_COLUMNS].iloc[:3000].reset_index(drop=True)
+
+
+def test_preprocessor_matches_legacy_pandas_path(accounts, frame, model, preprocessor, model_paths):
+    scaler = joblib.load(model_paths["scaler"])
+    for df in (accounts, frame):
+        X = preprocessor.transform(df)
+        legacy = legacy_transform(df, scaler)
+        assert np.allclose(X, legacy, rtol=0, atol=1e-9)
+        probs = model.predict_proba(X)[:, 1]
+        assert np.allclose(probs, model.predict_proba(legacy)[:, 1], rtol=0, atol=1e-12)
+
+
+def test_fast_path_matches_preprocessor(accounts, frame, model, preprocessor):
+    fast = CompiledScorer(model, preprocessor)
+    for df in (accounts, frame):
+        expected = model.predict_proba(preprocessor.transform(df))[:, 1]
+        assert np.allclose(fast.score_matrix(df.to_numpy(dtype=np.float64)), expected, rtol=0, atol=1e-12)
+        rows = df.iloc[::10].to_dict("records")
+        single = [fast.score_row(r) for r in rows]
+        assert np.allclose(single, expected[::10], rtol=0, atol=1e-12)
+
+
+def test_single_row_predict_matches_batch(row, model, preprocessor):
+    prob = predict(model, preprocessor.transform(row))
+    assert abs(prob - predict_batch(model, preprocessor, pd.DataFrame([row]))[0]) <= 1e-12
+    assert abs(prob * 100 - 10.56) < 0.01
+
+
+def test_batch_does_not_depend_on_chunking_or_input_type(accounts, model, preprocessor, model_paths):
+    expected = model.predict_proba(preprocessor.transform(accounts))[:, 1]
+    for chunk_size in (1_000, 777, len(accounts) + 1):
+        assert np.allclose(predict_batch(model, preprocessor, accounts, chunk_size=chunk_size),
+                           expected, rtol=0, atol=1e-12)
+    block = accounts.to_numpy(dtype=np.float64)
+    assert np.allclose(predict_batch(model, preprocessor, block), expected, rtol=0, atol=1e-12)
+    # A bare StandardScaler is wrapped into the same preprocessor
+    scaler = joblib.load(model_paths["scaler"])
+    assert np.allclose(predict_batch(model, scaler, block), expected, rtol=0, atol=1e-12)
+    assert predict_batch(model, preprocessor, block[:0]).shape == (0,)
+    with pytest.raises(ValueError):
+        predict_batch(model, preprocessor, block, chunk_size=0)
+
+
+def test_vectorized_tiers_match_risk_tier():
+    probs = np.array([0.0, 0.2999, 0.30, 0.5999, 0.60, 1.0, np.nan])
+    assert list(risk_tiers(probs)) == [risk_tier(p) for p in probs]
@@ -0,0 +1,72 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import StandardScaler
+
+from legacy import legacy_add_feature
+from src.bundle import write_bundle
+from src.features import CATEGORICAL_COLUMNS, RAW_COLUMNS
+from src.preprocess import CreditPreprocessor, load_preprocessor
+
+
+@pytest.fixture(scope="module")
+def accounts(dataset):
+    return dataset[RAW_COLUMNS].iloc[:6000].reset_index(drop=True)
+
+
+def notebook_features(df):
+    # Notebook 02: add_feature, then get_dummies with the first level dropped
+    return pd.get_dummies(legacy_add_feature(df.copy()), columns=CATEGORICAL_COLUMNS, drop_first=True)
+
+
+def test_fit_matches_the_notebook_pipeline(accounts):
+    pre = CreditPreprocessor().fit(accounts)
+    legacy = notebook_features(accounts)
+    assert sorted(pre.feature_names_) == sorted(legacy.columns)
+    legacy = legacy[pre.feature_names_].astype(np.float64)
+    scaler = StandardScaler().fit(legacy)
+    assert np.allclose(pre.transform(accounts), scaler.transform(legacy), rtol=0, atol=1e-9)
+
+
+def test_partial_fit_over_chunks_matches_fit(accounts):
+    full = CreditPreprocessor().fit(accounts)
+    streamed = CreditPreprocessor(categories=full.categories_, drop_first=False)
+    for start in range(0, len(accounts), 1000):
+        streamed.partial_fit(accounts.iloc[start:start + 1000])
+    assert streamed.feature_names_ == full.feature_names_
+    assert np.allclose(streamed.mean_, full.mean_, rtol=1e-12, atol=1e-9)
+    assert np.allclose(streamed.scale_, full.scale_, rtol=1e-9, atol=0)
+
+
+def test_partial_fit_needs_a_vocabulary(accounts):
+    with pytest.raises(ValueError, match="categories"):
+        CreditPreprocessor().partial_fit(accounts)
+
+
+def test_from_scaler_keeps_the_scaler_layout(accounts, model_paths):
+    scaler = joblib.load(model_paths["scaler"])
+    pre = CreditPreprocessor.from_scaler(scaler)
+    assert pre.feature_names_ == list(scaler.feature_names_in_)
+    assert pre.categories_ == {"SEX": [2], "EDUCATION": [1, 2, 3, 4, 5, 6], "MARRIAGE": [1, 2, 3]}
+    legacy = notebook_features(accounts).reindex(columns=pre.feature_names_, fill_value=0)
+    assert np.allclose(pre.transform(accounts), scaler.transform(legacy), rtol=0, atol=1e-9)
+    # A category outside the vocabulary encodes as all zeros
+    unseen = pre.encode(accounts.iloc[:1].assign(EDUCATION=9))
+    assert not unseen[0, [pre.feature_names_.index(f"EDUCATION_{v}") for v in range(1, 7)]].any()
+
+
+def test_load_preprocessor_falls_back_from_bundle_to_pickle_to_scaler(tmp_path, accounts, model, model_paths):
+    reference = load_preprocessor(model_paths["preprocessor"], model_paths["scaler"])
+    expected = reference.transform(accounts)
+
+    bundle = str(tmp_path / "model.crb")
+    write_bundle(model, reference, bundle)
+    pickled = str(tmp_path / "preprocessor.pkl")
+    joblib.dump(reference, pickled)
+    missing = str(tmp_path / "missing.pkl")
+    for path in (bundle, pickled, missing):
+        pre = load_preprocessor(path, model_paths["scaler"])
+        assert isinstance(pre, CreditPreprocessor)
+        assert pre.feature_names_ == reference.feature_names_
+        assert np.allclose(pre.transform(accounts), expected, rtol=0, atol=1e-9)
@@ -0,0 +1,103 @@
+import copy
+import json
+import os
+import shutil
+import time
+
+import joblib
+import numpy as np
+import pytest
+
+from conftest import DATA_PATH
+from src.registry import ModelRegistry, load_holdout
+
+NAMES = {"best_model": "best_model.pkl", "preprocessor": "preprocessor.pkl", "scaler": "scaler.pkl"}
+
+
+@pytest.fixture(scope="module")
+def holdout():
+    return load_holdout(DATA_PATH)
+
+
+@pytest.fixture
+def files(tmp_path, model_paths):
+    for key, name in NAMES.items():
+        shutil.copy(model_paths[key], tmp_path / name)
+    return tuple(str(tmp_path / name) for name in NAMES.values())
+
+
+def write_model(path, model, scale=1.0):
+    # A retrain: same layout, different coefficients, new file contents
+    retrained = copy.deepcopy(model)
+    retrained.coef_ = model.coef_ * scale
+    joblib.dump(retrained, path)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_unchanged_files_are_not_reloaded(files, holdout):
+    registry = ModelRegistry(*files, holdout=holdout)
+    first = registry.current
+    assert not registry.check()
+    assert registry.current is first and registry.status()["swaps"] == 0
+
+
+def test_a_passing_retrain_swaps_in_while_held_versions_keep_serving(files, holdout, model, row):
+    registry = ModelRegistry(*files, holdout=holdout)
+    held = registry.current
+    before = held.score_row(row)
+    write_model(files[0], model, scale=1.05)
+    assert registry.check()
+    assert registry.current is not held and registry.current.version != held.version
+    assert registry.current.holdout_auc >= registry.min_auc
+    # A request that took the old version before the swap still scores on it
+    assert held.score_row(row) == before
+    assert registry.current.score_row(row) != before
+
+
+def test_auc_gate_rejects_a_worse_model_once(files, holdout, model):
+    registry = ModelRegistry(*files, holdout=holdout)
+    serving = registry.current
+    write_model(files[0], model, scale=-1.0)
+    assert not registry.check()
+    assert registry.current is serving
+    status = registry.status()
+    assert status["rejected"] == 1 and "ROC-AUC" in status["last_error"]
+    # Not retried until the files change again
+    assert not registry.check()
+    assert registry.status()["rejected"] == 1
+    write_model(files[0], model, scale=1.02)
+    assert registry.check() and registry.status()["last_error"] is None
+
+
+def test_half_written_file_is_rejected(files, holdout):
+    registry = ModelRegistry(*files, holdout=holdout)
+    serving = registry.current
+    with open(files[0], "r+b") as f:
+        f.truncate(100)
+    assert not registry.check()
+    assert registry.current is serving and registry.status()["rejected"] == 1
+
+
+def test_pointer_release_and_background_polling(tmp_path, files, holdout, model):
+    release = tmp_path / "v2"
+    release.mkdir()
+    write_model(str(release / "best_model.pkl"), model, scale=0.98)
+    pointer = tmp_path / "CURRENT.json"
+    pointer.write_text(json.dumps({"version": "v1", "model": "best_model.pkl"}))
+    registry = ModelRegistry(*files, pointer_path=str(pointer), holdout=holdout)
+    assert registry.current.version == "v1"
+
+    registry.start(interval=0.05)
+    try:
+        tmp = tmp_path / "CURRENT.json.tmp"
+        tmp.write_text(json.dumps({"version": "v2", "model": "v2/best_model.pkl"}))
+        os.replace(tmp, pointer)
+        deadline = time.monotonic() + 10
+        while registry.current.version != "v2" and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        registry.stop()
+    assert registry.current.version == "v2"
+    assert registry.current.paths[0] == str(release / "best_model.pkl")
+    assert np.allclose(registry.current.model.coef_, model.coef_ * 0.98)
@@ -0,0 +1,24 @@
+import pytest
+
+from src.predict import LOW_RISK_MAX, MEDIUM_RISK_MAX, risk_tier
+from src.report import assemble_result, result_values
+
+BILLS = [2000] * 6
+PAYS = [500] * 6
+
+
+@pytest.mark.parametrize("prob", [0.0, LOW_RISK_MAX - 1e-6, LOW_RISK_MAX, 0.45, MEDIUM_RISK_MAX - 1e-6,
+                                  MEDIUM_RISK_MAX, 0.99])
+def test_report_tier_matches_risk_tier(prob):
+    values = result_values("Jane", 35, 20000, BILLS, PAYS, prob * 100, 0)
+    assert values["risk_label"] == risk_tier(prob)
+
+
+def test_client_name_is_escaped():
+    html = assemble_result('<img src=x onerror="alert(1)">', 35, 20000, BILLS, PAYS, 12.0, 0, ())
+    assert "<img" not in html
+    assert "&lt;img src=x onerror=&quot;alert(1)&quot;&gt;" in html
+
+
+def test_blank_name_is_anonymous():
+    assert result_values("  ", 35, 20000, BILLS, PAYS, 12.0, 0)["client_name"] == "Anonymous Client"
@@ -0,0 +1,67 @@
+import json
+import os
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import StratifiedKFold
+
+from src.data import TARGET
+from src.features import RAW_COLUMNS
+from src.preprocess import CreditPreprocessor
+from src.search import build_fold_cache, candidates, cross_validate, load_grid, make_estimator, refit_best
+
+GRID = {"logreg": {"C": [0.01, 1.0], "max_iter": [1000]}}
+
+
+@pytest.fixture(scope="module")
+def sample(dataset):
+    rows = dataset.iloc[:2000]
+    return rows[RAW_COLUMNS].to_numpy(dtype=np.float64), rows[TARGET].to_numpy()
+
+
+def test_grid_expansion(tmp_path):
+    assert candidates(GRID) == [("logreg", {"C": 0.01, "max_iter": 1000}), ("logreg", {"C": 1.0, "max_iter": 1000})]
+    assert candidates(load_grid(), families=["logreg"]) == candidates({"logreg": load_grid()["logreg"]})
+    path = tmp_path / "grid.json"
+    path.write_text(json.dumps(GRID))
+    grid = load_grid(str(path))
+    assert grid["logreg"] == GRID["logreg"] and "random_forest" in grid
+    with pytest.raises(ValueError, match="unknown model family"):
+        make_estimator("svm", {})
+
+
+def test_fold_cache_holds_per_fold_preprocessed_matrices(tmp_path, sample):
+    block, y = sample
+    fold_dir = build_fold_cache(block, y, n_splits=3, cache_dir=str(tmp_path))
+    # A second call reuses the published folds instead of rebuilding them
+    stamp = os.stat(os.path.join(fold_dir, "meta.json")).st_mtime_ns
+    assert build_fold_cache(block, y, n_splits=3, cache_dir=str(tmp_path)) == fold_dir
+    assert os.stat(os.path.join(fold_dir, "meta.json")).st_mtime_ns == stamp
+
+    splits = StratifiedKFold(n_splits=3, shuffle=True, random_state=42).split(block, y)
+    for k, (train_idx, val_idx) in enumerate(splits):
+        pre = CreditPreprocessor().fit(block[train_idx])
+        X_val = np.load(os.path.join(fold_dir, f"fold{k}", "X_val.npy"))
+        assert np.allclose(X_val, pre.transform(block[val_idx]), rtol=0, atol=1e-12)
+        assert np.array_equal(np.load(os.path.join(fold_dir, f"fold{k}", "y_train.npy")), y[train_idx])
+
+
+def test_leaderboard_ranks_candidates_by_cross_validated_auc(tmp_path, sample):
+    block, y = sample
+    board = cross_validate(block, y, GRID, n_splits=3, n_jobs=1, cache_dir=str(tmp_path))
+    assert list(board.index) == [1, 2]
+    assert board["roc_auc_mean"].is_monotonic_decreasing
+
+    params = json.loads(board.loc[1, "params"])
+    aucs = []
+    for train_idx, val_idx in StratifiedKFold(n_splits=3, shuffle=True, random_state=42).split(block, y):
+        pre = CreditPreprocessor().fit(block[train_idx])
+        model = LogisticRegression(**params).fit(pre.transform(block[train_idx]), y[train_idx])
+        aucs.append(roc_auc_score(y[val_idx], model.predict_proba(pre.transform(block[val_idx]))[:, 1]))
+    assert board.loc[1, "roc_auc_mean"] == pytest.approx(np.mean(aucs), abs=1e-9)
+
+    model, pre = refit_best(block, y, board)
+    assert model.C == params["C"]
+    assert np.allclose(pre.mean_, CreditPreprocessor().fit(block).mean_)
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from sklearn.tree import DecisionTreeClassifier
+
+from src.data import TARGET
+from src.fastpath import make_score_fn
+from src.preprocess import raw_block
+from src.sensitivity import grid_block, sweep
+
+
+@pytest.fixture(scope="module")
+def tree(dataset, preprocessor):
+    sample = dataset.iloc[:5000]
+    model = DecisionTreeClassifier(max_depth=6, random_state=0)
+    return model.fit(preprocessor.transform(raw_block(sample)), sample[TARGET].to_numpy())
+
+
+def test_whole_number_dimensions_sweep_integers(row):
+    block, xs, ys = grid_block(row, ("AGE", 21, 79), ("PAY_DELAY", 0, 8), steps=60)
+    assert np.array_equal(xs, np.arange(21, 80))
+    assert np.array_equal(ys, np.arange(0, 9))
+    assert len(block) == len(xs) * len(ys)
+    _, limits, _ = grid_block(row, ("LIMIT_BAL", 10_000, 500_000), steps=7)
+    assert len(limits) == 7
+
+
+def test_non_linear_model_scores_the_whole_surface(row, tree, preprocessor):
+    result = sweep(make_score_fn(tree, preprocessor), row, ("AGE", 21, 79), ("PAY_DELAY", 0, 8), steps=60)
+    assert result["probability"].shape == (9, 59)
+    assert np.isfinite(result["probability"]).all()
+
+
+def test_delay_sweep_covers_every_status_once(row, model, preprocessor):
+    linear = sweep(make_score_fn(model, preprocessor), row, ("PAY_DELAY", -1, 9), steps=200)
+    assert np.array_equal(linear["x_values"], np.arange(-1, 10))
+    assert np.isfinite(linear["probability"]).all()
+
+
+def test_range_without_two_whole_numbers_is_rejected(row):
+    with pytest.raises(ValueError, match="whole numbers"):
+        grid_block(row, ("AGE", 30.1, 30.4), steps=5)
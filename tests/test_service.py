@@ -0,0 +1,92 @@
+import asyncio
+import json
+import os
+
+import numpy as np
+import pytest
+from tornado.testing import AsyncHTTPTestCase, gen_test
+
+from src.features import RAW_COLUMNS
+from src.predict import predict_batch
+from src.service import make_app
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ServiceTest(AsyncHTTPTestCase):
+    @pytest.fixture(autouse=True)
+    def _artifacts(self, row, model, preprocessor):
+        self.row, self.model, self.preprocessor = row, model, preprocessor
+
+    def get_app(self):
+        return make_app(self.model, self.preprocessor)
+
+    def score(self, row):
+        response = self.fetch("/score", method="POST", body=json.dumps(row))
+        return response.code, json.loads(response.body)
+
+    def test_valid_row_is_scored(self):
+        code, body = self.score(self.row)
+        assert code == 200
+        assert abs(body["percent"] - 10.56) < 0.01
+
+    def test_rejected_row_returns_reasons(self):
+        code, body = self.score(dict(self.row, LIMIT_BAL=0, EDUCATION=99, PAY_0=42))
+        assert code == 400
+        assert set(body["reasons"]) == {"LIMIT_NONPOSITIVE", "EDUCATION_UNKNOWN", "PAY_RANGE"}
+
+    @gen_test
+    async def test_batcher_rejects_bad_rows_and_scores_the_rest(self):
+        batcher = self._app.batcher
+        good = [float(v) for v in self.row.values()]
+        bad = list(good)
+        bad[0] = 0.0
+        prob, _ = await batcher.submit(good)
+        assert 0 < prob < 1
+        with pytest.raises(ValueError, match="LIMIT_BAL"):
+            await batcher.submit(bad)
+
+    @gen_test
+    async def test_concurrent_rows_share_batches_and_keep_their_results(self):
+        batcher = self._app.batcher
+        batcher.max_batch = 8
+        rows = [[float(v) for v in dict(self.row, LIMIT_BAL=10_000 * (i + 1)).values()] for i in range(20)]
+        results = await asyncio.gather(*(batcher.submit(v) for v in rows))
+        # 20 queued rows drain as batches of 8, 8 and 4
+        assert (batcher.batches, batcher.rows) == (3, 20)
+        expected = predict_batch(self.model, self.preprocessor, np.array(rows))
+        assert np.allclose([p for p, _ in results], expected, rtol=0, atol=1e-12)
+
+    def test_malformed_requests_are_rejected(self):
+        missing = {k: v for k, v in self.row.items() if k != "AGE"}
+        assert self.score(missing) == (400, {"error": "missing fields: AGE"})
+        assert self.score(dict(self.row, AGE="35"))[0] == 400
+        assert self.score(dict(self.row, SEX=True))[0] == 400
+        response = self.fetch("/score?explain=x", method="POST", body=json.dumps(self.row))
+        assert response.code == 400
+
+    def test_explain_and_health(self):
+        response = self.fetch("/score?explain=2", method="POST", body=json.dumps(self.row))
+        drivers = json.loads(response.body)["drivers"]
+        values = [self.row[c] for c in RAW_COLUMNS]
+        expected = self._app.registry.current.explain_row(values, k=2)
+        assert [name for name, _ in drivers] == [name for name, _ in expected]
+        health = json.loads(self.fetch("/health").body)
+        assert health["status"] == "ok" and health["rows"] == 1 and health["avg_batch_size"] == 1.0
+
+
+class DriftTest(AsyncHTTPTestCase):
+    @pytest.fixture(autouse=True)
+    def _artifacts(self, row, model, preprocessor):
+        self.row, self.model, self.preprocessor = row, model, preprocessor
+
+    def get_app(self):
+        from src.drift import DriftMonitor, DriftReference
+        reference = DriftReference.load(os.path.join(ROOT, "models", "drift_reference.npz"))
+        return make_app(self.model, self.preprocessor, drift=DriftMonitor(reference))
+
+    def test_cache_hits_are_observed(self):
+        for _ in range(3):
+            assert self.fetch("/score", method="POST", body=json.dumps(self.row)).code == 200
+        assert self._app.cache.stats()["hits"] == 2
+        assert self._app.batcher.drift.report()["rows"] == 3
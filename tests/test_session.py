@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from src.fastpath import CompiledScorer
+from src.features import RAW_COLUMNS
+from src.preprocess import CreditPreprocessor
+from src.session import SessionScorer
+
+RANGES = {"LIMIT_BAL": (10000, 1000000), "SEX": (1, 3), "EDUCATION": (0, 7), "MARRIAGE": (0, 4),
+          "AGE": (21, 80), "PAY": (-2, 9), "BILL_AMT": (-20000, 500000), "PAY_AMT": (0, 200000)}
+
+
+@pytest.fixture(scope="module")
+def scorer(model, preprocessor):
+    return CompiledScorer(model, preprocessor)
+
+
+def test_incremental_matches_full_over_random_edits(scorer, row):
+    session = SessionScorer(scorer)
+    rng = np.random.default_rng(0)
+    edited = dict(row)
+    session.reset(edited)
+    for _ in range(2000):
+        for col in rng.choice(RAW_COLUMNS, size=rng.integers(1, 4), replace=False):
+            lo, hi = RANGES.get(col, RANGES[col.rstrip("0123456789").rstrip("_")])
+            edited[col] = int(rng.integers(lo, hi))
+        assert abs(session.score_row(edited) - scorer.score_row(edited)) <= 1e-12
+    # Most edits must have gone through the incremental path
+    assert session.full_computations < 2000 // 10
+
+
+def test_unchanged_row_is_not_recomputed(scorer, row):
+    session = SessionScorer(scorer)
+    first = session.score_row(row)
+    full = session.full_computations
+    assert session.score_row(dict(row)) == first
+    assert session.full_computations == full
+
+
+def test_layout_with_sex_as_a_numeric_feature(preprocessor, row):
+    # No SEX_* one-hot columns: SEX is fed to the model as its raw value instead
+    names = ["SEX"] + [n for n in preprocessor.feature_names_ if not n.startswith("SEX_")]
+    rng = np.random.default_rng(1)
+    scaler = StandardScaler().fit(pd.DataFrame(rng.normal(size=(50, len(names))), columns=names))
+    pre = CreditPreprocessor.from_scaler(scaler)
+    model = LogisticRegression()
+    model.classes_ = np.array([0, 1])
+    model.coef_ = rng.normal(scale=0.1, size=(1, len(names)))
+    model.intercept_ = np.array([-1.0])
+    model.n_features_in_ = len(names)
+
+    scorer = CompiledScorer(model, pre)
+    session = SessionScorer(scorer)
+    session.reset(row)
+    for sex, education in [(2, 1), (1, 3), (2, 2)]:
+        edited = dict(row, SEX=sex, EDUCATION=education)
+        expected = model.predict_proba(pre.transform(edited))[0, 1]
+        assert scorer.score_row(edited) == pytest.approx(expected, abs=1e-12)
+        assert session.score_row(edited) == pytest.approx(expected, abs=1e-12)
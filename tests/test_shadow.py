@@ -0,0 +1,65 @@
+import json
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from src.features import RAW_COLUMNS
+from src.fastpath import make_score_fn
+from src.registry import ModelVersion
+from src.shadow import ShadowLog, ShadowScorer
+
+
+@pytest.fixture(scope="module")
+def block(dataset):
+    return dataset[RAW_COLUMNS].to_numpy(dtype=np.float64)[:500]
+
+
+def test_champion_result_and_log_lines(tmp_path, block, model, preprocessor):
+    champion = ModelVersion("champion", (), make_score_fn(model, preprocessor), None,
+                            model=model, preprocessor=preprocessor)
+    shadow = ShadowScorer(model, preprocessor, str(tmp_path / "shadow.jsonl"))
+    probs = shadow.score(champion, block)
+    shadow.close()
+    assert np.allclose(probs, champion.score_fn(block), rtol=0, atol=1e-12)
+    lines = [json.loads(line) for line in open(tmp_path / "shadow.jsonl")]
+    assert len(lines) == len(block)
+    assert max(abs(line["delta"]) for line in lines) < 1e-6
+    stats = shadow.stats()
+    assert stats["logged"] == stats["rows"] == len(block)
+    assert stats["dropped"] == stats["tier_disagreements"] == 0
+
+
+def test_failed_batch_is_dropped_not_logged(tmp_path):
+    def handler(item):
+        if item == "bad":
+            raise OSError("disk full")
+        return "line\n", 1
+
+    log = ShadowLog(handler, str(tmp_path / "shadow.jsonl"))
+    for item in ("ok", "bad", "ok"):
+        log.submit(item)
+    log.close()
+    assert (log.written, log.dropped) == (2, 1)
+
+
+def test_close_does_not_hang_on_a_full_queue(tmp_path):
+    release = threading.Event()
+
+    def stuck(item):
+        release.wait()
+        return "line\n", 1
+
+    log = ShadowLog(stuck, str(tmp_path / "shadow.jsonl"), max_queue=2)
+    log.submit("item")
+    while not log._queue.empty():
+        time.sleep(0.01)
+    # The writer is stuck on the first batch; two more fill the queue and a third is dropped
+    while log.submit("item"):
+        pass
+    start = time.perf_counter()
+    log.close(timeout=0.2)
+    assert time.perf_counter() - start < 2
+    assert log.dropped == 3
+    release.set()
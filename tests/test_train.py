@@ -0,0 +1,61 @@
+import itertools
+
+import numpy as np
+import pytest
+from sklearn.metrics import roc_auc_score
+
+from conftest import DATA_PATH
+from src.data import TARGET, iter_chunks
+from src.predict import load_model, predict_batch
+from src.preprocess import load_preprocessor
+from src.registry import MIN_AUC
+from src.train import holdout_mask, out_of_core_reference, train_out_of_core
+
+
+@pytest.fixture(scope="module")
+def small_csv(tmp_path_factory):
+    # The two header lines plus the first 6000 accounts, in the dataset's own layout
+    path = tmp_path_factory.mktemp("data") / "accounts.csv"
+    with open(DATA_PATH) as src, open(path, "w") as out:
+        out.writelines(itertools.islice(src, 6002))
+    return str(path)
+
+
+def fit(path, tmp_path, chunk_size):
+    files = {name: str(tmp_path / f"{name}_{chunk_size}.pkl") for name in ("model", "scaler", "preprocessor")}
+    model, pre = train_out_of_core(path, chunk_size=chunk_size, epochs=5, save_path=files["model"],
+                                   scaler_path=files["scaler"], preprocessor_path=files["preprocessor"])
+    return model, pre, files
+
+
+def test_holdout_split_is_stable_and_sized():
+    ids = np.arange(1, 200_001)
+    mask = holdout_mask(ids)
+    assert np.array_equal(mask, holdout_mask(ids.copy()))
+    assert abs(mask.mean() - 0.2) < 0.01
+    # A row's side of the split does not depend on which chunk it arrives in
+    assert np.array_equal(np.concatenate([holdout_mask(ids[:777]), holdout_mask(ids[777:])]), mask)
+
+
+def test_out_of_core_fit_is_chunk_size_independent_and_learns(small_csv, tmp_path):
+    model, pre, files = fit(small_csv, tmp_path, chunk_size=6000)
+    _, chunked_pre, _ = fit(small_csv, tmp_path, chunk_size=500)
+    assert chunked_pre.feature_names_ == pre.feature_names_
+    assert np.allclose(chunked_pre.mean_, pre.mean_, rtol=1e-12)
+    assert np.allclose(chunked_pre.scale_, pre.scale_, rtol=1e-9)
+
+    chunk = next(iter_chunks(small_csv, 6000))
+    holdout = chunk[holdout_mask(chunk["ID"].to_numpy())]
+    # The saved files load through the usual entry points and score the same
+    saved = load_model(files["model"]), load_preprocessor(files["preprocessor"], files["scaler"])
+    probs = predict_batch(*saved, holdout)
+    assert np.allclose(probs, model.predict_proba(pre.transform(holdout))[:, 1], rtol=0, atol=1e-12)
+    # Good enough to pass the registry's holdout gate
+    assert roc_auc_score(holdout[TARGET], probs) > MIN_AUC
+
+
+def test_drift_reference_covers_the_training_rows(small_csv, tmp_path):
+    model, pre, _ = fit(small_csv, tmp_path, chunk_size=6000)
+    reference = out_of_core_reference(model, pre, small_csv, chunk_size=1000)
+    chunk = next(iter_chunks(small_csv, 6000))
+    assert reference.rows == int((~holdout_mask(chunk["ID"].to_numpy())).sum())
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from src.features import RAW_COLUMNS
+from src.validate import CODES, check_row, row_reasons, validate
+
+def random_block(row, n=5000, seed=0):
+    # Mostly valid rows with every rule broken somewhere
+    rng = np.random.default_rng(seed)
+    block = np.tile(np.array([row[c] for c in RAW_COLUMNS], dtype=np.float64), (n, 1))
+    edits = rng.integers(0, n, size=(n // 2,))
+    cols = rng.integers(0, len(RAW_COLUMNS), size=len(edits))
+    values = rng.choice([np.nan, np.inf, -1, 0, 0.5, 2.5, 5, 7, 12, 99, -3, 1e10], size=len(edits))
+    block[edits, cols] = values
+    block[:10, 11:17] = -1
+    block[:5, 17:23] = 0
+    return block
+
+
+def test_row_check_matches_block_check(row):
+    block = random_block(row)
+    reasons = validate(block).reasons
+    assert [row_reasons(list(r)) for r in block] == reasons.tolist()
+
+
+def test_numpy_scalars_in_a_dict_are_numbers(row):
+    scalars = {c: np.int64(v) if i % 2 else np.float32(v) for i, (c, v) in enumerate(row.items())}
+    assert validate(scalars).ok.all()
+    assert row_reasons(scalars) == 0
+    frame = pd.DataFrame([row, row])
+    assert validate(dict(frame.iloc[0])).ok.all()
+
+
+def test_rejections_carry_reason_codes(row):
+    bad = dict(row, LIMIT_BAL=0, EDUCATION=99, PAY_0=42, SEX="x")
+    code = row_reasons(bad)
+    for name in ("LIMIT_NONPOSITIVE", "EDUCATION_UNKNOWN", "PAY_RANGE", "MISSING"):
+        assert code & CODES[name]
+    result = validate(bad)
+    assert not result.ok[0] and int(result.reasons[0]) == code
+    try:
+        check_row(bad)
+    except ValueError as e:
+        assert "LIMIT_BAL is zero or negative" in str(e)
+    else:
+        raise AssertionError("check_row accepted a rejected row")
+
+
+def test_undocumented_codes_are_flagged_unless_strict(row):
+    row = dict(row, EDUCATION=5, MARRIAGE=0)
+    assert validate(row).ok.all()
+    assert not validate(row, strict=True).ok.any()
+    assert check_row(row) == CODES["EDUCATION_UNDOCUMENTED"] | CODES["MARRIAGE_UNDOCUMENTED"]